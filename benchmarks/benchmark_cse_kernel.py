@@ -0,0 +1,42 @@
+"""
+Benchmark the common-subexpression-eliminated competition_pl kernel
+
+Compares claffinity.high_accuracy_binding_equations.competition_pl with the
+fully expanded closed form kept in high_accuracy_binding_equations.py at the
+root of the repository, at several mpmath precisions.  Both must give
+bit-identical results.
+"""
+
+import importlib.util
+from pathlib import Path
+from time import perf_counter
+import numpy as np
+from mpmath import mp
+from claffinity.high_accuracy_binding_equations import competition_pl
+
+NUM_POINTS = 200
+PRECISIONS = [500, 200, 100, 50, 30, 15]
+
+spec = importlib.util.spec_from_file_location(
+    "expanded_binding_equations", Path(__file__).resolve().parent.parent / "high_accuracy_binding_equations.py"
+)
+expanded_binding_equations = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(expanded_binding_equations)
+
+rng = np.random.default_rng(42)
+systems = list(zip(*(10 ** -rng.uniform(3, 12, NUM_POINTS) for _ in range(5))))
+
+
+def time_per_call(func, **kwargs):
+    begin = perf_counter()
+    results = [func(*system, **kwargs) for system in systems]
+    return (perf_counter() - begin) / NUM_POINTS, results
+
+
+print(f"{'dps':>6}{'expanded s/call':>18}{'CSE s/call':>14}{'speedup':>10}{'identical':>12}")
+for dps in PRECISIONS:
+    with mp.workdps(dps):
+        expanded_time, expanded_results = time_per_call(expanded_binding_equations.competition_pl)
+    cse_time, cse_results = time_per_call(competition_pl, dps=dps)
+    identical = sum(expanded == cse for expanded, cse in zip(expanded_results, cse_results))
+    print(f"{dps:>6}{expanded_time:>18.3e}{cse_time:>14.3e}{expanded_time / cse_time:>10.1f}{identical:>8}/{NUM_POINTS}")
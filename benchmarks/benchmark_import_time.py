@@ -0,0 +1,48 @@
+"""
+Benchmark the startup cost of importing claffinity
+
+Imports each entry point in a fresh interpreter under python -X importtime,
+and reports the cumulative import time of the top-level module with the
+heavy optional dependencies it loaded.  Only the plotting methods of
+CompetitionLabelAffinity should load matplotlib, and only DataFrame
+handling should load pandas.
+"""
+
+import subprocess
+import sys
+
+REPEATS = 5
+STATEMENTS = [
+    "import claffinity.high_accuracy_binding_equations",
+    "import claffinity.fast_binding_equations",
+    "import claffinity",
+    "from claffinity import CompetitionLabelAffinity; CompetitionLabelAffinity()",
+    "import claffinity, matplotlib.pyplot, pandas",
+]
+HEAVY_MODULES = ["matplotlib", "pandas"]
+
+
+def import_profile(statement):
+    """Total import time in seconds, and the top-level modules imported"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Top-level entries are not indented, and their cumulative times add up to the total
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        modules.add(name.strip().split(".")[0])
+    return total_us / 1e6, modules
+
+
+print(f"{'Statement':<78}{'best s':>8}  heavy modules loaded")
+for statement in STATEMENTS:
+    profiles = [import_profile(statement) for _ in range(REPEATS)]
+    best_seconds = min(seconds for seconds, _ in profiles)
+    heavy = [module for module in HEAVY_MODULES if module in profiles[0][1]]
+    print(f"{statement:<78}{best_seconds:>8.3f}  {', '.join(heavy) or '-'}")
@@ -0,0 +1,45 @@
+"""
+Benchmark scaling of the process pool sweep with the number of workers
+
+Evaluates a ligand KD by inhibitor KD grid with competition_pl_sweep using
+increasing numbers of workers, and reports the speedup and parallel
+efficiency over a single worker.
+"""
+
+import os
+from time import perf_counter
+import numpy as np
+from claffinity.fast_binding_equations import calc_amount_p
+from claffinity.parallel_sweep import competition_pl_sweep
+
+GRID_SIZE = 100
+CHUNK_SIZE = 250
+LIGAND_CONC = 10e-9
+INHIBITOR_CONC = 10e-6
+
+
+if __name__ == "__main__":
+    ligand_kds = 10 ** -np.linspace(3, 12, GRID_SIZE)
+    inhibitor_kds = 10 ** -np.linspace(3, 12, GRID_SIZE)
+    protein_concs = calc_amount_p(0.7, LIGAND_CONC, ligand_kds)
+    grid = (
+        protein_concs[:, np.newaxis],
+        LIGAND_CONC,
+        INHIBITOR_CONC,
+        ligand_kds[:, np.newaxis],
+        inhibitor_kds[np.newaxis, :],
+    )
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= os.cpu_count():
+        worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"{'workers':>8}{'seconds':>12}{'speedup':>10}{'efficiency':>12}")
+    for workers in worker_counts:
+        begin = perf_counter()
+        competition_pl_sweep(*grid, max_workers=workers, chunk_size=CHUNK_SIZE)
+        seconds = perf_counter() - begin
+        if workers == 1:
+            single_worker_seconds = seconds
+        speedup = single_worker_seconds / seconds
+        print(f"{workers:>8}{seconds:>12.2f}{speedup:>10.2f}{speedup / workers:>12.2f}")
@@ -0,0 +1,41 @@
+"""
+Benchmark runtime against error for the precision of competition_pl
+
+Evaluates competition_pl at a range of mpmath decimal places and reports the
+time per call with the maximum and median relative error against dps=500.
+Systems are sampled over typical assay conditions, with a share of nearly
+equal KDs and extreme KD ratios where the closed form cancels most heavily.
+"""
+
+from time import perf_counter
+import numpy as np
+from claffinity.high_accuracy_binding_equations import competition_pl
+from claffinity.fast_binding_equations import calc_amount_p
+
+NUM_POINTS = 300
+PRECISIONS = [15, 20, 30, 40, 50, 75, 100, 150, 200, 300, 500]
+REFERENCE_DPS = 500
+rng = np.random.default_rng(42)
+
+ligand_conc = 10 ** -rng.uniform(5, 10, NUM_POINTS)
+kdpl = 10 ** -rng.uniform(3, 12, NUM_POINTS)
+kdpi = 10 ** -rng.uniform(3, 12, NUM_POINTS)
+inhibitor_conc = 10 ** -rng.uniform(4, 8, NUM_POINTS)
+# A sixth of systems with nearly equal KDs, and a sixth with extreme KD ratios
+near_equal = slice(0, NUM_POINTS // 6)
+kdpi[near_equal] = kdpl[near_equal] * (1 + 10 ** -rng.uniform(2, 12, NUM_POINTS // 6))
+extreme = slice(NUM_POINTS // 6, NUM_POINTS // 3)
+kdpl[extreme] = 10 ** -rng.uniform(12, 15, NUM_POINTS // 6)
+kdpi[extreme] = 10 ** -rng.uniform(0, 3, NUM_POINTS // 6)
+protein_conc = calc_amount_p(rng.uniform(0.05, 0.95, NUM_POINTS), ligand_conc, kdpl)
+systems = list(zip(protein_conc, ligand_conc, inhibitor_conc, kdpl, kdpi))
+
+reference = np.array([float(competition_pl(*system, dps=REFERENCE_DPS)) for system in systems])
+
+print(f"{'dps':>6}{'s/call':>12}{'max rel error':>16}{'median rel error':>18}")
+for dps in PRECISIONS:
+    begin = perf_counter()
+    values = np.array([float(competition_pl(*system, dps=dps)) for system in systems])
+    seconds = (perf_counter() - begin) / NUM_POINTS
+    relative_error = np.abs(values - reference) / np.abs(reference)
+    print(f"{dps:>6}{seconds:>12.3e}{np.max(relative_error):>16.3e}{np.median(relative_error):>18.3e}")
@@ -0,0 +1,402 @@
+"""
+Benchmark suite for the binding equations and sweep paths, written as JSON
+
+Measures scalar call latency of the high accuracy and float64 equations and
+inverse solvers, vectorised throughput at several grid sizes, the cost of
+competition_pl at each precision, scaling of the process pool sweep with
+the number of workers, and peak memory of the vectorised paths and the
+plot data methods.  Results are written as JSON, and when a baseline JSON
+from an earlier run is given, every benchmark slower than the baseline by
+more than the tolerance is reported and the exit status is 1, so the suite
+can gate changes.
+
+Each timing is the median of its repeats, with their median absolute
+deviation (MAD) as its noise, and only slowdowns beyond the tolerance plus
+NOISE_MADS times the noise of the two runs count.  A busy machine also
+slows whole stretches of a run, which no single run can measure, so a
+regression is reported only if it persists when its section is run again
+--confirm more times.  Several baseline runs can be given, and the spread
+of their medians is counted as noise too.
+
+Run from the root of the repository, so that claffinity is importable
+without installing it:
+
+    python -m benchmarks.benchmark_suite --output baseline.json
+    python -m benchmarks.benchmark_suite --output current.json --baseline baseline.json
+    python -m benchmarks.benchmark_suite --output current.json --baseline baseline_*.json
+
+--quick uses smaller grids and fewer repeats, and runs in under a minute on
+a laptop.
+"""
+
+import argparse
+from datetime import datetime, timezone
+import functools
+import json
+import math
+import os
+import platform
+import sys
+from time import perf_counter
+import tracemalloc
+import mpmath
+import numpy as np
+from claffinity import CompetitionLabelAffinity
+from claffinity import fast_binding_equations, high_accuracy_binding_equations
+from claffinity.parallel_sweep import competition_pl_sweep
+
+SCHEMA_VERSION = 3
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_CONFIRM = 2
+MIN_REPEAT_SECONDS = 0.02
+NOISE_MADS = 3
+
+
+def sample_systems(n, rng):
+    """Random competition systems over typical assay conditions"""
+    ligand_conc = 10 ** -rng.uniform(5, 10, n)
+    kdpl = 10 ** -rng.uniform(3, 12, n)
+    kdpi = 10 ** -rng.uniform(3, 12, n)
+    inhibitor_conc = 10 ** -rng.uniform(4, 8, n)
+    protein_conc = fast_binding_equations.calc_amount_p(rng.uniform(0.1, 0.9, n), ligand_conc, kdpl)
+    return protein_conc, ligand_conc, inhibitor_conc, kdpl, kdpi
+
+
+def median_times(benchmarks, repeats):
+    """Median seconds per call of each function, and the median absolute deviation of its repeats relative to it
+
+    After an untimed warm up call, each repeat calls a function enough times
+    to take at least MIN_REPEAT_SECONDS, as timeit does, so that short calls
+    are not dominated by timer resolution and scheduling.  Repeats are
+    interleaved, one of each function per round, so that a stretch of the
+    run slowed by other load on the machine costs one repeat of every
+    benchmark rather than every repeat of one, and shows in the MAD.
+    """
+    loops = {}
+    for name, func in benchmarks.items():
+        begin = perf_counter()
+        func()
+        loops[name] = max(1, math.ceil(MIN_REPEAT_SECONDS / (perf_counter() - begin)))
+    times = {name: [] for name in benchmarks}
+    for _ in range(repeats):
+        for name, func in benchmarks.items():
+            begin = perf_counter()
+            for _ in range(loops[name]):
+                func()
+            times[name].append((perf_counter() - begin) / loops[name])
+    results = {}
+    for name, name_times in times.items():
+        median = float(np.median(name_times))
+        results[name] = median, float(np.median(np.abs(np.array(name_times) - median))) / median
+    return results
+
+
+def peak_memory(func):
+    """Peak bytes allocated through Python and numpy while running func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scalar_latency(config, rng):
+    """Seconds per call of each equation on single systems"""
+    systems = list(zip(*sample_systems(config["scalar_points"], rng)))
+    targetflb = 0.35
+    benchmarks = {
+        "high_accuracy.competition_pl": lambda s: high_accuracy_binding_equations.competition_pl(*s),
+        "high_accuracy.calc_amount_p": lambda s: high_accuracy_binding_equations.calc_amount_p(0.7, s[1], s[3]),
+        "high_accuracy.calc_kdpi_for_fractionl_bound": lambda s: high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound(
+            s[0], s[1], s[2], s[3], targetflb
+        ),
+        "high_accuracy.calc_i_for_fractionl_bound": lambda s: high_accuracy_binding_equations.calc_i_for_fractionl_bound(
+            s[0], s[1], s[3], s[4], targetflb
+        ),
+        "fast.competition_pl_polished": lambda s: fast_binding_equations.competition_pl_polished(*s),
+        "fast.calc_kdpi_for_fractionl_bound": lambda s: fast_binding_equations.calc_kdpi_for_fractionl_bound(
+            s[0], s[1], s[2], s[3], targetflb
+        ),
+        "fast.calc_i_for_fractionl_bound": lambda s: fast_binding_equations.calc_i_for_fractionl_bound(
+            s[0], s[1], s[3], s[4], targetflb
+        ),
+    }
+
+    def over_systems(func):
+        def run():
+            for system in systems:
+                func(system)
+
+        return run
+
+    timings = median_times({name: over_systems(func) for name, func in benchmarks.items()}, config["repeats"])
+    results = {}
+    for name, (seconds, mad) in timings.items():
+        seconds /= len(systems)
+        results[f"scalar/{name}"] = {"seconds": seconds, "mad": mad, "calls_per_second": 1 / seconds}
+    return results
+
+
+def vectorised_throughput(config, rng):
+    """Points per second and peak memory of the float64 paths at each grid size"""
+    targetflb = 0.35
+    benchmarks = {
+        "fast.competition_pl_trig": lambda p, l, i, kdpl, kdpi: fast_binding_equations.competition_pl_trig(
+            p, l, i, kdpl, kdpi
+        ),
+        "fast.competition_pl_polished": lambda p, l, i, kdpl, kdpi: fast_binding_equations.competition_pl_polished(
+            p, l, i, kdpl, kdpi
+        ),
+        "fast.calc_amount_p": lambda p, l, i, kdpl, kdpi: fast_binding_equations.calc_amount_p(0.7, l, kdpl),
+        "fast.calc_kdpi_for_fractionl_bound": lambda p, l, i, kdpl, kdpi: fast_binding_equations.calc_kdpi_for_fractionl_bound(
+            p, l, i, kdpl, targetflb
+        ),
+        "fast.calc_i_for_fractionl_bound": lambda p, l, i, kdpl, kdpi: fast_binding_equations.calc_i_for_fractionl_bound(
+            p, l, kdpl, kdpi, targetflb
+        ),
+    }
+    results = {}
+    for num_points in config["grid_sizes"]:
+        systems = sample_systems(num_points, rng)
+        runs = {name: functools.partial(func, *systems) for name, func in benchmarks.items()}
+        for name, (seconds, mad) in median_times(runs, config["repeats"]).items():
+            results[f"vectorised/{name}/{num_points}"] = {
+                "seconds": seconds,
+                "mad": mad,
+                "points_per_second": num_points / seconds,
+                "peak_bytes": peak_memory(runs[name]),
+            }
+    return results
+
+
+def precision_levels(config, rng):
+    """Seconds per call of the high accuracy competition_pl at each precision"""
+    systems = list(zip(*sample_systems(config["scalar_points"], rng)))
+
+    def at_precision(dps):
+        def run():
+            for system in systems:
+                high_accuracy_binding_equations.competition_pl(*system, dps=dps)
+
+        return run
+
+    timings = median_times({dps: at_precision(dps) for dps in config["precisions"]}, config["repeats"])
+    results = {}
+    for dps, (seconds, mad) in timings.items():
+        seconds /= len(systems)
+        results[f"precision/competition_pl/{dps}"] = {
+            "seconds": seconds,
+            "mad": mad,
+            "calls_per_second": 1 / seconds,
+        }
+    return results
+
+
+def process_pool_scaling(config, rng):
+    """Wall time of competition_pl_sweep with increasing numbers of workers"""
+    systems = sample_systems(config["sweep_points"], rng)
+    runs = {
+        max_workers: functools.partial(
+            competition_pl_sweep, *systems, max_workers=max_workers, chunk_size=config["sweep_chunk_size"]
+        )
+        for max_workers in config["workers"]
+    }
+    results = {}
+    single_worker_seconds = None
+    for max_workers, (seconds, mad) in median_times(runs, config["sweep_repeats"]).items():
+        if single_worker_seconds is None:
+            single_worker_seconds = seconds * max_workers
+        results[f"process_pool/competition_pl_sweep/{max_workers}"] = {
+            "seconds": seconds,
+            "mad": mad,
+            "points_per_second": config["sweep_points"] / seconds,
+            "parallel_efficiency": single_worker_seconds / (seconds * max_workers),
+        }
+    return results
+
+
+def plot_data_methods(config, rng):
+    """Wall time and peak memory of the CompetitionLabelAffinity plot data methods"""
+    cla = CompetitionLabelAffinity()
+    methods = [
+        "protein_needed_vs_ligand_kd_data",
+        "signal_vs_ligand_kd_fixed_i_data",
+        "inhibitor_KD_vs_FLB_data",
+        "ligand_KD_vs_FLB_data",
+        "ligand_kd_vs_FLB_as_percentage_data",
+    ]
+    timings = median_times({method: getattr(cla, method) for method in methods}, config["repeats"])
+    return {
+        f"plot_data/{method}": {"seconds": seconds, "mad": mad, "peak_bytes": peak_memory(getattr(cla, method))}
+        for method, (seconds, mad) in timings.items()
+    }
+
+
+SECTIONS = {
+    "scalar": scalar_latency,
+    "vectorised": vectorised_throughput,
+    "precision": precision_levels,
+    "process_pool": process_pool_scaling,
+    "plot_data": plot_data_methods,
+}
+
+
+def make_config(quick):
+    cpu_count = os.cpu_count() or 1
+    workers = sorted({1, *(n for n in (2, 4, 8) if n <= cpu_count), cpu_count})
+    if quick:
+        return {
+            "repeats": 9,
+            "scalar_points": 20,
+            "grid_sizes": [1_000, 10_000, 100_000],
+            "precisions": [15, 50, 100, 500],
+            "sweep_points": 4_000,
+            "sweep_chunk_size": 250,
+            "sweep_repeats": 5,
+            "workers": workers[:3],
+        }
+    return {
+        "repeats": 15,
+        "scalar_points": 200,
+        "grid_sizes": [1_000, 10_000, 100_000, 1_000_000],
+        "precisions": [15, 30, 50, 100, 200, 500],
+        "sweep_points": 40_000,
+        "sweep_chunk_size": 1_000,
+        "sweep_repeats": 5,
+        "workers": workers,
+    }
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "mpmath": mpmath.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "equation_versions": {
+            "high_accuracy": high_accuracy_binding_equations.EQUATION_VERSION,
+            "fast": fast_binding_equations.EQUATION_VERSION,
+        },
+    }
+
+
+def merge_baselines(baselines):
+    """Combine the results of several runs, keeping the median time and the larger MAD within or between runs"""
+    merged = {}
+    for name in set().union(*baselines):
+        runs = [baseline[name] for baseline in baselines if "seconds" in baseline.get(name, {})]
+        if not runs:
+            continue
+        seconds = np.array([run["seconds"] for run in runs])
+        median = float(np.median(seconds))
+        between_runs = float(np.median(np.abs(seconds - median))) / median
+        merged[name] = {"seconds": median, "mad": max(between_runs, *(run.get("mad", 0) for run in runs))}
+    return merged
+
+
+def compare(results, baseline, tolerance):
+    """Benchmarks present in both runs whose median time grew by more than tolerance, as (name, ratio)
+
+    The slowdown must exceed the tolerance plus NOISE_MADS times the
+    combined MAD of the two runs, so a benchmark is reported only when it
+    slowed by more than the tolerance beyond the noise measured for it.
+    Results without a MAD, from older schema versions, add no noise.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+        if baseline_result is None or "seconds" not in baseline_result:
+            continue
+        ratio = result["seconds"] / baseline_result["seconds"]
+        noise = NOISE_MADS * (result.get("mad", 0) + baseline_result.get("mad", 0))
+        if ratio > 1 + tolerance + noise:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def confirm_regressions(regressions, baseline, tolerance, config, seed, rounds):
+    """Regressions which persist when the sections reporting them are run again rounds times
+
+    A regression caused by the machine being busy for part of a run rarely
+    recurs in every repeat of the section, so only regressions found each
+    time are kept, with the smallest ratio seen.
+    """
+    for _ in range(rounds):
+        if not regressions:
+            break
+        sections = {name.split("/")[0] for name, _ in regressions}
+        print(f"Confirming {len(regressions)} regressions", file=sys.stderr)
+        results = {}
+        for section in sorted(sections):
+            results.update(SECTIONS[section](config, np.random.default_rng(seed)))
+        ratios = dict(regressions)
+        regressions = [
+            (name, min(ratio, ratios[name]))
+            for name, ratio in compare({name: results[name] for name in ratios}, baseline, tolerance)
+        ]
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    parser.add_argument("--baseline", nargs="+", help="JSON results of one or more earlier runs to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Fractional slowdown reported as a regression, default {DEFAULT_TOLERANCE}",
+    )
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=DEFAULT_CONFIRM,
+        help=f"Times a regression must recur when its section is run again, default {DEFAULT_CONFIRM}",
+    )
+    parser.add_argument("--quick", action="store_true", help="Smaller grids and fewer repeats")
+    parser.add_argument("--sections", nargs="+", choices=list(SECTIONS), default=list(SECTIONS))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    config = make_config(args.quick)
+    results = {}
+    for section in args.sections:
+        print(f"Running {section} benchmarks", file=sys.stderr)
+        # Each section samples its own systems, so they match between runs of different sections
+        results.update(SECTIONS[section](config, np.random.default_rng(args.seed)))
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {"schema_version": SCHEMA_VERSION, "environment": environment(), "config": config, "results": results},
+            file,
+            indent=1,
+        )
+
+    print(f"{'Benchmark':<64}{'seconds':>12}{'MAD':>8}")
+    for name, result in results.items():
+        print(f"{name:<64}{result['seconds']:>12.3e}{result['mad']:>8.1%}")
+
+    if args.baseline:
+        baselines = []
+        for path in args.baseline:
+            with open(path) as file:
+                baselines.append(json.load(file)["results"])
+        baseline = merge_baselines(baselines)
+        regressions = confirm_regressions(
+            compare(results, baseline, args.tolerance), baseline, args.tolerance, config, args.seed, args.confirm
+        )
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks slower than the baseline by more than {args.tolerance:.0%}")
+            for name, ratio in regressions:
+                print(f"{name:<64}{ratio:>11.2f}x")
+            return 1
+        print(f"\nNo benchmarks slower than the baseline by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark the real-arithmetic trigonometric solver against the closed form
+
+Times competition_pl_trig against the high accuracy closed form and against
+competition_pl_polished, which refines the trigonometric estimate, and
+reports the agreement of the float64 methods with the high accuracy closed
+form over randomly sampled competition systems.
+"""
+
+from time import perf_counter
+import numpy as np
+from claffinity.high_accuracy_binding_equations import competition_pl as high_accuracy_competition_pl
+from claffinity.fast_binding_equations import calc_amount_p, competition_pl_polished, competition_pl_trig
+
+NUM_REFERENCE_POINTS = 500
+NUM_VECTORISED_POINTS = 1_000_000
+rng = np.random.default_rng(42)
+
+
+def sample_systems(n):
+    ligand_conc = 10 ** -rng.uniform(5, 10, n)
+    kdpl = 10 ** -rng.uniform(3, 12, n)
+    kdpi = 10 ** -rng.uniform(3, 12, n)
+    inhibitor_conc = 10 ** -rng.uniform(4, 8, n)
+    protein_conc = calc_amount_p(rng.uniform(0.1, 0.9, n), ligand_conc, kdpl)
+    return protein_conc, ligand_conc, inhibitor_conc, kdpl, kdpi
+
+
+def time_per_point(func, n):
+    begin = perf_counter()
+    func()
+    return (perf_counter() - begin) / n
+
+
+systems = sample_systems(NUM_REFERENCE_POINTS)
+reference = np.empty(NUM_REFERENCE_POINTS)
+scalar_trig = np.empty(NUM_REFERENCE_POINTS)
+
+
+def run_high_accuracy():
+    for idx, system in enumerate(zip(*systems)):
+        reference[idx] = float(high_accuracy_competition_pl(*system))
+
+
+def run_scalar_trig():
+    for idx, system in enumerate(zip(*systems)):
+        scalar_trig[idx] = competition_pl_trig(*system)
+
+
+high_accuracy_time = time_per_point(run_high_accuracy, NUM_REFERENCE_POINTS)
+scalar_trig_time = time_per_point(run_scalar_trig, NUM_REFERENCE_POINTS)
+large_systems = sample_systems(NUM_VECTORISED_POINTS)
+trig_time = time_per_point(lambda: competition_pl_trig(*large_systems), NUM_VECTORISED_POINTS)
+polished_time = time_per_point(lambda: competition_pl_polished(*large_systems), NUM_VECTORISED_POINTS)
+
+print(f"{'Method':<40}{'s/point':>12}{'max rel diff':>16}{'median rel diff':>18}")
+for name, seconds, values in [
+    ("High accuracy closed form (scalar)", high_accuracy_time, reference),
+    ("Trigonometric (scalar calls)", scalar_trig_time, scalar_trig),
+    ("Trigonometric (vectorised)", trig_time, competition_pl_trig(*systems)),
+    ("Polished trigonometric (vectorised)", polished_time, competition_pl_polished(*systems)[0]),
+]:
+    relative_difference = np.abs(values - reference) / np.abs(reference)
+    print(
+        f"{name:<40}{seconds:>12.3e}{np.nanmax(relative_difference):>16.3e}{np.nanmedian(relative_difference):>18.3e}"
+    )
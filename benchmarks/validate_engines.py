@@ -0,0 +1,44 @@
+"""
+Validate the competition solvers against the reference dataset
+
+Compares each [PL] engine with the reference values shipped in
+claffinity/data/competition_reference.npz, and reports the maximum
+relative error overall and per regime with the worst cases.  The exit
+status is 1 if any engine exceeds its accepted relative error, so a new or
+faster engine can be added to ENGINES with its tolerance and checked
+automatically.
+"""
+
+import sys
+from claffinity import fast_binding_equations, high_accuracy_binding_equations
+from claffinity.accuracy_reference import load_reference_dataset, validate_engine
+from claffinity.adaptive_precision import competition_pl_adaptive
+
+# Name, engine, called on arrays, accepted maximum relative error
+ENGINES = [
+    ("fast.competition_pl", fast_binding_equations.competition_pl, True, 1e-9),
+    ("fast.competition_pl_trig", fast_binding_equations.competition_pl_trig, True, None),
+    ("fast.competition_pl_polished", fast_binding_equations.competition_pl_polished, True, 1e-9),
+    ("adaptive_precision.competition_pl_adaptive", competition_pl_adaptive, True, 1e-9),
+    (
+        "high_accuracy.competition_pl dps=50",
+        lambda *system: high_accuracy_binding_equations.competition_pl(*system, dps=50),
+        False,
+        1e-10,
+    ),
+    ("high_accuracy.competition_pl", high_accuracy_binding_equations.competition_pl, False, 1e-15),
+]
+
+
+if __name__ == "__main__":
+    reference = load_reference_dataset()
+    failed = []
+    for name, engine, vectorised, rtol in ENGINES:
+        report = validate_engine(engine, reference, vectorised=vectorised)
+        accepted = "" if rtol is None else f", accepted below {rtol:.0e}: {report.accepts(rtol)}"
+        print(f"{name}{accepted}\n{report.summary(reference)}\n")
+        if rtol is not None and not report.accepts(rtol):
+            failed.append(name)
+    if failed:
+        print(f"Engines outside their accepted error: {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
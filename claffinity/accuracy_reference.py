@@ -0,0 +1,206 @@
+"""
+Reference [PL] values for validating competition solvers
+
+A reference dataset samples competition systems from regimes where solvers
+are hard to get right, as well as typical assay conditions: nearly equal
+and exactly equal ligand and inhibitor KDs, where the closed form divides by
+the KD difference, extreme KD ratios, and very low and very high target
+fraction ligand bound.  Reference [PL] is found by solving the mass-balance
+cubic directly at REFERENCE_DPS decimal places, rather than through the
+closed form, so it is independent of how the closed form treats equal
+KDs.  The dataset shipped with the package is claffinity/data/
+competition_reference.npz, regenerated with generate_reference_dataset.
+
+validate_engine compares any solver against the dataset, reporting the
+maximum relative error overall and per regime with the worst cases, so a
+new or faster solver can be accepted or rejected against a tolerance.
+"""
+
+
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Union
+import numpy as np
+from . import high_accuracy_binding_equations
+from .fast_binding_equations import calc_amount_p
+
+REFERENCE_DPS = 500
+DEFAULT_POINTS_PER_REGIME = 500
+DEFAULT_REFERENCE_PATH = Path(__file__).resolve().parent / "data" / "competition_reference.npz"
+REGIMES = ("typical", "near_equal_kd", "equal_kd", "extreme_kd_ratio", "low_flb", "high_flb")
+
+
+class ReferenceDataset(NamedTuple):
+    """Competition systems with reference [PL], and the index into REGIMES of each system's regime"""
+
+    p: np.ndarray
+    l: np.ndarray
+    i: np.ndarray
+    kdpl: np.ndarray
+    kdpi: np.ndarray
+    pl: np.ndarray
+    regime: np.ndarray
+
+
+def reference_competition_pl(p, l, i, kdpl, kdpi, dps: int = REFERENCE_DPS) -> float:
+    """[PL] from the roots of the mass-balance cubic, at dps decimal places
+
+    The physical root is the real root between zero and the PL formed
+    without inhibitor, which leaves between zero and [I0] of protein bound to
+    inhibitor.  When the KDs are equal the cubic term vanishes and the
+    quadratic is solved.
+    """
+    ctx = high_accuracy_binding_equations._get_context(dps)
+    p, l, i, kdpl, kdpi = ctx.mpf(p), ctx.mpf(l), ctx.mpf(i), ctx.mpf(kdpl), ctx.mpf(kdpi)
+    a = kdpl - kdpi
+    b = p * kdpi - p * kdpl + i * kdpl + kdpi * kdpl - kdpl * kdpl + 2 * kdpi * l - kdpl * l
+    c = -2 * p * kdpi * l + p * kdpl * l - i * kdpl * l - kdpi * kdpl * l - kdpi * l * l
+    d = kdpi * l * l * p
+    coefficients = [b, c, d] if a == 0 else [a, b, c, d]
+    total = p + l + kdpl
+    no_inhibitor_pl = 2 * p * l / (total + ctx.sqrt(total * total - 4 * p * l))
+    tolerance = ctx.mpf(10) ** (-dps // 2) * no_inhibitor_pl
+    candidates = []
+    for root in ctx.polyroots(coefficients, maxsteps=200, extraprec=4 * dps):
+        root = ctx.mpmathify(root)
+        if abs(ctx.im(root)) > tolerance:
+            continue
+        pl = ctx.re(root)
+        if -tolerance <= pl <= no_inhibitor_pl + tolerance:
+            # Protein bound to inhibitor, from the protein mass balance with free protein kdpl*[PL]/[L]
+            pi = p - pl - kdpl * pl / (l - pl)
+            candidates.append((max(-pi, pi - i, 0), pl))
+    if not candidates:
+        return float("nan")
+    return float(min(candidates, key=lambda candidate: candidate[0])[1])
+
+
+def sample_reference_systems(num_points_per_regime: int = DEFAULT_POINTS_PER_REGIME, seed: int = 0):
+    """Random competition systems from each of REGIMES
+
+    Returns:
+        Tuple[np.ndarray, ...]: p, l, i, kdpl, kdpi and regime index arrays
+    """
+    rng = np.random.default_rng(seed)
+    n = num_points_per_regime
+    columns = []
+    for regime_index, regime in enumerate(REGIMES):
+        l = 10 ** -rng.uniform(5, 10, n)
+        i = 10 ** -rng.uniform(4, 8, n)
+        kdpl = 10 ** -rng.uniform(3, 12, n)
+        kdpi = 10 ** -rng.uniform(3, 12, n)
+        tflb = rng.uniform(0.1, 0.9, n)
+        if regime == "near_equal_kd":
+            kdpi = kdpl * (1 + rng.choice([-1, 1], n) * 10 ** -rng.uniform(1, 15, n))
+        elif regime == "equal_kd":
+            kdpi = kdpl.copy()
+        elif regime == "extreme_kd_ratio":
+            tight, weak = 10 ** -rng.uniform(12, 15, n), 10 ** -rng.uniform(0, 3, n)
+            ligand_tighter = rng.random(n) < 0.5
+            kdpl, kdpi = np.where(ligand_tighter, tight, weak), np.where(ligand_tighter, weak, tight)
+        elif regime == "low_flb":
+            tflb = 10 ** -rng.uniform(1.3, 4, n)
+        elif regime == "high_flb":
+            tflb = 1 - 10 ** -rng.uniform(1, 4, n)
+        columns.append((calc_amount_p(tflb, l, kdpl), l, i, kdpl, kdpi, np.full(n, regime_index, dtype=np.int8)))
+    return tuple(np.concatenate(column) for column in zip(*columns))
+
+
+def generate_reference_dataset(
+    path: Union[str, Path] = DEFAULT_REFERENCE_PATH,
+    num_points_per_regime: int = DEFAULT_POINTS_PER_REGIME,
+    seed: int = 0,
+    dps: int = REFERENCE_DPS,
+) -> ReferenceDataset:
+    """Sample systems, compute reference [PL] and write them as a compressed .npz"""
+    p, l, i, kdpl, kdpi, regime = sample_reference_systems(num_points_per_regime, seed)
+    pl = np.array([reference_competition_pl(*system, dps=dps) for system in zip(p, l, i, kdpl, kdpi)])
+    dataset = ReferenceDataset(p, l, i, kdpl, kdpi, pl, regime)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, regimes=np.array(REGIMES), dps=dps, seed=seed, **dataset._asdict())
+    return dataset
+
+
+def load_reference_dataset(path: Union[str, Path] = DEFAULT_REFERENCE_PATH) -> ReferenceDataset:
+    """Read a reference dataset, by default the one shipped with the package"""
+    with np.load(path) as data:
+        return ReferenceDataset(*(data[field] for field in ReferenceDataset._fields))
+
+
+class ValidationReport(NamedTuple):
+    """Relative error of an engine against a reference dataset
+
+    worst_indices index the reference dataset, largest error first.  Results
+    which are not finite count as an infinite error.
+    """
+
+    relative_error: np.ndarray
+    max_relative_error: float
+    median_relative_error: float
+    regime_max_relative_error: Dict[str, float]
+    worst_indices: np.ndarray
+
+    def accepts(self, rtol: float) -> bool:
+        """True if every reference point is reproduced within rtol"""
+        return self.max_relative_error <= rtol
+
+    def summary(self, reference: ReferenceDataset) -> str:
+        """Multi-line text report of the errors by regime and the worst cases"""
+        lines = [f"max relative error {self.max_relative_error:.3e}, median {self.median_relative_error:.3e}"]
+        lines += [f"  {regime:<20}{error:.3e}" for regime, error in self.regime_max_relative_error.items()]
+        lines.append(f"  {'regime':<20}{'p':>11}{'l':>11}{'i':>11}{'kdpl':>11}{'kdpi':>11}{'rel error':>11}")
+        for index in self.worst_indices:
+            lines.append(
+                f"  {REGIMES[reference.regime[index]]:<20}"
+                + "".join(f"{value:>11.3e}" for value in (field[index] for field in reference[:5]))
+                + f"{self.relative_error[index]:>11.3e}"
+            )
+        return "\n".join(lines)
+
+
+def validate_engine(
+    engine: Callable,
+    reference: Optional[ReferenceDataset] = None,
+    vectorised: bool = True,
+    num_worst: int = 10,
+) -> ValidationReport:
+    """Compare an engine's [PL] with the reference dataset
+
+    Args:
+        engine (Callable): Function of p, l, i, kdpl and kdpi returning [PL],
+            or a tuple whose first element is [PL] such as
+            fast_binding_equations.competition_pl_polished.
+        reference (ReferenceDataset, optional): Dataset to compare against.
+            Defaults to None, loading the dataset shipped with the package.
+        vectorised (bool, optional): Call the engine once on arrays, rather
+            than once per system. Defaults to True.
+        num_worst (int, optional): Number of worst cases reported. Defaults
+            to 10.
+
+    Returns:
+        ValidationReport: Errors overall, by regime and the worst cases
+    """
+    if reference is None:
+        reference = load_reference_dataset()
+    systems = reference[:5]
+    if vectorised:
+        result = engine(*systems)
+        pl = np.asarray(result[0] if isinstance(result, tuple) else result, dtype=np.float64)
+    else:
+        pl = np.empty(reference.pl.shape[0])
+        for index, system in enumerate(zip(*systems)):
+            result = engine(*system)
+            pl[index] = float(result[0] if isinstance(result, tuple) else result)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_error = np.abs(pl - reference.pl) / np.abs(reference.pl)
+    relative_error[~np.isfinite(relative_error)] = np.inf
+    worst_indices = np.argsort(-relative_error, kind="stable")[:num_worst]
+    return ValidationReport(
+        relative_error=relative_error,
+        max_relative_error=float(np.max(relative_error)),
+        median_relative_error=float(np.median(relative_error)),
+        regime_max_relative_error={
+            regime: float(np.max(relative_error[reference.regime == regime_index], initial=0))
+            for regime_index, regime in enumerate(REGIMES)
+        },
+        worst_indices=worst_indices,
+    )
@@ -0,0 +1,82 @@
+"""
+Adaptive precision evaluation of competition experiments
+
+Every point is first evaluated in float64 with
+fast_binding_equations.competition_pl_polished.  Points whose estimated error
+is too large are recomputed one at a time with mpmath, at increasing precision until the result passes the same checks.  The
+cost of a sweep therefore scales with the number of hard points rather than
+the total number of points.
+"""
+
+
+import numpy as np
+from . import high_accuracy_binding_equations
+from .fast_binding_equations import _as_float_arrays, competition_pl_polished, competition_root_error_estimate
+
+FLOAT64_TIER = 0
+DEFAULT_DPS_TIERS = (30, 60, 120, 250, 500)
+
+
+def _physical_root(pl, p, l):
+    """Root is a concentration between zero and the lesser of [P] and [L]"""
+    return (pl >= 0) & (pl <= l) & (pl <= p)
+
+
+def _mpmath_root_is_accurate(pl, p, l, i, kdpl, kdpi, rtol, dps):
+    """Checks applied to a high accuracy result, at the precision it was calculated"""
+    ctx = high_accuracy_binding_equations._get_context(dps)
+    p, l, i, kdpl, kdpi = ctx.mpf(p), ctx.mpf(l), ctx.mpf(i), ctx.mpf(kdpl), ctx.mpf(kdpi)
+    a = kdpl - kdpi
+    b = p * kdpi - p * kdpl + i * kdpl + kdpi * kdpl - kdpl * kdpl + 2 * kdpi * l - kdpl * l
+    c = -2 * p * kdpi * l + p * kdpl * l - i * kdpl * l - kdpi * kdpl * l - kdpi * l * l
+    d = kdpi * l * l * p
+    if not (0 <= pl <= l and pl <= p):
+        return False
+    return competition_root_error_estimate(pl, a, b, c, d, ctx.eps) <= rtol * abs(pl)
+
+
+def competition_pl_adaptive(p, l, i, kdpl, kdpi, rtol: float = 1e-10, dps_tiers=DEFAULT_DPS_TIERS):
+    """Calculate PL concentration, escalating precision only where needed
+
+    Arguments are broadcast against each other and evaluated in float64 with
+    fast_binding_equations.competition_pl_polished.  A float64 result is
+    rejected if it is not finite, lies outside the physical range (fraction
+    ligand bound outside [0, 1] or [PL] above [P]), or if the relative error
+    estimated by competition_pl_polished is above rtol.  Rejected points are
+    recomputed with the high accuracy closed form at each precision in
+    dps_tiers until the residual check passes.  Points failing at every tier
+    keep the result of the final tier.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+        rtol (float, optional): Relative accuracy required. Defaults to 1e-10.
+        dps_tiers (Sequence[int], optional): Increasing mpmath decimal
+            precisions to try. Defaults to DEFAULT_DPS_TIERS.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: [PL], and the precision tier used for
+            each point. Tier FLOAT64_TIER (0) is float64, tier n is
+            dps_tiers[n-1].
+    """
+    p, l, i, kdpl, kdpi = _as_float_arrays(p, l, i, kdpl, kdpi)
+    pl, relative_error = competition_pl_polished(p, l, i, kdpl, kdpi)
+    pl = np.array(pl)
+    tier = np.full(pl.shape, FLOAT64_TIER, dtype=np.int8)
+    accurate = np.isfinite(pl) & _physical_root(pl, p, l) & (relative_error <= rtol)
+
+    flat_pl = pl.reshape(-1)
+    flat_tier = tier.reshape(-1)
+    for index in np.flatnonzero(~accurate):
+        point = tuple(float(arg.flat[index]) for arg in (p, l, i, kdpl, kdpi))
+        for tier_number, dps in enumerate(dps_tiers, start=1):
+            value = high_accuracy_binding_equations.competition_pl(*point, dps=dps)
+            accepted = _mpmath_root_is_accurate(value, *point, rtol, dps)
+            if accepted or tier_number == len(dps_tiers):
+                flat_pl[index] = float(value)
+                flat_tier[index] = tier_number
+                break
+    return pl[()], tier[()]
@@ -0,0 +1,86 @@
+"""
+Adaptive sampling of curves
+
+Curves over ligand or inhibitor pKD are flat over most of their range and
+change sharply in narrow transitions.  Rather than sampling uniformly
+finely enough for the transitions, a curve is sampled coarsely and each
+interval is halved while the curve at its midpoint differs from the
+straight line between its ends by more than a tolerance, until a point
+budget is spent.
+"""
+
+
+from typing import Callable, Tuple
+import numpy as np
+
+
+def adaptive_sample(
+    func: Callable[[np.ndarray], np.ndarray],
+    begin: float,
+    end: float,
+    tol: float = 1e-3,
+    initial_points: int = 17,
+    max_points: int = 1000,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample a vectorised function densely only where it is not locally linear
+
+    func is called with an array of x values, and returns values with x
+    along the last axis, so several curves sharing an x axis, such as one
+    row per inhibitor KD, are refined together on their largest error.  All
+    midpoints of one refinement round are evaluated in a single call.  When
+    more intervals need halving than the budget allows, those with the
+    largest error in the previous round are halved first.
+
+    Args:
+        func (Callable[[np.ndarray], np.ndarray]): Vectorised function of x
+        begin (float): First x value
+        end (float): Last x value
+        tol (float, optional): Largest acceptable difference between the
+            curve and linear interpolation, in the units of func. Defaults
+            to 1e-3.
+        initial_points (int, optional): Evenly spaced points in the first
+            pass, reduced to max_points if more. Defaults to 17.
+        max_points (int, optional): Maximum number of points evaluated, at
+            least the two ends. Defaults to 1000.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Increasing x values, and the values of
+            func with x along the last axis
+    """
+    initial_points = max(min(initial_points, max_points), 2)
+    x = np.linspace(begin, end, initial_points)
+    y = np.asarray(func(x), dtype=np.float64)
+    sampled_x = [x]
+    sampled_y = [y]
+    left_x, right_x = x[:-1], x[1:]
+    left_y, right_y = y[..., :-1], y[..., 1:]
+    priority = np.full(left_x.shape, np.inf)
+    num_points = initial_points
+    min_width = abs(end - begin) * 1e-12
+    while left_x.shape[0] > 0 and num_points < max_points:
+        budget = max_points - num_points
+        if left_x.shape[0] > budget:
+            keep = np.sort(np.argsort(-priority, kind="stable")[:budget])
+            left_x, right_x, left_y, right_y = left_x[keep], right_x[keep], left_y[..., keep], right_y[..., keep]
+        middle_x = (left_x + right_x) / 2
+        middle_y = np.asarray(func(middle_x), dtype=np.float64)
+        sampled_x.append(middle_x)
+        sampled_y.append(middle_y)
+        num_points += middle_x.shape[0]
+
+        error = np.abs(middle_y - (left_y + right_y) / 2)
+        if error.ndim > 1:
+            error = np.max(error.reshape(-1, error.shape[-1]), axis=0)
+        # NaN errors, from undefined regions of the curve, are not refined
+        refine = (error > tol) & (right_x - left_x > 2 * min_width)
+        left_x, right_x = np.concatenate((left_x[refine], middle_x[refine])), np.concatenate(
+            (middle_x[refine], right_x[refine])
+        )
+        left_y, right_y = np.concatenate((left_y[..., refine], middle_y[..., refine]), axis=-1), np.concatenate(
+            (middle_y[..., refine], right_y[..., refine]), axis=-1
+        )
+        priority = np.concatenate((error[refine], error[refine]))
+
+    x = np.concatenate(sampled_x)
+    order = np.argsort(x, kind="stable")
+    return x[order], np.concatenate(sampled_y, axis=-1)[..., order]
@@ -0,0 +1,59 @@
+"""
+Render many parameterised figures in parallel
+
+Each figure is described by a FigureJob naming a CompetitionLabelAffinity
+plot method, the file to write and the keyword arguments of the method.
+Jobs are rendered in worker processes, each drawing on matplotlib's
+non-interactive Agg canvas without pyplot, so rendering needs no display
+and figures from different jobs never share state.
+"""
+
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Union
+from .competition_label_affinity import CompetitionLabelAffinity, PlotData
+
+
+class FigureJob(NamedTuple):
+    """A figure to render, as a CompetitionLabelAffinity plot method, output file and arguments
+
+    kwargs defaults to None, calling the plot method with no arguments
+    other than the filename.
+    """
+
+    method: str
+    filename: Union[str, Path]
+    kwargs: Optional[Mapping[str, Any]] = None
+
+
+def _render_figure(job: FigureJob, class_kwargs: Dict[str, Any]) -> PlotData:
+    if not job.method.startswith("plot_"):
+        raise ValueError(f"{job.method} is not a CompetitionLabelAffinity plot method")
+    cla = CompetitionLabelAffinity(**class_kwargs)
+    return getattr(cla, job.method)(**(job.kwargs or {}), filename=job.filename)
+
+
+def render_figures(
+    jobs: Sequence[FigureJob], max_workers: Optional[int] = None, **class_kwargs
+) -> List[PlotData]:
+    """Render figures to files in a process pool
+
+    File formats follow the filename extensions, as for
+    matplotlib.figure.Figure.savefig.  As with any ProcessPoolExecutor use,
+    scripts calling this on platforms which spawn workers must guard their
+    entry point with if __name__ == "__main__".
+
+    Args:
+        jobs (Sequence[FigureJob]): Figures to render
+        max_workers (int, optional): Number of worker processes. Defaults to
+            None, using one per CPU.
+        **class_kwargs: Arguments for the CompetitionLabelAffinity used by
+            every job, for example x_axis_resolution or adaptive_tolerance.
+
+    Returns:
+        List[PlotData]: The data plotted in each figure, in the order of jobs
+    """
+    jobs = [FigureJob(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_figure, jobs, [class_kwargs] * len(jobs)))
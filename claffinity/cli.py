@@ -0,0 +1,219 @@
+"""
+Command line batch evaluation of competition experiments
+
+Installed as the claffinity console script.  Reads a table of conditions
+from a CSV or Parquet file, or CSV from stdin, and writes each row with
+[PL] and fraction ligand bound added, optionally with the inhibitor KD and
+concentration needed for a target fraction ligand bound.  The table is read,
+evaluated and written a chunk of rows at a time, so memory use is bounded by
+the chunk size however large the input.
+
+Input columns are l, i, kdpl and kdpi, with either p, or tflb from which p
+is set with calc_amount_p to reach that fraction ligand bound without
+inhibitor.  Concentrations and KDs are molar.
+
+    claffinity conditions.csv -o results.parquet
+    cat conditions.csv | claffinity --target-flb 0.35 > results.csv
+"""
+
+
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+import pandas as pd
+from . import fast_binding_equations
+from .adaptive_precision import competition_pl_adaptive
+from .parallel_sweep import competition_pl_sweep
+
+DEFAULT_CHUNK_SIZE = 100_000
+PARQUET_SUFFIXES = (".parquet", ".pq")
+CONDITION_COLUMNS = ("l", "i", "kdpl", "kdpi")
+
+
+def _polished(p, l, i, kdpl, kdpi, dps=None, max_workers=None, executor=None):
+    return fast_binding_equations.competition_pl_polished(p, l, i, kdpl, kdpi)[0]
+
+
+def _adaptive(p, l, i, kdpl, kdpi, dps=None, max_workers=None, executor=None):
+    return competition_pl_adaptive(p, l, i, kdpl, kdpi)[0]
+
+
+def _high_accuracy(p, l, i, kdpl, kdpi, dps=None, max_workers=None, executor=None):
+    return competition_pl_sweep(p, l, i, kdpl, kdpi, dps=dps, max_workers=max_workers, executor=executor)
+
+
+# [PL] engines by name, fastest first
+ENGINES: Dict[str, Callable] = {
+    "polished": _polished,
+    "adaptive": _adaptive,
+    "high_accuracy": _high_accuracy,
+}
+
+
+def _is_parquet(path: Optional[str], file_format: Optional[str]) -> bool:
+    if file_format is not None:
+        return file_format == "parquet"
+    return path not in (None, "-") and Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def read_condition_chunks(source: Optional[str], parquet: bool, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Chunks of chunk_size rows from a CSV or Parquet file, or CSV from stdin if source is None or '-'"""
+    if parquet:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(sys.stdin if source in (None, "-") else source, chunksize=chunk_size) as reader:
+            yield from reader
+
+
+def write_result_chunks(chunks: Iterator[pd.DataFrame], destination: Optional[str], parquet: bool):
+    """Write chunks to one CSV or Parquet file, or as CSV to stdout if destination is None or '-'"""
+    if parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        to_stdout = destination in (None, "-")
+        file = sys.stdout if to_stdout else open(destination, "w", newline="")
+        try:
+            for chunk_index, chunk in enumerate(chunks):
+                chunk.to_csv(file, header=chunk_index == 0, index=False)
+        finally:
+            if not to_stdout:
+                file.close()
+
+
+def evaluate_conditions(
+    conditions: pd.DataFrame,
+    engine: str = "polished",
+    target_flb: Optional[float] = None,
+    dps: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> pd.DataFrame:
+    """Add [PL], fraction ligand bound and optionally inverse quantities to a table of conditions
+
+    Args:
+        conditions (pd.DataFrame): Columns l, i, kdpl, kdpi and either p or
+            tflb. A target_flb column, if present, is used for the inverse
+            quantities in preference to the target_flb argument.
+        engine (str, optional): Key of ENGINES used for [PL]. Defaults to
+            "polished".
+        target_flb (float, optional): Fraction ligand bound for which the
+            inhibitor KD and concentration giving it are added as
+            kdpi_for_target_flb and i_for_target_flb. Defaults to None,
+            adding them only if there is a target_flb column.
+        dps (int, optional): Decimal places for the high_accuracy engine and
+            for high accuracy fallbacks of the inverse solvers. Defaults to
+            None.
+        max_workers (int, optional): Worker processes for the high_accuracy
+            engine. Defaults to None, using one per CPU.
+        executor (Executor, optional): Pool for the high_accuracy engine,
+            reused across calls rather than started for each. Defaults to
+            None, starting one with max_workers for this call.
+
+    Returns:
+        pd.DataFrame: conditions with pl and flb columns added, and p if
+            calculated from tflb
+    """
+    missing = [column for column in CONDITION_COLUMNS if column not in conditions.columns]
+    if "p" not in conditions.columns and "tflb" not in conditions.columns:
+        missing.append("p or tflb")
+    if missing:
+        raise ValueError(f"Conditions are missing columns: {', '.join(missing)}")
+    results = conditions.copy()
+    l, i, kdpl, kdpi = (conditions[column].to_numpy(dtype=float) for column in CONDITION_COLUMNS)
+    if "p" in conditions.columns:
+        p = conditions["p"].to_numpy(dtype=float)
+    else:
+        p = fast_binding_equations.calc_amount_p(conditions["tflb"].to_numpy(dtype=float), l, kdpl)
+        results["p"] = p
+    pl = ENGINES[engine](p, l, i, kdpl, kdpi, dps=dps, max_workers=max_workers, executor=executor)
+    results["pl"] = pl
+    results["flb"] = pl / l
+    if "target_flb" in conditions.columns:
+        target_flb = conditions["target_flb"].to_numpy(dtype=float)
+    if target_flb is not None:
+        results["kdpi_for_target_flb"] = fast_binding_equations.calc_kdpi_for_fractionl_bound(
+            p, l, i, kdpl, target_flb, dps=dps
+        )
+        results["i_for_target_flb"] = fast_binding_equations.calc_i_for_fractionl_bound(
+            p, l, kdpl, kdpi, target_flb, dps=dps
+        )
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="claffinity",
+        description="Calculate [PL] and fraction ligand bound for a table of competition experiment conditions. "
+        "Input columns are l, i, kdpl, kdpi and either p or tflb, in molar.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="CSV or Parquet file of conditions, default CSV on stdin")
+    parser.add_argument("-o", "--output", default="-", help="CSV or Parquet file to write, default CSV on stdout")
+    parser.add_argument("--input-format", choices=("csv", "parquet"), help="Default from the input file extension")
+    parser.add_argument("--output-format", choices=("csv", "parquet"), help="Default from the output file extension")
+    parser.add_argument(
+        "--engine",
+        choices=list(ENGINES),
+        default="polished",
+        help="Solver for [PL]: polished (default) is float64 refined on the cubic, adaptive escalates to mpmath "
+        "where float64 can not be trusted, high_accuracy uses mpmath for every row",
+    )
+    parser.add_argument(
+        "--target-flb",
+        type=float,
+        help="Also calculate the inhibitor KD and concentration giving this fraction ligand bound, "
+        "overridden per row by a target_flb column",
+    )
+    parser.add_argument("--dps", type=int, help="Decimal places for high accuracy evaluation")
+    parser.add_argument("--workers", type=int, help="Worker processes for the high_accuracy engine")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Rows per chunk, default {DEFAULT_CHUNK_SIZE}"
+    )
+    args = parser.parse_args(argv)
+
+    input_parquet = _is_parquet(args.input, args.input_format)
+    output_parquet = _is_parquet(args.output, args.output_format)
+    if (input_parquet and args.input == "-") or (output_parquet and args.output == "-"):
+        parser.error("Parquet can only be read from and written to files, not stdin or stdout")
+    if input_parquet or output_parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Reading or writing Parquet requires pyarrow, install it with pip install pyarrow")
+
+    chunks = read_condition_chunks(args.input, input_parquet, args.chunk_size)
+    # One pool for the whole run, rather than one per chunk
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.engine == "high_accuracy" else None
+    try:
+        write_result_chunks(
+            (evaluate_conditions(chunk, args.engine, args.target_flb, dps=args.dps, executor=executor) for chunk in chunks),
+            args.output,
+            output_parquet,
+        )
+    except ValueError as error:
+        print(f"claffinity: error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
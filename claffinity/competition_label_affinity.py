@@ -1,9 +1,11 @@
-from typing import Optional, Union, List, Tuple
+import sys
+from typing import TYPE_CHECKING, NamedTuple, Optional, Union, List, Tuple, Mapping
 import numpy as np
 from pathlib import Path
-from matplotlib import pyplot as plt
-import pandas as pd
-import progressbar
+
+# matplotlib and pandas are imported when first used, keeping the numerical core quick to import
+if TYPE_CHECKING:
+    import pandas as pd
 
 from .high_accuracy_binding_equations import (
     calc_amount_p,
@@ -11,9 +13,27 @@ from .high_accuracy_binding_equations import (
     calc_i_for_fractionl_bound,
     competition_pl,
 )
+from . import fast_binding_equations
+from .adaptive_precision import competition_pl_adaptive
+from .memoization import CompetitionCache
+from .adaptive_sampling import adaptive_sample
 from math import floor, ceil
 
 
+class PlotData(NamedTuple):
+    """Data drawn by a CompetitionLabelAffinity plot method, with one row of y per line"""
+
+    x_axis: np.ndarray
+    y: np.ndarray
+    line_values: np.ndarray  # The KD or concentration distinguishing each line
+    x_label: str
+    y_label: str
+    title: str
+    x_lim: Tuple[float, float]
+    y_lim: Optional[Tuple[float, float]]
+    y_scale: str
+
+
 class CompetitionLabelAffinity:
     
 
@@ -25,6 +45,9 @@ class CompetitionLabelAffinity:
         kdpl: Optional[float] = None,
         kdpi: Optional[float] = None,
         x_axis_resolution: float = 40,
+        dps: Optional[int] = None,
+        cache: Optional[CompetitionCache] = None,
+        adaptive_tolerance: Optional[float] = None,
     ):
         self.pkd_label_lookup = {
             "1": "1 (M)",
@@ -52,6 +75,12 @@ class CompetitionLabelAffinity:
         self.kdpl = kdpl
         self.kdpi = kdpi
         self.x_axis_resolution = x_axis_resolution
+        # If set, curves are sampled adaptively to this tolerance with at most x_axis_resolution points
+        self.adaptive_tolerance = adaptive_tolerance
+        # mpmath decimal places.  None uses the high_accuracy_binding_equations default for single points and
+        # float64 for batches and plots, otherwise batch points float64 can not resolve are recomputed at dps
+        self.dps = dps
+        self.cache = cache  # Opt-in CompetitionCache, None evaluates every call
         self.kd_str=r'K$_\mathrm{D}$'
 
     def float_to_prettyprint_conc(self, f:float)->str:
@@ -78,14 +107,110 @@ class CompetitionLabelAffinity:
         axis.set_xticklabels(xtick_labels)
         axis.set_xlim(pKD_begin, pKD_end)
 
-    def get_plot_line_labels(self, kds:Union[List[str], Tuple[str]]):
-        line_labels=[]
-        for kd in kds:
-            if kd in self.pkid_label_lookup:
-                line_labels.append(self.line_labels_lookup[str(kd)])
-            else:
-                line_labels.append(f"{kd}")
-        return line_labels
+    def sample_x_axis(self, pKD_begin: float, pKD_end: float, func):
+        """Sample a vectorised function of pKD for plotting
+
+        Uses x_axis_resolution evenly spaced points, or if adaptive_tolerance
+        is set, adaptive_sampling.adaptive_sample with at most
+        x_axis_resolution points.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: x axis, and func evaluated with x
+                along the last axis
+        """
+        if self.adaptive_tolerance is None:
+            x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
+            return x_axis, np.asarray(func(x_axis))
+        return adaptive_sample(
+            func, pKD_begin, pKD_end, tol=self.adaptive_tolerance, max_points=self.x_axis_resolution
+        )
+
+    def get_markevery(self, x_axis: np.ndarray, markevery: Union[int, range]):
+        """Marker indices for an x axis, given as if it had x_axis_resolution evenly spaced points
+
+        Adaptively sampled axes are marked at the points nearest those which
+        would have been marked on the evenly spaced axis.
+        """
+        if self.adaptive_tolerance is None:
+            return markevery
+        if isinstance(markevery, int):
+            markevery = range(0, self.x_axis_resolution, markevery)
+        marked_x = np.linspace(x_axis[0], x_axis[-1], self.x_axis_resolution)[list(markevery)]
+        return list(np.unique(np.abs(x_axis[:, np.newaxis] - marked_x[np.newaxis, :]).argmin(axis=0)))
+
+    def fraction_bound_vs_ligand_kd(self, ligand_pkds, l, i, kdpi, target_fraction_ligand_bound):
+        """Fraction ligand bound at ligand pKDs, protein set to reach the target without inhibitor
+
+        Rows are the entries of kdpi, columns the ligand pKDs.
+        """
+        ligand_kd_range = 10 ** (-np.asarray(ligand_pkds))
+        protein_concs = self.batch_calc_amount_p(target_fraction_ligand_bound, l, ligand_kd_range)
+        _, y = self.batch_competition_readout(
+            protein_concs[np.newaxis, :],
+            l,
+            i,
+            ligand_kd_range[np.newaxis, :],
+            np.asarray(kdpi, dtype=np.float64).reshape(-1)[:, np.newaxis],
+        )
+        return y
+
+    def get_plot_line_labels(self, kds:Union[List[float], Tuple[float]]):
+        return [self.float_to_prettyprint_conc(kd) for kd in kds]
+
+    def new_figure(self, filename: Optional[Union[str, Path]] = None):
+        """Create a figure and axes, through pyplot only if the figure is to be shown
+
+        Figures written to file are created directly and drawn with the
+        non-interactive Agg canvas, so no display or GUI backend is needed.
+        """
+        if filename is None:
+            from matplotlib import pyplot as plt
+            return plt.subplots(figsize=(8, 6))
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(8, 6))
+        return fig, fig.subplots()
+
+    def show_or_save(self, fig, filename: Optional[Union[str, Path]] = None):
+        """Write the figure to filename if given, otherwise show it"""
+        if filename is None:
+            from matplotlib import pyplot as plt
+            plt.show()
+        else:
+            fig.savefig(filename)
+
+    def apply_plot_data(self, ax, data: PlotData):
+        """Set the axis labels, title, limits and scale given in data"""
+        ax.set_xlabel(data.x_label)
+        ax.set_ylabel(data.y_label)
+        ax.title.set_text(data.title)
+        ax.set_yscale(data.y_scale)
+        ax.set_xlim(*data.x_lim)
+        if data.y_lim is not None:
+            ax.set_ylim(*data.y_lim)
+
+    def protein_needed_vs_ligand_kd_data(
+        self,
+        pKD_begin: float = 3,
+        pKD_end: float = 12,
+        l: float = 10e-9,
+        target_fraction_ligand_bound=0.7,
+    ) -> PlotData:
+        """Data for plot_protein_needed_vs_ligand_kd, without plotting"""
+        # Sampled on a log scale, as plotted
+        x_axis, log_protein_concs = self.sample_x_axis(
+            pKD_begin, pKD_end, lambda x: np.log10(self.batch_calc_amount_p(target_fraction_ligand_bound, l, 10 ** (-x)))
+        )
+        return PlotData(
+            x_axis=x_axis,
+            y=10 ** log_protein_concs[np.newaxis, :],
+            line_values=np.array([l]),
+            x_label=f"Ligand p{self.kd_str}",
+            y_label=r"[P$_0$] (M)",
+            title=f"Protein required for {target_fraction_ligand_bound} fraction ligand bound vs labeled ligand {self.kd_str}, [L$_0$]={self.float_to_prettyprint_conc(l)}",
+            x_lim=(pKD_begin, pKD_end),
+            y_lim=None,
+            y_scale="log",
+        )
 
     def plot_protein_needed_vs_ligand_kd(
         self,
@@ -93,7 +218,8 @@ class CompetitionLabelAffinity:
         pKD_end: float = 12,
         l: float = 10e-9,
         target_fraction_ligand_bound=0.7,
-    ):
+        filename: Optional[Union[str, Path]] = None,
+    ) -> PlotData:
         """
             Produce plot of amount of protein needed over a range of ligand KDs
 
@@ -107,23 +233,48 @@ class CompetitionLabelAffinity:
             pKD_end (float, optional): [description]. Defaults to 12.
             ligand_conc (float, optional): [description]. Defaults to 10e-9.
             target_fraction_ligand_bound (float, optional): [description]. Defaults to 0.7.
-            x_axis_resolution (int, optional): [description]. Defaults to 1000.
+            filename (Union[str, Path], optional): File to write the figure to
+                instead of showing it. Defaults to None.
+
+        Returns:
+            PlotData: The plotted data
         """
-        x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
-        ligand_kd_range = 10 ** (-x_axis)
-        protein_concs = np.array(calc_amount_p(target_fraction_ligand_bound, l, ligand_kd_range))
-        fig, ax = plt.subplots(figsize=(8, 6))
+        data = self.protein_needed_vs_ligand_kd_data(pKD_begin, pKD_end, l, target_fraction_ligand_bound)
+        fig, ax = self.new_figure(filename)
         self.set_x_ticks_and_labels(ax, pKD_begin, pKD_end)
-        ax.plot(x_axis, protein_concs, "k")
-        ax.set_xlabel(f"Ligand p{self.kd_str}")
-        ax.set_ylabel(r"[P$_0$] (M)")
-        plt.yscale("log")
+        ax.plot(data.x_axis, data.y[0], "k")
+        self.apply_plot_data(ax, data)
         ax.grid()
-        ax.title.set_text(
-            f"Protein required for {target_fraction_ligand_bound} fraction ligand bound vs labeled ligand {self.kd_str}, [L$_0$]={self.float_to_prettyprint_conc(l)}"
+        self.show_or_save(fig, filename)
+        return data
+
+    def signal_vs_ligand_kd_fixed_i_data(
+        self,
+        pKD_begin: float = 3,
+        pKD_end: float = 12,
+        p: float = 10e-6,
+        l: float = 10e-9,
+        i: float = 10e-6,
+        kdpi: float = 10e-6,
+        target_fraction_ligand_bound=0.7,
+    ) -> PlotData:
+        """Data for plot_signal_vs_ligand_kd_fixed_i, without plotting"""
+        x_axis, y = self.sample_x_axis(
+            pKD_begin, pKD_end, lambda x: self.batch_competition_readout(p, l, i, 10 ** (-x), kdpi)[1]
+        )
+        return PlotData(
+            x_axis=x_axis,
+            y=y[np.newaxis, :],
+            line_values=np.array([kdpi]),
+            x_label=f"Ligand p{self.kd_str}",
+            y_label="Fraction ligand bound",
+            title=f"Competition experiment fraction ligand bound over a range of ligand {self.kd_str}s"
+            + "\n"
+            + f"[P]={self.float_to_prettyprint_conc(p)}, [L]={self.float_to_prettyprint_conc(l)}, [I]={self.float_to_prettyprint_conc(i)}, inhibitor {self.kd_str}={self.float_to_prettyprint_conc(kdpi)}",
+            x_lim=(pKD_begin, pKD_end),
+            y_lim=(0, 1.05),
+            y_scale="linear",
         )
-        ax.set_xlim(pKD_begin, pKD_end)
-        plt.show()
 
     def plot_signal_vs_ligand_kd_fixed_i(
         self,
@@ -134,131 +285,192 @@ class CompetitionLabelAffinity:
         i: float = 10e-6,
         kdpi: float = 10e-6,
         target_fraction_ligand_bound=0.7,
-    ):
+        filename: Optional[Union[str, Path]] = None,
+    ) -> PlotData:
         """Produce plot of competition experiment sensitivity with fixed lignand
 
         Generates a supporting plot of signal (PL) in a competition experiment vs
         ligand KD for a fixed concentration and KD of inhibitor "Identification
-        of optimum ligand affinity for competition-based primary screens" by Shave et.al."""
-
-        x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
-        ligand_kd_range = 10 ** (-x_axis)
-        y = np.full((x_axis.shape[0]), np.nan)
-        for idx in range(ligand_kd_range.shape[0]):
-            y[idx] = competition_pl(**{"p": p, "l": l, "i": i, "kdpl": ligand_kd_range[idx], "kdpi": kdpi}) / l
-
-        fig, ax = plt.subplots(figsize=(8, 6))
+        of optimum ligand affinity for competition-based primary screens" by Shave et.al.
+        The figure is written to filename if given, otherwise shown."""
+        data = self.signal_vs_ligand_kd_fixed_i_data(pKD_begin, pKD_end, p, l, i, kdpi, target_fraction_ligand_bound)
+        fig, ax = self.new_figure(filename)
 
-        ax.plot(x_axis, y, "k")
+        ax.plot(data.x_axis, data.y[0], "k")
         self.set_x_ticks_and_labels(ax, pKD_begin, pKD_end)
-        ax.set_xlabel(f"Ligand p{self.kd_str}")
-        ax.set_ylabel("Fraction ligand bound")
-        ax.title.set_text(
-            f"Competition experiment fraction ligand bound over a range of ligand {self.kd_str}s"
-            + "\n"
-            + f"[P]={self.float_to_prettyprint_conc(p)}, [L]={self.float_to_prettyprint_conc(l)}, [I]={self.float_to_prettyprint_conc(i)}, inhibitor {self.kd_str}={self.float_to_prettyprint_conc(kdpi)}"
-        )
+        self.apply_plot_data(ax, data)
         ax.grid()
-        ax.set_ylim(0, 1.05)
-        plt.show()
+        self.show_or_save(fig, filename)
+        return data
+
     def calc_amount_p(self,fraction_bound, l, kdax):
         return float(calc_amount_p(fraction_bound,l,kdax).real)
 
-    def single_point_competition_readout(self, p: float, l: float, i: float, kdpl: float, kdpi: float):
-        return float(competition_pl(p, l, i, kdpl, kdpi).real)
+    def batch_calc_amount_p(self, fraction_bound, l, kdax) -> np.ndarray:
+        """Calculate amount of protein for arrays of fraction bound, [L] and KD, broadcast together
 
-    def plot_inhibitor_KD_vs_FLB(self,
+        Always evaluated in float64, whatever dps, as the formula has no
+        cancellation for fraction bound below 1.
+        """
+        return np.asarray(fast_binding_equations.calc_amount_p(fraction_bound, l, kdax))
+
+    def single_point_competition_readout(
+        self, p: float, l: float, i: float, kdpl: float, kdpi: float, dps: Optional[int] = None
+    ):
+        dps = self.dps if dps is None else dps
+        if self.cache is not None:
+            return float(self.cache.competition_pl(p, l, i, kdpl, kdpi, dps=dps).real)
+        return float(competition_pl(p, l, i, kdpl, kdpi, dps=dps).real)
+
+    def batch_competition_readout(
+        self,
+        p: Union[np.ndarray, float, "pd.DataFrame", Mapping],
+        l: Optional[Union[np.ndarray, float]] = None,
+        i: Optional[Union[np.ndarray, float]] = None,
+        kdpl: Optional[Union[np.ndarray, float]] = None,
+        kdpi: Optional[Union[np.ndarray, float]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate competition readouts for many conditions at once
+
+        Conditions are given either as arrays, broadcast against each other,
+        or as a pandas DataFrame (or other mapping) with p, l, i, kdpl and kdpi
+        columns passed as p.  If dps was not given, evaluated in float64 with
+        fast_binding_equations.competition_pl_polished.  If it was, evaluated
+        with adaptive_precision.competition_pl_adaptive, which keeps the same
+        polished root and recomputes at dps decimal places only the points
+        whose estimated relative error is above 1e-10, so well conditioned
+        conditions cost no more than float64.  Either is evaluated through
+        the cache if one was given.  Plots use this method, so dps applies to
+        them too.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: [PL] and fraction ligand bound
+        """
+        # A DataFrame can only have been passed if pandas is already imported
+        if isinstance(p, Mapping) or ("pandas" in sys.modules and isinstance(p, sys.modules["pandas"].DataFrame)):
+            p, l, i, kdpl, kdpi = (np.asarray(p[key], dtype=np.float64) for key in ("p", "l", "i", "kdpl", "kdpi"))
+        if self.dps is not None:
+            solver = competition_pl_adaptive if self.cache is None else self.cache.competition_pl_adaptive
+            pl, _ = solver(p, l, i, kdpl, kdpi, dps_tiers=(self.dps,))
+        elif self.cache is not None:
+            pl, _ = self.cache.competition_pl_polished(p, l, i, kdpl, kdpi)
+        else:
+            pl, _ = fast_binding_equations.competition_pl_polished(p, l, i, kdpl, kdpi)
+        pl = np.array(pl)
+        return pl, pl / np.asarray(l, dtype=np.float64)
+
+    def inhibitor_KD_vs_FLB_data(self,
         pKD_begin: float = 3,
         pKD_end: float = 12,
         l: float = 10e-9,
         i: float = 10e-6,
         kdpl: Union[float, List[float], Tuple[float]] = [1e-12,10e-12,100e-12,1e-9, 10e-9, 100e-9, 1e-6, 10e-6, 100e-6],
         target_fraction_ligand_bound=0.7,
-    ):
+    ) -> PlotData:
+        """Data for plot_inhibitor_KD_vs_FLB, without plotting, one line per ligand KD"""
         if isinstance(kdpl, (float, int)):
             kdpl=[kdpl]
-        # Parameters dictating range of simulation
-        x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
-        inhibitor_kd_range = 10**(-x_axis)
-        if isinstance(kdpl, float):
-            kdpl=[kdpl]
         kdpl = np.array(kdpl)
-        protein_concs = np.array(calc_amount_p(
-            target_fraction_ligand_bound, l, kdpl))
-        y = np.full((kdpl.shape[0], x_axis.shape[0]), np.nan)
-
-        for it_ligand_kd, ligand_kd in enumerate(kdpl):
-            print(f"Generating: {it_ligand_kd+1}/{len(kdpl)}")
-            for it_inhibitor_kds, inhibitor_kd in enumerate(inhibitor_kd_range):
-                p = protein_concs[it_ligand_kd]
-                y[it_ligand_kd][it_inhibitor_kds] = competition_pl(
-                    **{'p': p, 'l': l, 'i': i, 'kdpl': ligand_kd, 'kdpi': inhibitor_kd})/l
-
-        fig, ax = plt.subplots(figsize=(8, 6))
+        protein_concs = self.batch_calc_amount_p(target_fraction_ligand_bound, l, kdpl)
+        # Rows are ligand KDs, columns inhibitor KDs
+        x_axis, y = self.sample_x_axis(pKD_begin, pKD_end, lambda x: self.batch_competition_readout(
+            protein_concs[:, np.newaxis], l, i, kdpl[:, np.newaxis], 10**(-x[np.newaxis, :]))[1])
+        return PlotData(
+            x_axis=x_axis,
+            y=y,
+            line_values=kdpl,
+            x_label=f"Inhibitor p{self.kd_str}",
+            y_label="Fraction ligand bound",
+            title=f"Fraction ligand bound over a range of inhibitor {self.kd_str}s, [L$_0$]={self.float_to_prettyprint_conc(l)}, [I$_0$]={self.float_to_prettyprint_conc(i)}"
+            +f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}",
+            x_lim=(pKD_begin, pKD_end),
+            y_lim=(0, target_fraction_ligand_bound*1.1),
+            y_scale="linear",
+        )
+
+    def plot_inhibitor_KD_vs_FLB(self,
+        pKD_begin: float = 3,
+        pKD_end: float = 12,
+        l: float = 10e-9,
+        i: float = 10e-6,
+        kdpl: Union[float, List[float], Tuple[float]] = [1e-12,10e-12,100e-12,1e-9, 10e-9, 100e-9, 1e-6, 10e-6, 100e-6],
+        target_fraction_ligand_bound=0.7,
+        filename: Optional[Union[str, Path]] = None,
+    ) -> PlotData:
+        data = self.inhibitor_KD_vs_FLB_data(pKD_begin, pKD_end, l, i, kdpl, target_fraction_ligand_bound)
+        x_axis = data.x_axis
+        fig, ax = self.new_figure(filename)
         self.set_x_ticks_and_labels(ax, pKD_begin, pKD_end)
         
-        for idx in reversed(range(kdpl.shape[0])):
+        for idx in reversed(range(data.line_values.shape[0])):
             line_marker=self.plot_marker_styles[idx]
             mark_every_n_points=self.x_axis_resolution//10
             if line_marker=='x':
                 mark_every_n_points=range((self.x_axis_resolution//10)//2,self.x_axis_resolution,self.x_axis_resolution//10)
             if line_marker=='P':
                 mark_every_n_points=range((self.x_axis_resolution//10)//4,self.x_axis_resolution,self.x_axis_resolution//10)
-            ax.plot(x_axis, y[idx], 'k', label=self.float_to_prettyprint_conc(kdpl[idx]),
-                    marker=line_marker, markevery=mark_every_n_points, linewidth=1, markersize=7)
-        ax.set_xlabel(f"Inhibitor p{self.kd_str}")
-        ax.set_ylabel("Fraction ligand bound")
+            ax.plot(x_axis, data.y[idx], 'k', label=self.float_to_prettyprint_conc(data.line_values[idx]),
+                    marker=line_marker, markevery=self.get_markevery(x_axis, mark_every_n_points), linewidth=1, markersize=7)
+        self.apply_plot_data(ax, data)
         ax.legend()
         ax.grid()
-        ax.title.set_text(f"Fraction ligand bound over a range of inhibitor {self.kd_str}s, [L$_0$]={self.float_to_prettyprint_conc(l)}, [I$_0$]={self.float_to_prettyprint_conc(i)}"
-            +f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}")
-        ax.set_xlim(pKD_begin, pKD_end)
-        ax.set_ylim(0, target_fraction_ligand_bound*1.1)
-        plt.show()
+        self.show_or_save(fig, filename)
+        return data
 
-    def plot_ligand_KD_vs_FLB(self,
+    def ligand_KD_vs_FLB_data(self,
         pKD_begin: float = 3,
         pKD_end: float = 12,
         l: float = 10e-9,
         i: float = 10e-6,
         kdpi: Union[float, List[float], Tuple[float]] = [1e-9, 10e-9, 100e-9, 1e-6, 10e-6, 100e-6],
         target_fraction_ligand_bound=0.7,
-    ):
+    ) -> PlotData:
+        """Data for plot_ligand_KD_vs_FLB, without plotting, one line per inhibitor KD"""
         if isinstance(kdpi, (float, int)):
             kdpi=[kdpi]
-        x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
-        ligand_kd_range = 10**(-x_axis)  
         inhibitor_kds = np.array(kdpi)
-        protein_concs = np.array(calc_amount_p(
-            target_fraction_ligand_bound, l, ligand_kd_range))
-        y = np.full((inhibitor_kds.shape[0], x_axis.shape[0]), np.nan)
-
-        for it_inhibitor_kds, inhibitor_kd in enumerate(inhibitor_kds):
-            print("Generating : "+str(it_inhibitor_kds+1)+" / "+str(len(inhibitor_kds)))
-            for it_ligand_kd_range, ligand_kd in enumerate(ligand_kd_range):
-                p = protein_concs[it_ligand_kd_range]
-                y[it_inhibitor_kds][it_ligand_kd_range] = competition_pl(
-                    **{'p': p, 'l': l, 'i': i, 'kdpl': ligand_kd, 'kdpi': inhibitor_kd})/l
-
-        fig, ax = plt.subplots(figsize=(8, 6))
+        # Rows are inhibitor KDs, columns ligand KDs
+        x_axis, y = self.sample_x_axis(pKD_begin, pKD_end, lambda x: self.fraction_bound_vs_ligand_kd(
+            x, l, i, inhibitor_kds, target_fraction_ligand_bound))
+        return PlotData(
+            x_axis=x_axis,
+            y=y,
+            line_values=inhibitor_kds,
+            x_label=r"Ligand pK$_\mathrm{D}$",
+            y_label="Fraction ligand bound",
+            title=f"Fraction ligand bound over a range of ligand {self.kd_str}s, [L$_0$]={self.float_to_prettyprint_conc(l)}, [I$_0$]={self.float_to_prettyprint_conc(i)}" +
+            f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}",
+            x_lim=(3, 12),
+            y_lim=(0, target_fraction_ligand_bound*1.1),
+            y_scale="linear",
+        )
+
+    def plot_ligand_KD_vs_FLB(self,
+        pKD_begin: float = 3,
+        pKD_end: float = 12,
+        l: float = 10e-9,
+        i: float = 10e-6,
+        kdpi: Union[float, List[float], Tuple[float]] = [1e-9, 10e-9, 100e-9, 1e-6, 10e-6, 100e-6],
+        target_fraction_ligand_bound=0.7,
+        filename: Optional[Union[str, Path]] = None,
+    ) -> PlotData:
+        data = self.ligand_KD_vs_FLB_data(pKD_begin, pKD_end, l, i, kdpi, target_fraction_ligand_bound)
+        fig, ax = self.new_figure(filename)
         
         self.set_x_ticks_and_labels(ax, pKD_begin, pKD_end)
         
-        for idx in reversed(range(inhibitor_kds.shape[0])):
-            ax.plot(x_axis, y[idx], 'k', label=self.float_to_prettyprint_conc(kdpi[idx]),
-                    marker=self.plot_marker_styles[idx], markevery=self.x_axis_resolution//20, linewidth=1)
-        ax.set_xlabel(r"Ligand pK$_\mathrm{D}$")
-        ax.set_ylabel("Fraction ligand bound")
+        for idx in reversed(range(data.line_values.shape[0])):
+            ax.plot(data.x_axis, data.y[idx], 'k', label=self.float_to_prettyprint_conc(data.line_values[idx]),
+                    marker=self.plot_marker_styles[idx], markevery=self.get_markevery(data.x_axis, self.x_axis_resolution//20), linewidth=1)
+        self.apply_plot_data(ax, data)
         ax.legend()
         ax.grid()
-        ax.title.set_text(f"Fraction ligand bound over a range of ligand {self.kd_str}s, [L$_0$]={self.float_to_prettyprint_conc(l)}, [I$_0$]={self.float_to_prettyprint_conc(i)}" +
-                          f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}")
-        ax.set_xlim(3, 12)
         ax.vlines(6.975,0,1,linestyles="--")
-        ax.set_ylim(0, target_fraction_ligand_bound*1.1)
-        plt.show()
+        ax.set_ylim(*data.y_lim)
+        self.show_or_save(fig, filename)
+        return data
 
-    def plot_ligand_kd_vs_FLB_as_percentage(
+    def ligand_kd_vs_FLB_as_percentage_data(
         self,
         pKD_begin: float = 3,
         pKD_end: float = 12,
@@ -266,37 +478,47 @@ class CompetitionLabelAffinity:
         i: float = 10e-6,
         kdpi: Union[float, List[float], Tuple[float]] = [1e-9, 10e-9, 100e-9, 1e-6],
         target_fraction_ligand_bound=0.7,
-    ):
+    ) -> PlotData:
+        """Data for plot_ligand_kd_vs_FLB_as_percentage, without plotting, one line per inhibitor KD"""
         if isinstance(kdpi, (float, int)):
             kdpi=[kdpi]
-        x_axis = np.linspace(pKD_begin, pKD_end, self.x_axis_resolution)
-        ligand_kd_range = 10**(-x_axis)  # We are working in µM, which is 1e-6.
         kdpi = np.array(kdpi)
-        protein_concs = np.array(calc_amount_p(
-            target_fraction_ligand_bound,l, ligand_kd_range))
-        y = np.full((kdpi.shape[0], x_axis.shape[0]), np.nan)
-
-
-        for it_inhibitor_kds, inhibitor_kd in enumerate(kdpi):
-            for it_ligand_kd_range, ligand_kd in enumerate(ligand_kd_range):
-                p = protein_concs[it_ligand_kd_range]
-                y[it_inhibitor_kds][it_ligand_kd_range] = competition_pl(
-                    **{'p': p, 'l': l, 'i': i, 'kdpl': ligand_kd, 'kdpi': inhibitor_kd})/l
+        # Rows are inhibitor KDs, columns ligand KDs
+        x_axis, y = self.sample_x_axis(pKD_begin, pKD_end, lambda x: self.fraction_bound_vs_ligand_kd(
+            x, l, i, kdpi, target_fraction_ligand_bound))
         y = ((target_fraction_ligand_bound-y)/target_fraction_ligand_bound)*100
+        return PlotData(
+            x_axis=x_axis,
+            y=y,
+            line_values=kdpi,
+            x_label=f"Ligand p{self.kd_str}",
+            y_label="% Signal",
+            title=f"Protein-ligand signal over a range of ligand {self.kd_str}s, [L]={self.float_to_prettyprint_conc(l)}, [I]={self.float_to_prettyprint_conc(i)}"
+            +f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}",
+            x_lim=(pKD_begin, pKD_end),
+            y_lim=(0, 100*1.025),
+            y_scale="linear",
+        )
 
-        fig, ax = plt.subplots(figsize=(8, 6))
+    def plot_ligand_kd_vs_FLB_as_percentage(
+        self,
+        pKD_begin: float = 3,
+        pKD_end: float = 12,
+        l: float = 10e-9,
+        i: float = 10e-6,
+        kdpi: Union[float, List[float], Tuple[float]] = [1e-9, 10e-9, 100e-9, 1e-6],
+        target_fraction_ligand_bound=0.7,
+        filename: Optional[Union[str, Path]] = None,
+    ) -> PlotData:
+        data = self.ligand_kd_vs_FLB_as_percentage_data(pKD_begin, pKD_end, l, i, kdpi, target_fraction_ligand_bound)
+        fig, ax = self.new_figure(filename)
         self.set_x_ticks_and_labels(ax, pKD_begin, pKD_end)
-        plot_line_labels = self.get_plot_line_labels(kdpi)
-        for idx in range(kdpi.shape[0]):
-            ax.plot(x_axis, y[idx], 'k', label=plot_line_labels[idx],
-                    marker=self.plot_marker_styles[idx], markevery=self.x_axis_resolution//10+1, linewidth=1)
+        plot_line_labels = self.get_plot_line_labels(data.line_values)
+        for idx in range(data.line_values.shape[0]):
+            ax.plot(data.x_axis, data.y[idx], 'k', label=plot_line_labels[idx],
+                    marker=self.plot_marker_styles[idx], markevery=self.get_markevery(data.x_axis, self.x_axis_resolution//10+1), linewidth=1)
         #   ax.plot(x_axis, protein_concs/10, label="[P]")
-        ax.set_xlabel(f"Ligand p{self.kd_str}")
-        ax.set_ylabel("% Signal")
+        self.apply_plot_data(ax, data)
         ax.legend()
-        ax.title.set_text(f"Protein-ligand signal over a range of ligand {self.kd_str}s, [L]={self.float_to_prettyprint_conc(l)}, [I]={self.float_to_prettyprint_conc(i)}"
-            +f"\nTarget fraction ligand bound without inhibitor = {target_fraction_ligand_bound}")
-        ax.set_xlim(pKD_begin, pKD_end)
-        ax.set_ylim(0, 100*1.025)
-        plt.show()
-    
\ No newline at end of file
+        self.show_or_save(fig, filename)
+        return data
@@ -0,0 +1,396 @@
+"""
+Vectorised functions to calculate readout of competition experiments
+
+NumPy float64 companions to the functions in high_accuracy_binding_equations.
+Every argument may be a scalar or an array, arguments are broadcast against
+each other and the whole grid is evaluated at once rather than one mpmath
+point at a time.
+"""
+
+
+from typing import Optional
+import numpy as np
+from . import high_accuracy_binding_equations
+
+EQUATION_VERSION = 3  # Increment when a change alters results, invalidating cached sweeps
+
+
+def _as_float_arrays(*args):
+    """Convert arguments to float64 arrays broadcast to a common shape"""
+    return np.broadcast_arrays(*(np.asarray(arg, dtype=np.float64) for arg in args))
+
+
+def calc_amount_p(fraction_bound, l, kdax):
+    """ Calculate amount of protein for a given fraction bound and KD"""
+    fraction_bound, l, kdax = _as_float_arrays(fraction_bound, l, kdax)
+    return ((-(kdax * fraction_bound) - l * fraction_bound + l * fraction_bound * fraction_bound) / (-1 + fraction_bound))[
+        ()
+    ]
+
+
+def _unbound_protein_excess(p, l, kdpl, targetflb):
+    """Protein left over when the target fraction ligand bound is reached without inhibitor
+
+    (1 - targetflb) * [P] - targetflb * (kdpl + (1 - targetflb) * [L]), which is
+    positive only where the target is below the fraction bound with no
+    inhibitor.  Returned with the sum of the magnitudes of its two terms, for
+    estimating cancellation.
+    """
+    unbound_fraction = 1 - targetflb
+    free_protein_term = unbound_fraction * p
+    bound_term = targetflb * (kdpl + unbound_fraction * l)
+    return free_protein_term - bound_term, np.abs(free_protein_term) + np.abs(bound_term)
+
+
+def _inverse_result(result, relative_error, high_accuracy_func, args, dps, rtol, allow_zero):
+    """Recompute ill-conditioned inverse results at high precision, then mark infeasible results with NaN"""
+    if dps is not None:
+        flat_result = result.reshape(-1)
+        for index in np.flatnonzero(~(relative_error <= rtol)):
+            point = tuple(float(arg.flat[index]) for arg in args)
+            flat_result[index] = float(high_accuracy_func(*point, dps=dps))
+    targetflb = args[-1]
+    feasible = np.isfinite(result) & ((result >= 0) if allow_zero else (result > 0)) & (targetflb > 0) & (targetflb < 1)
+    return np.where(feasible, result, np.nan)[()]
+
+
+def calc_kdpi_for_fractionl_bound(p, l, i, kdpl, targetflb, dps: Optional[int] = None, rtol: float = 1e-10):
+    """Calculate the inhibitor KD giving a target fraction ligand bound, over arrays
+
+    Float64 form of high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound,
+    rearranged so the only cancellation is in two differences, whose rounding
+    error is estimated for every point.  If dps is given, points with an
+    estimated relative error above rtol are recomputed with the high
+    accuracy function at dps decimal places.  Results which are not
+    physical, a KD that is not positive because the target can not be
+    reached with this much inhibitor and protein, are NaN.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        targetflb (array_like): Target fraction ligand bound
+        dps (int, optional): Decimal places of the high precision fallback.
+            Defaults to None, disabling the fallback.
+        rtol (float, optional): Estimated relative error above which the
+            fallback is used. Defaults to 1e-10.
+
+    Returns:
+        np.ndarray: Inhibitor KD, with the broadcast shape of the arguments
+    """
+    args = _as_float_arrays(p, l, i, kdpl, targetflb)
+    p, l, i, kdpl, targetflb = args
+    excess, excess_magnitude = _unbound_protein_excess(p, l, kdpl, targetflb)
+    unbound_fraction = 1 - targetflb
+    inhibitor_term = i * unbound_fraction
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        kdpi = kdpl * targetflb * (inhibitor_term - excess) / (unbound_fraction * excess)
+        excess_error = np.finfo(np.float64).eps * excess_magnitude
+        relative_error = excess_error / np.abs(excess) + (
+            np.finfo(np.float64).eps * np.abs(inhibitor_term) + excess_error
+        ) / np.abs(inhibitor_term - excess)
+    return _inverse_result(
+        np.array(kdpi),
+        relative_error,
+        high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound,
+        args,
+        dps,
+        rtol,
+        allow_zero=False,
+    )
+
+
+def calc_i_for_fractionl_bound(p, l, kdpl, kdpi, targetflb, dps: Optional[int] = None, rtol: float = 1e-10):
+    """Calculate the inhibitor concentration giving a target fraction ligand bound, over arrays
+
+    Float64 form of high_accuracy_binding_equations.calc_i_for_fractionl_bound,
+    rearranged so the only cancellation is in one difference, whose rounding
+    error is estimated for every point.  If dps is given, points with an
+    estimated relative error above rtol are recomputed with the high
+    accuracy function at dps decimal places.  Results which are not
+    physical, a negative concentration because the target is above the
+    fraction bound without inhibitor, are NaN.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+        targetflb (array_like): Target fraction ligand bound
+        dps (int, optional): Decimal places of the high precision fallback.
+            Defaults to None, disabling the fallback.
+        rtol (float, optional): Estimated relative error above which the
+            fallback is used. Defaults to 1e-10.
+
+    Returns:
+        np.ndarray: Inhibitor concentration, with the broadcast shape of the
+            arguments
+    """
+    args = _as_float_arrays(p, l, kdpl, kdpi, targetflb)
+    p, l, kdpl, kdpi, targetflb = args
+    excess, excess_magnitude = _unbound_protein_excess(p, l, kdpl, targetflb)
+    unbound_fraction = 1 - targetflb
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        i = (kdpi * unbound_fraction + kdpl * targetflb) * excess / (kdpl * targetflb * unbound_fraction)
+        relative_error = np.finfo(np.float64).eps * excess_magnitude / np.abs(excess)
+    # Exactly at the fraction bound without inhibitor, no inhibitor is needed
+    return _inverse_result(
+        np.array(i),
+        np.where(excess == 0, 0, relative_error),
+        high_accuracy_binding_equations.calc_i_for_fractionl_bound,
+        args,
+        dps,
+        rtol,
+        allow_zero=True,
+    )
+
+
+def competition_cubic_coefficients(p, l, i, kdpl, kdpi):
+    """Coefficients of the mass-balance cubic solved for PL in a competition
+
+    The PL concentration in a 1:1:1 competition experiment is a root of
+    a*[PL]^3 + b*[PL]^2 + c*[PL] + d = 0.  The physical root lies between 0 and
+    the PL formed with no inhibitor present.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: a, b, c and d
+    """
+    p, l, i, kdpl, kdpi = _as_float_arrays(p, l, i, kdpl, kdpi)
+    a = kdpl - kdpi
+    b = p * kdpi - p * kdpl + i * kdpl + kdpi * kdpl - kdpl * kdpl + 2 * kdpi * l - kdpl * l
+    c = -2 * p * kdpi * l + p * kdpl * l - i * kdpl * l - kdpi * kdpl * l - kdpi * l * l
+    d = kdpi * l * l * p
+    return a, b, c, d
+
+
+def competition_root_error_estimate(pl, a, b, c, d, unit_roundoff=np.finfo(np.float64).eps):
+    """Estimate the absolute error in a root of the competition cubic
+
+    A Newton step gives the distance from pl to the nearest root.  The
+    rounding error made evaluating the cubic, unit_roundoff times the sum of
+    the magnitudes of its terms, is added so that roots which can not be
+    resolved at the working precision are not reported as accurate.  Works
+    on NumPy arrays and on mpmath numbers alike.
+    """
+    residual = ((a * pl + b) * pl + c) * pl + d
+    derivative = (3 * a * pl + 2 * b) * pl + c
+    magnitude = abs(a * pl * pl * pl) + abs(b * pl * pl) + abs(c * pl) + abs(d)
+    return (abs(residual) + unit_roundoff * magnitude) / abs(derivative)
+
+
+def competition_pl(p, l, i, kdpl, kdpi):
+    """Calculate PL concentration in competition experiment over arrays
+
+    Float64 companion to high_accuracy_binding_equations.competition_pl, with
+    all arguments broadcast against each other.  The physical root of the
+    competition cubic is found by competition_pl_trig and refined by
+    competition_pl_polished, so it always lies between zero and the PL formed
+    without inhibitor.  Over the reference dataset the relative error is
+    below 3e-10, with a median of 2e-16.  The float64 closed form is not
+    used as its terms cancel so heavily that it can be wrong by orders of
+    magnitude, and even negative, for tight binders.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+
+    Returns:
+        np.ndarray: [PL], with the broadcast shape of the arguments
+    """
+    return competition_pl_polished(p, l, i, kdpl, kdpi)[0]
+
+
+def _no_inhibitor_pl(p, l, kdpl):
+    """PL formed without inhibitor, the upper limit of the physical competition root"""
+    total = p + l + kdpl
+    return 2 * p * l / (total + np.sqrt(total * total - 4 * p * l))
+
+
+def _stable_quadratic_roots(a, b, c):
+    """Both roots of a*x^2 + b*x + c = 0 without cancellation between b and the square root"""
+    q = -(b + np.copysign(np.sqrt(np.maximum(b * b - 4 * a * c, 0)), b)) / 2
+    return q / a, c / q
+
+
+def competition_pl_trig(p, l, i, kdpl, kdpi):
+    """Calculate PL concentration in competition experiment with real arithmetic
+
+    The competition cubic always has three real roots, so they are found with
+    the trigonometric form rather than complex cube roots.  Only the root of
+    largest magnitude is taken from the trigonometric form as it is the only
+    one it gives to full relative accuracy.  Vieta's formulas then give the
+    other two as roots of a quadratic, and the root lying between zero and
+    the PL formed without inhibitor is returned.  Where the KDs are equal the
+    cubic term vanishes and the remaining quadratic is solved directly.
+    Works on scalars and on broadcast arrays.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+
+    Returns:
+        np.ndarray: [PL], with the broadcast shape of the arguments
+    """
+    a, b, c, d = competition_cubic_coefficients(p, l, i, kdpl, kdpi)
+    p, l, kdpl = _as_float_arrays(p, l, kdpl)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        shift = -b / (3 * a)
+        depressed_p = (3 * a * c - b * b) / (3 * a * a)
+        depressed_q = (2 * b * b * b - 9 * a * b * c + 27 * a * a * d) / (27 * a * a * a)
+        amplitude = 2 * np.sqrt(-depressed_p / 3)
+        angle = np.arccos(np.clip(3 * depressed_q / (depressed_p * amplitude), -1, 1)) / 3
+        trig_roots = amplitude * np.cos(angle - 2 * np.pi * np.arange(3).reshape((3,) + (1,) * a.ndim) / 3) + shift
+        largest_root = np.take_along_axis(trig_roots, np.argmax(np.abs(trig_roots), axis=0)[np.newaxis], axis=0)[0]
+
+        # Vieta: the other two roots have product -d/(a*r) and sum (c + d/r)/(a*r), neither of which
+        # cancels against the large -b/a term when the KDs are close
+        roots = np.stack(
+            (largest_root,)
+            + _stable_quadratic_roots(
+                np.ones_like(a), -(c + d / largest_root) / (a * largest_root), -d / (a * largest_root)
+            )
+        )
+        equal_kds = ~np.isfinite(largest_root)
+        if np.any(equal_kds):
+            quadratic_roots = _stable_quadratic_roots(b[equal_kds], c[equal_kds], d[equal_kds])
+            roots[:, equal_kds] = np.stack((np.full_like(quadratic_roots[0], np.nan),) + quadratic_roots)
+
+        upper_limit = _no_inhibitor_pl(p, l, kdpl)
+        distance_outside_limits = np.where(roots < 0, -roots, np.maximum(roots - upper_limit, 0))
+        distance_outside_limits[np.isnan(distance_outside_limits)] = np.inf
+        physical = np.argmin(distance_outside_limits, axis=0)
+    return np.take_along_axis(roots, physical[np.newaxis], axis=0)[0][()]
+
+
+def competition_pl_polished(p, l, i, kdpl, kdpi, estimate=None, max_iterations: int = 60):
+    """Calculate PL concentration by polishing an estimate on the competition cubic
+
+    Refines a float64 estimate of [PL] with vectorised Halley steps on the
+    mass-balance cubic.  The physical root is bracketed by zero and the PL
+    formed without inhibitor, which never exceeds the lesser of [P] and [L].
+    Estimates outside the bracket, or not finite, start from its midpoint,
+    and any step leaving the bracket is replaced by bisection, so every point
+    converges however poor its estimate.  Each point stops once its step is
+    within a few ulps, or within the rounding error of evaluating the cubic.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+        estimate (array_like, optional): Starting [PL]. Defaults to None, using
+            competition_pl_trig.
+        max_iterations (int, optional): Maximum number of steps. Defaults to 60.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: [PL], and its estimated relative error
+            from competition_root_error_estimate.  Near a double root a tiny
+            residual can leave [PL] far from the root, which the estimate
+            accounts for through the slope of the cubic.  Rounding of the
+            coefficients is not included, so errors of a few ulps may exceed
+            it.
+    """
+    if estimate is None:
+        estimate = competition_pl_trig(p, l, i, kdpl, kdpi)
+    a, b, c, d = competition_cubic_coefficients(p, l, i, kdpl, kdpi)
+    p, l, kdpl, estimate = _as_float_arrays(p, l, kdpl, estimate)
+    lower = np.zeros_like(a)
+    upper = _no_inhibitor_pl(p, l, kdpl)
+    pl = np.where(np.isfinite(estimate) & (estimate >= lower) & (estimate <= upper), estimate, upper / 2)
+    converged = np.zeros(pl.shape, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            residual = ((a * pl + b) * pl + c) * pl + d
+            # The cubic falls from d > 0 at zero through the root, so its sign tells which side pl is on
+            lower = np.where(residual > 0, pl, lower)
+            upper = np.where(residual < 0, pl, upper)
+            derivative = (3 * a * pl + 2 * b) * pl + c
+            second_derivative = 6 * a * pl + 2 * b
+            halley_pl = pl - 2 * residual * derivative / (2 * derivative * derivative - residual * second_derivative)
+            # Steps below the rounding error of evaluating the cubic are noise rather than progress
+            magnitude = np.abs(a * pl * pl * pl) + np.abs(b * pl * pl) + np.abs(c * pl) + np.abs(d)
+            resolution = 4 * np.finfo(np.float64).eps * (np.abs(pl) + magnitude / np.abs(derivative))
+            converged |= (residual == 0) | (np.abs(halley_pl - pl) <= resolution)
+            if np.all(converged):
+                break
+            new_pl = np.where((halley_pl >= lower) & (halley_pl <= upper), halley_pl, (lower + upper) / 2)
+            pl = np.where(converged, pl, new_pl)
+        error_estimate = competition_root_error_estimate(pl, a, b, c, d)
+        relative_error = np.where(error_estimate == 0, 0, error_estimate / np.abs(pl))
+    return pl[()], relative_error[()]
+
+
+SENSITIVITY_PARAMETERS = ("p", "l", "i", "kdpl", "kdpi")
+
+
+def competition_pl_sensitivities(p, l, i, kdpl, kdpi):
+    """Calculate PL concentration and its derivatives in competition experiment over arrays
+
+    [PL] is found with competition_pl_polished, then differentiated
+    implicitly: where F = a*[PL]^3 + b*[PL]^2 + c*[PL] + d is zero,
+    d[PL]/dx = -(dF/dx) / (dF/d[PL]) for each parameter x, with dF/dx formed
+    from the derivatives of the cubic coefficients.  The cost is about one
+    evaluation of the cubic per parameter.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: [PL], and its derivatives with respect
+            to p, l, i, kdpl and kdpi stacked along the first axis, in
+            SENSITIVITY_PARAMETERS order
+    """
+    pl, _ = competition_pl_polished(p, l, i, kdpl, kdpi)
+    a, b, c, d = competition_cubic_coefficients(p, l, i, kdpl, kdpi)
+    p, l, i, kdpl, kdpi, pl = _as_float_arrays(p, l, i, kdpl, kdpi, pl)
+    zero = np.zeros_like(pl)
+    one = np.ones_like(pl)
+    # Derivatives of a, b, c and d with respect to each parameter
+    coefficient_derivatives = (
+        (zero, kdpi - kdpl, -2 * kdpi * l + kdpl * l, kdpi * l * l),
+        (
+            zero,
+            2 * kdpi - kdpl,
+            -2 * p * kdpi + p * kdpl - i * kdpl - kdpi * kdpl - 2 * kdpi * l,
+            2 * kdpi * l * p,
+        ),
+        (zero, kdpl, -kdpl * l, zero),
+        (one, -p + i + kdpi - 2 * kdpl - l, p * l - i * l - kdpi * l, zero),
+        (-one, p + kdpl + 2 * l, -2 * p * l - kdpl * l - l * l, l * l * p),
+    )
+    derivative_pl = (3 * a * pl + 2 * b) * pl + c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sensitivities = np.stack(
+            [-(((da * pl + db) * pl + dc) * pl + dd) / derivative_pl for da, db, dc, dd in coefficient_derivatives]
+        )
+    return pl[()], sensitivities
+
+
+def fraction_bound_sensitivities(p, l, i, kdpl, kdpi):
+    """Calculate fraction ligand bound and its derivatives in competition experiment over arrays
+
+    Fraction ligand bound is [PL]/[L], differentiated with
+    competition_pl_sensitivities.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Fraction ligand bound, and its
+            derivatives with respect to p, l, i, kdpl and kdpi stacked along
+            the first axis, in SENSITIVITY_PARAMETERS order
+    """
+    pl, pl_sensitivities = competition_pl_sensitivities(p, l, i, kdpl, kdpi)
+    pl, l = _as_float_arrays(pl, l)
+    sensitivities = pl_sensitivities / l
+    sensitivities[SENSITIVITY_PARAMETERS.index("l")] -= pl / (l * l)
+    return (pl / l)[()], sensitivities
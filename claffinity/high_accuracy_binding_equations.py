@@ -3,11 +3,73 @@ Functions to calculate readout of competition experiments
 
 Used in the preparation of the manuscript "Identification of optimum ligand affinity
 for competition-based primary screens" by Shave et.al.
+
+Calculations use a private mpmath context for each precision, so the global
+mpmath.mp context is never modified.  Precision is chosen per call with the
+dps argument, for all calls within a block with the precision context
+manager, or otherwise defaults to DEFAULT_DPS decimal places.
 """
 
 
-from mpmath import mpf, sqrt, power, mp, fabs, almosteq
-mp.dps = 500  # Set mpmath to use high accuracy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from mpmath import MPContext
+
+EQUATION_VERSION = 2  # Increment when a change alters results, invalidating cached sweeps
+DEFAULT_DPS = 100  # Decimal places used when no precision is given, see benchmarks/benchmark_precision.py
+_scoped_dps = ContextVar("claffinity_scoped_dps", default=None)
+_contexts = {}
+
+# Constants used by competition_pl, computed once for each working precision
+_competition_constants = {}
+
+
+@contextmanager
+def precision(dps: int):
+    """Set the decimal places used by calls made within a with block
+
+    Calls given an explicit dps argument are unaffected.
+
+    Args:
+        dps (int): Decimal places of precision
+    """
+    token = _scoped_dps.set(dps)
+    try:
+        yield
+    finally:
+        _scoped_dps.reset(token)
+
+
+def _get_context(dps: Optional[int] = None) -> MPContext:
+    """Private mpmath context working at the requested precision"""
+    if dps is None:
+        dps = _scoped_dps.get()
+    if dps is None:
+        dps = DEFAULT_DPS
+    ctx = _contexts.get(dps)
+    if ctx is None:
+        ctx = MPContext()
+        ctx.dps = dps
+        _contexts[dps] = ctx
+    return ctx
+
+
+def _get_competition_constants(ctx: MPContext):
+    """Constants of the competition closed form at the precision of ctx"""
+    constants = _competition_constants.get(ctx.prec)
+    if constants is None:
+        one_third = ctx.mpf(1) / 3
+        two_thirds = ctx.mpf(2) / 3
+        constants = (
+            one_third,
+            ctx.power(2, one_third),
+            ctx.power(2, two_thirds),
+            1 - complex(0, 1) * ctx.sqrt(3),
+            1 + complex(0, 1) * ctx.sqrt(3),
+        )
+        _competition_constants[ctx.prec] = constants
+    return constants
 
 
 def calc_amount_p(fraction_bound, l, kdax):
@@ -15,769 +77,181 @@ def calc_amount_p(fraction_bound, l, kdax):
     return (-(kdax*fraction_bound) - l*fraction_bound + l*fraction_bound*fraction_bound)/(-1 + fraction_bound)
 
 
-def calc_kdpi_for_fractionl_bound(p, l, i, kdpl, targetflb):
-    p=mpf(p)
-    l=mpf(l)
-    i=mpf(i)
-    kdpl=mpf(kdpl)
-    targetflb=mpf(targetflb)
-    return float((kdpl*targetflb*(i - p - i*targetflb + kdpl*targetflb + l*targetflb + p*targetflb - l*power(targetflb, 2)))/((-1 + targetflb)*(-p + kdpl*targetflb + l*targetflb + p*targetflb - l*power(targetflb, 2))).real)
+def calc_kdpi_for_fractionl_bound(p, l, i, kdpl, targetflb, dps: Optional[int] = None):
+    ctx = _get_context(dps)
+    p=ctx.mpf(p)
+    l=ctx.mpf(l)
+    i=ctx.mpf(i)
+    kdpl=ctx.mpf(kdpl)
+    targetflb=ctx.mpf(targetflb)
+    return float((kdpl*targetflb*(i - p - i*targetflb + kdpl*targetflb + l*targetflb + p*targetflb - l*ctx.power(targetflb, 2)))/((-1 + targetflb)*(-p + kdpl*targetflb + l*targetflb + p*targetflb - l*ctx.power(targetflb, 2))).real)
 
-def calc_i_for_fractionl_bound(p,l,kdpl,kdpi,targetflb):
-    p=mpf(p)
-    l=mpf(l)
-    kdpl=mpf(kdpl)
-    kdpi=mpf(kdpi)
-    targetflb=mpf(targetflb)
-    return ((-kdpi + kdpi*targetflb - kdpl*targetflb)*(p - kdpl*targetflb - l*targetflb - p*targetflb + l*power(targetflb,2)))/(kdpl*(-targetflb + power(targetflb,2)))
+def calc_i_for_fractionl_bound(p,l,kdpl,kdpi,targetflb, dps: Optional[int] = None):
+    ctx = _get_context(dps)
+    p=ctx.mpf(p)
+    l=ctx.mpf(l)
+    kdpl=ctx.mpf(kdpl)
+    kdpi=ctx.mpf(kdpi)
+    targetflb=ctx.mpf(targetflb)
+    return ((-kdpi + kdpi*targetflb - kdpl*targetflb)*(p - kdpl*targetflb - l*targetflb - p*targetflb + l*ctx.power(targetflb,2)))/(kdpl*(-targetflb + ctx.power(targetflb,2)))
+
+
+def near_equal_kd_pl(p, l, i, kdpl, kdpi, sqrt):
+    """Calculate PL concentration in competition experiment with equal or nearly equal KDs
+
+    With equal KDs, ligand and inhibitor compete for protein as a single
+    species, so the protein bound to either is the root of a quadratic and is
+    shared between them in proportion to their concentrations.  For unequal
+    KDs the mass-balance cubic differs from that quadratic by a term
+    proportional to kdpi - kdpl, and the root is expanded to third order in
+    the difference, giving a relative error of order ((kdpi - kdpl)/kdpl)^4.
+    No term cancels as the KDs approach each other, unlike the closed form.
+    Uses only arithmetic and the given sqrt, so works on mpmath numbers with
+    sqrt=ctx.sqrt and on NumPy arrays with sqrt=np.sqrt.
+    """
+    delta = kdpi - kdpl
+    total = l + i
+    # Square root of (p + total + kdpl)^2 - 4*p*total, in a form with no cancellation
+    sqrt_discriminant = sqrt((p - total) ** 2 + kdpl * (kdpl + 2 * (p + total)))
+    pl = 2 * p * l / (p + total + kdpl + sqrt_discriminant)
+    # Writing the cubic as q(PL) + delta*r(PL), with q the equal KD quadratic, the series terms
+    # follow from the derivatives of q and r at the equal KD root
+    neg_dq = kdpl * l * sqrt_discriminant
+    half_d2q = kdpl * total
+    r = (l - pl) * (pl * pl - (p + kdpl + l) * pl + l * p)
+    dr = -3 * pl * pl + 2 * (p + kdpl + 2 * l) * pl - l * (2 * p + kdpl + l)
+    half_d2r = -3 * pl + p + kdpl + 2 * l
+    first = r / neg_dq
+    second = (half_d2q * first * first + dr * first) / neg_dq
+    third = (2 * half_d2q * first * second + dr * second + half_d2r * first * first) / neg_dq
+    return pl + delta * (first + delta * (second + delta * third))
 
 
 # 1:1:1 competition - see https://stevenshave.github.io/pybindingcurve/simulate_competition.html
 # Readout is PL
-def competition_pl(p, l, i, kdpl, kdpi):
+def competition_pl(p, l, i, kdpl, kdpi, dps: Optional[int] = None):
     """Calculate PL concentration in competition experiment
 
     Calculate the protein-ligand complex formed in a competition experiment.
     See https://stevenshave.github.io/pybindingcurve/simulate_competition.html
-    The correct solution is chosen based on which KD is larger etc.  A
-    correction is applied if the KDs are equal.
+    The correct solution is chosen based on which KD is larger etc.  Where
+    the KDs are so close that the closed form would lose more than half the
+    working precision, near_equal_kd_pl is used instead, its series being
+    exact to the working precision there.  Evaluated at dps decimal
+    places if given, otherwise at the precision set by the precision
+    context manager or DEFAULT_DPS.
+
+    PL is a root of a*PL^3 + b*PL^2 + c*PL + d = 0, and the closed form below
+    is written in terms of a, b, c and the shared terms delta_0 and delta_1,
+    each evaluated once.  Constants are cached per working precision.
     """
-    p = mpf(p)
-    l = mpf(l)
-    i = mpf(i)
-    kdpl = mpf(kdpl)
-    kdpi = mpf(kdpi)
-    if almosteq(kdpl, kdpi, 1e-15):
-        kdpi += 1e-15
+    ctx = _get_context(dps)
+    p = ctx.mpf(p)
+    l = ctx.mpf(l)
+    i = ctx.mpf(i)
+    kdpl = ctx.mpf(kdpl)
+    kdpi = ctx.mpf(kdpi)
+    one_third, cbrt_2, cbrt_4, one_minus_i_sqrt_3, one_plus_i_sqrt_3 = _get_competition_constants(ctx)
+    # The closed form loses about two digits for each digit the KDs agree to, while the series
+    # errs by the fourth power of their relative difference
+    if abs(kdpi - kdpl) <= ctx.ldexp(max(kdpl, kdpi), -ctx.prec // 4):
+        return near_equal_kd_pl(p, l, i, kdpl, kdpi, ctx.sqrt)
+    # Powers shared between the terms below
+    p_2 = ctx.power(p, 2)
+    p_3 = ctx.power(p, 3)
+    i_2 = ctx.power(i, 2)
+    i_3 = ctx.power(i, 3)
+    l_2 = ctx.power(l, 2)
+    l_3 = ctx.power(l, 3)
+    kdpl_2 = ctx.power(kdpl, 2)
+    kdpl_3 = ctx.power(kdpl, 3)
+    kdpl_4 = ctx.power(kdpl, 4)
+    kdpl_5 = ctx.power(kdpl, 5)
+    kdpl_6 = ctx.power(kdpl, 6)
+    kdpi_2 = ctx.power(kdpi, 2)
+    kdpi_3 = ctx.power(kdpi, 3)
+    a = -kdpi + kdpl
+    b = p * kdpi - p * kdpl + i * kdpl + kdpi * kdpl - kdpl_2 + 2 * kdpi * l - kdpl * l
+    c = -2 * p * kdpi * l + p * kdpl * l - i * kdpl * l - kdpi * kdpl * l - kdpi * l_2
+    # -delta_0 = 3ac - b^2, and -delta_1 = -2b^3 + 9abc - 27a^2d expanded in full
+    neg_delta_0 = -ctx.power(b, 2) + 3 * a * c
+    neg_delta_1 = (
+        -2 * p_3 * kdpi_3
+        + 6 * p_3 * kdpi_2 * kdpl
+        - 6 * p_2 * i * kdpi_2 * kdpl
+        - 6 * p_2 * kdpi_3 * kdpl
+        - 6 * p_3 * kdpi * kdpl_2
+        + 12 * p_2 * i * kdpi * kdpl_2
+        - 6 * p * i_2 * kdpi * kdpl_2
+        + 18 * p_2 * kdpi_2 * kdpl_2
+        - 12 * p * i * kdpi_2 * kdpl_2
+        - 6 * p * kdpi_3 * kdpl_2
+        + 2 * p_3 * kdpl_3
+        - 6 * p_2 * i * kdpl_3
+        + 6 * p * i_2 * kdpl_3
+        - 2 * i_3 * kdpl_3
+        - 18 * p_2 * kdpi * kdpl_3
+        + 24 * p * i * kdpi * kdpl_3
+        - 6 * i_2 * kdpi * kdpl_3
+        + 18 * p * kdpi_2 * kdpl_3
+        - 6 * i * kdpi_2 * kdpl_3
+        - 2 * kdpi_3 * kdpl_3
+        + 6 * p_2 * kdpl_4
+        - 12 * p * i * kdpl_4
+        + 6 * i_2 * kdpl_4
+        - 18 * p * kdpi * kdpl_4
+        + 12 * i * kdpi * kdpl_4
+        + 6 * kdpi_2 * kdpl_4
+        + 6 * p * kdpl_5
+        - 6 * i * kdpl_5
+        - 6 * kdpi * kdpl_5
+        + 2 * kdpl_6
+        + 6 * p_2 * kdpi_3 * l
+        - 15 * p_2 * kdpi_2 * kdpl * l
+        + 3 * p * i * kdpi_2 * kdpl * l
+        + 3 * p * kdpi_3 * kdpl * l
+        + 12 * p_2 * kdpi * kdpl_2 * l
+        - 9 * p * i * kdpi * kdpl_2 * l
+        - 3 * i_2 * kdpi * kdpl_2 * l
+        - 3 * p * kdpi_2 * kdpl_2 * l
+        - 6 * i * kdpi_2 * kdpl_2 * l
+        - 3 * kdpi_3 * kdpl_2 * l
+        - 3 * p_2 * kdpl_3 * l
+        + 6 * p * i * kdpl_3 * l
+        - 3 * i_2 * kdpl_3 * l
+        - 3 * p * kdpi * kdpl_3 * l
+        + 9 * i * kdpi * kdpl_3 * l
+        + 12 * kdpi_2 * kdpl_3 * l
+        + 3 * p * kdpl_4 * l
+        - 3 * i * kdpl_4 * l
+        - 15 * kdpi * kdpl_4 * l
+        + 6 * kdpl_5 * l
+        - 6 * p * kdpi_3 * l_2
+        + 12 * p * kdpi_2 * kdpl * l_2
+        + 3 * i * kdpi_2 * kdpl * l_2
+        + 3 * kdpi_3 * kdpl * l_2
+        - 3 * p * kdpi * kdpl_2 * l_2
+        - 12 * i * kdpi * kdpl_2 * l_2
+        + 3 * kdpi_2 * kdpl_2 * l_2
+        - 3 * p * kdpl_3 * l_2
+        + 3 * i * kdpl_3 * l_2
+        - 12 * kdpi * kdpl_3 * l_2
+        + 6 * kdpl_4 * l_2
+        + 2 * kdpi_3 * l_3
+        - 3 * kdpi_2 * kdpl * l_3
+        - 3 * kdpi * kdpl_2 * l_3
+        + 2 * kdpl_3 * l_3
+    )
+    cube_root_term = ctx.power(neg_delta_1 + ctx.sqrt(ctx.power(neg_delta_1, 2) + 4 * ctx.power(neg_delta_0, 3)), one_third)
     if kdpl < kdpi:
         return (
-            -(
-                p * kdpi
-                - p * kdpl
-                + i * kdpl
-                + kdpi * kdpl
-                - power(kdpl, 2)
-                + 2 * kdpi * l
-                - kdpl * l
-            )
-            / (3.0 * (-kdpi + kdpl))
-            - (
-                power(2, 0.3333333333333333)
-                * (
-                    -power(
-                        p * kdpi
-                        - p * kdpl
-                        + i * kdpl
-                        + kdpi * kdpl
-                        - power(kdpl, 2)
-                        + 2 * kdpi * l
-                        - kdpl * l,
-                        2,
-                    )
-                    + 3
-                    * (-kdpi + kdpl)
-                    * (
-                        -2 * p * kdpi * l
-                        + p * kdpl * l
-                        - i * kdpl * l
-                        - kdpi * kdpl * l
-                        - kdpi * power(l, 2)
-                    )
-                )
-            )
-            / (
-                3.0
-                * (-kdpi + kdpl)
-                * power(
-                    -2 * power(p, 3) * power(kdpi, 3)
-                    + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                    - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                    + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                    - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                    + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                    - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                    - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                    + 2 * power(p, 3) * power(kdpl, 3)
-                    - 6 * power(p, 2) * i * power(kdpl, 3)
-                    + 6 * p * power(i, 2) * power(kdpl, 3)
-                    - 2 * power(i, 3) * power(kdpl, 3)
-                    - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                    + 24 * p * i * kdpi * power(kdpl, 3)
-                    - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                    + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                    - 2 * power(kdpi, 3) * power(kdpl, 3)
-                    + 6 * power(p, 2) * power(kdpl, 4)
-                    - 12 * p * i * power(kdpl, 4)
-                    + 6 * power(i, 2) * power(kdpl, 4)
-                    - 18 * p * kdpi * power(kdpl, 4)
-                    + 12 * i * kdpi * power(kdpl, 4)
-                    + 6 * power(kdpi, 2) * power(kdpl, 4)
-                    + 6 * p * power(kdpl, 5)
-                    - 6 * i * power(kdpl, 5)
-                    - 6 * kdpi * power(kdpl, 5)
-                    + 2 * power(kdpl, 6)
-                    + 6 * power(p, 2) * power(kdpi, 3) * l
-                    - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                    + 3 * p * i * power(kdpi, 2) * kdpl * l
-                    + 3 * p * power(kdpi, 3) * kdpl * l
-                    + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                    - 9 * p * i * kdpi * power(kdpl, 2) * l
-                    - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                    - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                    - 3 * power(p, 2) * power(kdpl, 3) * l
-                    + 6 * p * i * power(kdpl, 3) * l
-                    - 3 * power(i, 2) * power(kdpl, 3) * l
-                    - 3 * p * kdpi * power(kdpl, 3) * l
-                    + 9 * i * kdpi * power(kdpl, 3) * l
-                    + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                    + 3 * p * power(kdpl, 4) * l
-                    - 3 * i * power(kdpl, 4) * l
-                    - 15 * kdpi * power(kdpl, 4) * l
-                    + 6 * power(kdpl, 5) * l
-                    - 6 * p * power(kdpi, 3) * power(l, 2)
-                    + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                    - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                    - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                    + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                    - 3 * p * power(kdpl, 3) * power(l, 2)
-                    + 3 * i * power(kdpl, 3) * power(l, 2)
-                    - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                    + 6 * power(kdpl, 4) * power(l, 2)
-                    + 2 * power(kdpi, 3) * power(l, 3)
-                    - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                    - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                    + 2 * power(kdpl, 3) * power(l, 3)
-                    + sqrt(
-                        power(
-                            -2 * power(p, 3) * power(kdpi, 3)
-                            + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                            - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                            + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                            - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                            + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                            - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                            - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                            + 2 * power(p, 3) * power(kdpl, 3)
-                            - 6 * power(p, 2) * i * power(kdpl, 3)
-                            + 6 * p * power(i, 2) * power(kdpl, 3)
-                            - 2 * power(i, 3) * power(kdpl, 3)
-                            - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                            + 24 * p * i * kdpi * power(kdpl, 3)
-                            - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                            + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                            - 2 * power(kdpi, 3) * power(kdpl, 3)
-                            + 6 * power(p, 2) * power(kdpl, 4)
-                            - 12 * p * i * power(kdpl, 4)
-                            + 6 * power(i, 2) * power(kdpl, 4)
-                            - 18 * p * kdpi * power(kdpl, 4)
-                            + 12 * i * kdpi * power(kdpl, 4)
-                            + 6 * power(kdpi, 2) * power(kdpl, 4)
-                            + 6 * p * power(kdpl, 5)
-                            - 6 * i * power(kdpl, 5)
-                            - 6 * kdpi * power(kdpl, 5)
-                            + 2 * power(kdpl, 6)
-                            + 6 * power(p, 2) * power(kdpi, 3) * l
-                            - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                            + 3 * p * i * power(kdpi, 2) * kdpl * l
-                            + 3 * p * power(kdpi, 3) * kdpl * l
-                            + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                            - 9 * p * i * kdpi * power(kdpl, 2) * l
-                            - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                            - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                            - 3 * power(p, 2) * power(kdpl, 3) * l
-                            + 6 * p * i * power(kdpl, 3) * l
-                            - 3 * power(i, 2) * power(kdpl, 3) * l
-                            - 3 * p * kdpi * power(kdpl, 3) * l
-                            + 9 * i * kdpi * power(kdpl, 3) * l
-                            + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                            + 3 * p * power(kdpl, 4) * l
-                            - 3 * i * power(kdpl, 4) * l
-                            - 15 * kdpi * power(kdpl, 4) * l
-                            + 6 * power(kdpl, 5) * l
-                            - 6 * p * power(kdpi, 3) * power(l, 2)
-                            + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                            - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                            - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                            + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                            - 3 * p * power(kdpl, 3) * power(l, 2)
-                            + 3 * i * power(kdpl, 3) * power(l, 2)
-                            - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                            + 6 * power(kdpl, 4) * power(l, 2)
-                            + 2 * power(kdpi, 3) * power(l, 3)
-                            - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                            - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                            + 2 * power(kdpl, 3) * power(l, 3),
-                            2,
-                        )
-                        + 4
-                        * power(
-                            -power(
-                                p * kdpi
-                                - p * kdpl
-                                + i * kdpl
-                                + kdpi * kdpl
-                                - power(kdpl, 2)
-                                + 2 * kdpi * l
-                                - kdpl * l,
-                                2,
-                            )
-                            + 3
-                            * (-kdpi + kdpl)
-                            * (
-                                -2 * p * kdpi * l
-                                + p * kdpl * l
-                                - i * kdpl * l
-                                - kdpi * kdpl * l
-                                - kdpi * power(l, 2)
-                            ),
-                            3,
-                        )
-                    ),
-                    0.3333333333333333,
-                )
-            )
-            + power(
-                -2 * power(p, 3) * power(kdpi, 3)
-                + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                + 2 * power(p, 3) * power(kdpl, 3)
-                - 6 * power(p, 2) * i * power(kdpl, 3)
-                + 6 * p * power(i, 2) * power(kdpl, 3)
-                - 2 * power(i, 3) * power(kdpl, 3)
-                - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                + 24 * p * i * kdpi * power(kdpl, 3)
-                - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                - 2 * power(kdpi, 3) * power(kdpl, 3)
-                + 6 * power(p, 2) * power(kdpl, 4)
-                - 12 * p * i * power(kdpl, 4)
-                + 6 * power(i, 2) * power(kdpl, 4)
-                - 18 * p * kdpi * power(kdpl, 4)
-                + 12 * i * kdpi * power(kdpl, 4)
-                + 6 * power(kdpi, 2) * power(kdpl, 4)
-                + 6 * p * power(kdpl, 5)
-                - 6 * i * power(kdpl, 5)
-                - 6 * kdpi * power(kdpl, 5)
-                + 2 * power(kdpl, 6)
-                + 6 * power(p, 2) * power(kdpi, 3) * l
-                - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                + 3 * p * i * power(kdpi, 2) * kdpl * l
-                + 3 * p * power(kdpi, 3) * kdpl * l
-                + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                - 9 * p * i * kdpi * power(kdpl, 2) * l
-                - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                - 3 * power(p, 2) * power(kdpl, 3) * l
-                + 6 * p * i * power(kdpl, 3) * l
-                - 3 * power(i, 2) * power(kdpl, 3) * l
-                - 3 * p * kdpi * power(kdpl, 3) * l
-                + 9 * i * kdpi * power(kdpl, 3) * l
-                + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                + 3 * p * power(kdpl, 4) * l
-                - 3 * i * power(kdpl, 4) * l
-                - 15 * kdpi * power(kdpl, 4) * l
-                + 6 * power(kdpl, 5) * l
-                - 6 * p * power(kdpi, 3) * power(l, 2)
-                + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                - 3 * p * power(kdpl, 3) * power(l, 2)
-                + 3 * i * power(kdpl, 3) * power(l, 2)
-                - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                + 6 * power(kdpl, 4) * power(l, 2)
-                + 2 * power(kdpi, 3) * power(l, 3)
-                - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                + 2 * power(kdpl, 3) * power(l, 3)
-                + sqrt(
-                    power(
-                        -2 * power(p, 3) * power(kdpi, 3)
-                        + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                        - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                        - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                        - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                        + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                        - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                        + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                        - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                        - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                        + 2 * power(p, 3) * power(kdpl, 3)
-                        - 6 * power(p, 2) * i * power(kdpl, 3)
-                        + 6 * p * power(i, 2) * power(kdpl, 3)
-                        - 2 * power(i, 3) * power(kdpl, 3)
-                        - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                        + 24 * p * i * kdpi * power(kdpl, 3)
-                        - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                        + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                        - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                        - 2 * power(kdpi, 3) * power(kdpl, 3)
-                        + 6 * power(p, 2) * power(kdpl, 4)
-                        - 12 * p * i * power(kdpl, 4)
-                        + 6 * power(i, 2) * power(kdpl, 4)
-                        - 18 * p * kdpi * power(kdpl, 4)
-                        + 12 * i * kdpi * power(kdpl, 4)
-                        + 6 * power(kdpi, 2) * power(kdpl, 4)
-                        + 6 * p * power(kdpl, 5)
-                        - 6 * i * power(kdpl, 5)
-                        - 6 * kdpi * power(kdpl, 5)
-                        + 2 * power(kdpl, 6)
-                        + 6 * power(p, 2) * power(kdpi, 3) * l
-                        - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                        + 3 * p * i * power(kdpi, 2) * kdpl * l
-                        + 3 * p * power(kdpi, 3) * kdpl * l
-                        + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                        - 9 * p * i * kdpi * power(kdpl, 2) * l
-                        - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                        - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                        - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                        - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                        - 3 * power(p, 2) * power(kdpl, 3) * l
-                        + 6 * p * i * power(kdpl, 3) * l
-                        - 3 * power(i, 2) * power(kdpl, 3) * l
-                        - 3 * p * kdpi * power(kdpl, 3) * l
-                        + 9 * i * kdpi * power(kdpl, 3) * l
-                        + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                        + 3 * p * power(kdpl, 4) * l
-                        - 3 * i * power(kdpl, 4) * l
-                        - 15 * kdpi * power(kdpl, 4) * l
-                        + 6 * power(kdpl, 5) * l
-                        - 6 * p * power(kdpi, 3) * power(l, 2)
-                        + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                        + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                        + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                        - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                        - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                        + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                        - 3 * p * power(kdpl, 3) * power(l, 2)
-                        + 3 * i * power(kdpl, 3) * power(l, 2)
-                        - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                        + 6 * power(kdpl, 4) * power(l, 2)
-                        + 2 * power(kdpi, 3) * power(l, 3)
-                        - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                        - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                        + 2 * power(kdpl, 3) * power(l, 3),
-                        2,
-                    )
-                    + 4
-                    * power(
-                        -power(
-                            p * kdpi
-                            - p * kdpl
-                            + i * kdpl
-                            + kdpi * kdpl
-                            - power(kdpl, 2)
-                            + 2 * kdpi * l
-                            - kdpl * l,
-                            2,
-                        )
-                        + 3
-                        * (-kdpi + kdpl)
-                        * (
-                            -2 * p * kdpi * l
-                            + p * kdpl * l
-                            - i * kdpl * l
-                            - kdpi * kdpl * l
-                            - kdpi * power(l, 2)
-                        ),
-                        3,
-                    )
-                ),
-                0.3333333333333333,
-            )
-            / (3.0 * power(2, 0.3333333333333333) * (-kdpi + kdpl))
+            -(b) / (3.0 * a)
+            - (cbrt_2 * (neg_delta_0)) / (3.0 * a * cube_root_term)
+            + cube_root_term / (3.0 * cbrt_2 * a)
         ).real
     else:
         return (
-            -(
-                p * kdpi
-                - p * kdpl
-                + i * kdpl
-                + kdpi * kdpl
-                - power(kdpl, 2)
-                + 2 * kdpi * l
-                - kdpl * l
-            )
-            / (3.0 * (-kdpi + kdpl))
-            + (
-                (1 - complex(0, 1) * sqrt(3))
-                * (
-                    -power(
-                        p * kdpi
-                        - p * kdpl
-                        + i * kdpl
-                        + kdpi * kdpl
-                        - power(kdpl, 2)
-                        + 2 * kdpi * l
-                        - kdpl * l,
-                        2,
-                    )
-                    + 3
-                    * (-kdpi + kdpl)
-                    * (
-                        -2 * p * kdpi * l
-                        + p * kdpl * l
-                        - i * kdpl * l
-                        - kdpi * kdpl * l
-                        - kdpi * power(l, 2)
-                    )
-                )
-            )
-            / (
-                3.0
-                * power(2, 0.6666666666666666)
-                * (-kdpi + kdpl)
-                * power(
-                    -2 * power(p, 3) * power(kdpi, 3)
-                    + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                    - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                    + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                    - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                    + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                    - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                    - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                    + 2 * power(p, 3) * power(kdpl, 3)
-                    - 6 * power(p, 2) * i * power(kdpl, 3)
-                    + 6 * p * power(i, 2) * power(kdpl, 3)
-                    - 2 * power(i, 3) * power(kdpl, 3)
-                    - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                    + 24 * p * i * kdpi * power(kdpl, 3)
-                    - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                    + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                    - 2 * power(kdpi, 3) * power(kdpl, 3)
-                    + 6 * power(p, 2) * power(kdpl, 4)
-                    - 12 * p * i * power(kdpl, 4)
-                    + 6 * power(i, 2) * power(kdpl, 4)
-                    - 18 * p * kdpi * power(kdpl, 4)
-                    + 12 * i * kdpi * power(kdpl, 4)
-                    + 6 * power(kdpi, 2) * power(kdpl, 4)
-                    + 6 * p * power(kdpl, 5)
-                    - 6 * i * power(kdpl, 5)
-                    - 6 * kdpi * power(kdpl, 5)
-                    + 2 * power(kdpl, 6)
-                    + 6 * power(p, 2) * power(kdpi, 3) * l
-                    - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                    + 3 * p * i * power(kdpi, 2) * kdpl * l
-                    + 3 * p * power(kdpi, 3) * kdpl * l
-                    + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                    - 9 * p * i * kdpi * power(kdpl, 2) * l
-                    - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                    - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                    - 3 * power(p, 2) * power(kdpl, 3) * l
-                    + 6 * p * i * power(kdpl, 3) * l
-                    - 3 * power(i, 2) * power(kdpl, 3) * l
-                    - 3 * p * kdpi * power(kdpl, 3) * l
-                    + 9 * i * kdpi * power(kdpl, 3) * l
-                    + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                    + 3 * p * power(kdpl, 4) * l
-                    - 3 * i * power(kdpl, 4) * l
-                    - 15 * kdpi * power(kdpl, 4) * l
-                    + 6 * power(kdpl, 5) * l
-                    - 6 * p * power(kdpi, 3) * power(l, 2)
-                    + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                    - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                    - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                    + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                    - 3 * p * power(kdpl, 3) * power(l, 2)
-                    + 3 * i * power(kdpl, 3) * power(l, 2)
-                    - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                    + 6 * power(kdpl, 4) * power(l, 2)
-                    + 2 * power(kdpi, 3) * power(l, 3)
-                    - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                    - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                    + 2 * power(kdpl, 3) * power(l, 3)
-                    + sqrt(
-                        power(
-                            -2 * power(p, 3) * power(kdpi, 3)
-                            + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                            - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                            + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                            - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                            + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                            - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                            - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                            + 2 * power(p, 3) * power(kdpl, 3)
-                            - 6 * power(p, 2) * i * power(kdpl, 3)
-                            + 6 * p * power(i, 2) * power(kdpl, 3)
-                            - 2 * power(i, 3) * power(kdpl, 3)
-                            - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                            + 24 * p * i * kdpi * power(kdpl, 3)
-                            - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                            + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                            - 2 * power(kdpi, 3) * power(kdpl, 3)
-                            + 6 * power(p, 2) * power(kdpl, 4)
-                            - 12 * p * i * power(kdpl, 4)
-                            + 6 * power(i, 2) * power(kdpl, 4)
-                            - 18 * p * kdpi * power(kdpl, 4)
-                            + 12 * i * kdpi * power(kdpl, 4)
-                            + 6 * power(kdpi, 2) * power(kdpl, 4)
-                            + 6 * p * power(kdpl, 5)
-                            - 6 * i * power(kdpl, 5)
-                            - 6 * kdpi * power(kdpl, 5)
-                            + 2 * power(kdpl, 6)
-                            + 6 * power(p, 2) * power(kdpi, 3) * l
-                            - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                            + 3 * p * i * power(kdpi, 2) * kdpl * l
-                            + 3 * p * power(kdpi, 3) * kdpl * l
-                            + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                            - 9 * p * i * kdpi * power(kdpl, 2) * l
-                            - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                            - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                            - 3 * power(p, 2) * power(kdpl, 3) * l
-                            + 6 * p * i * power(kdpl, 3) * l
-                            - 3 * power(i, 2) * power(kdpl, 3) * l
-                            - 3 * p * kdpi * power(kdpl, 3) * l
-                            + 9 * i * kdpi * power(kdpl, 3) * l
-                            + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                            + 3 * p * power(kdpl, 4) * l
-                            - 3 * i * power(kdpl, 4) * l
-                            - 15 * kdpi * power(kdpl, 4) * l
-                            + 6 * power(kdpl, 5) * l
-                            - 6 * p * power(kdpi, 3) * power(l, 2)
-                            + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                            - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                            - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                            + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                            - 3 * p * power(kdpl, 3) * power(l, 2)
-                            + 3 * i * power(kdpl, 3) * power(l, 2)
-                            - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                            + 6 * power(kdpl, 4) * power(l, 2)
-                            + 2 * power(kdpi, 3) * power(l, 3)
-                            - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                            - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                            + 2 * power(kdpl, 3) * power(l, 3),
-                            2,
-                        )
-                        + 4
-                        * power(
-                            -power(
-                                p * kdpi
-                                - p * kdpl
-                                + i * kdpl
-                                + kdpi * kdpl
-                                - power(kdpl, 2)
-                                + 2 * kdpi * l
-                                - kdpl * l,
-                                2,
-                            )
-                            + 3
-                            * (-kdpi + kdpl)
-                            * (
-                                -2 * p * kdpi * l
-                                + p * kdpl * l
-                                - i * kdpl * l
-                                - kdpi * kdpl * l
-                                - kdpi * power(l, 2)
-                            ),
-                            3,
-                        )
-                    ),
-                    0.3333333333333333,
-                )
-            )
-            - (
-                (1 + complex(0, 1) * sqrt(3))
-                * power(
-                    -2 * power(p, 3) * power(kdpi, 3)
-                    + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                    - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                    - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                    + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                    - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                    + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                    - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                    - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                    + 2 * power(p, 3) * power(kdpl, 3)
-                    - 6 * power(p, 2) * i * power(kdpl, 3)
-                    + 6 * p * power(i, 2) * power(kdpl, 3)
-                    - 2 * power(i, 3) * power(kdpl, 3)
-                    - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                    + 24 * p * i * kdpi * power(kdpl, 3)
-                    - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                    + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                    - 2 * power(kdpi, 3) * power(kdpl, 3)
-                    + 6 * power(p, 2) * power(kdpl, 4)
-                    - 12 * p * i * power(kdpl, 4)
-                    + 6 * power(i, 2) * power(kdpl, 4)
-                    - 18 * p * kdpi * power(kdpl, 4)
-                    + 12 * i * kdpi * power(kdpl, 4)
-                    + 6 * power(kdpi, 2) * power(kdpl, 4)
-                    + 6 * p * power(kdpl, 5)
-                    - 6 * i * power(kdpl, 5)
-                    - 6 * kdpi * power(kdpl, 5)
-                    + 2 * power(kdpl, 6)
-                    + 6 * power(p, 2) * power(kdpi, 3) * l
-                    - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                    + 3 * p * i * power(kdpi, 2) * kdpl * l
-                    + 3 * p * power(kdpi, 3) * kdpl * l
-                    + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                    - 9 * p * i * kdpi * power(kdpl, 2) * l
-                    - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                    - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                    - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                    - 3 * power(p, 2) * power(kdpl, 3) * l
-                    + 6 * p * i * power(kdpl, 3) * l
-                    - 3 * power(i, 2) * power(kdpl, 3) * l
-                    - 3 * p * kdpi * power(kdpl, 3) * l
-                    + 9 * i * kdpi * power(kdpl, 3) * l
-                    + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                    + 3 * p * power(kdpl, 4) * l
-                    - 3 * i * power(kdpl, 4) * l
-                    - 15 * kdpi * power(kdpl, 4) * l
-                    + 6 * power(kdpl, 5) * l
-                    - 6 * p * power(kdpi, 3) * power(l, 2)
-                    + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                    + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                    - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                    - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                    + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                    - 3 * p * power(kdpl, 3) * power(l, 2)
-                    + 3 * i * power(kdpl, 3) * power(l, 2)
-                    - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                    + 6 * power(kdpl, 4) * power(l, 2)
-                    + 2 * power(kdpi, 3) * power(l, 3)
-                    - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                    - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                    + 2 * power(kdpl, 3) * power(l, 3)
-                    + sqrt(
-                        power(
-                            -2 * power(p, 3) * power(kdpi, 3)
-                            + 6 * power(p, 3) * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * i * power(kdpi, 2) * kdpl
-                            - 6 * power(p, 2) * power(kdpi, 3) * kdpl
-                            - 6 * power(p, 3) * kdpi * power(kdpl, 2)
-                            + 12 * power(p, 2) * i * kdpi * power(kdpl, 2)
-                            - 6 * p * power(i, 2) * kdpi * power(kdpl, 2)
-                            + 18 * power(p, 2) * power(kdpi, 2) * power(kdpl, 2)
-                            - 12 * p * i * power(kdpi, 2) * power(kdpl, 2)
-                            - 6 * p * power(kdpi, 3) * power(kdpl, 2)
-                            + 2 * power(p, 3) * power(kdpl, 3)
-                            - 6 * power(p, 2) * i * power(kdpl, 3)
-                            + 6 * p * power(i, 2) * power(kdpl, 3)
-                            - 2 * power(i, 3) * power(kdpl, 3)
-                            - 18 * power(p, 2) * kdpi * power(kdpl, 3)
-                            + 24 * p * i * kdpi * power(kdpl, 3)
-                            - 6 * power(i, 2) * kdpi * power(kdpl, 3)
-                            + 18 * p * power(kdpi, 2) * power(kdpl, 3)
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 3)
-                            - 2 * power(kdpi, 3) * power(kdpl, 3)
-                            + 6 * power(p, 2) * power(kdpl, 4)
-                            - 12 * p * i * power(kdpl, 4)
-                            + 6 * power(i, 2) * power(kdpl, 4)
-                            - 18 * p * kdpi * power(kdpl, 4)
-                            + 12 * i * kdpi * power(kdpl, 4)
-                            + 6 * power(kdpi, 2) * power(kdpl, 4)
-                            + 6 * p * power(kdpl, 5)
-                            - 6 * i * power(kdpl, 5)
-                            - 6 * kdpi * power(kdpl, 5)
-                            + 2 * power(kdpl, 6)
-                            + 6 * power(p, 2) * power(kdpi, 3) * l
-                            - 15 * power(p, 2) * power(kdpi, 2) * kdpl * l
-                            + 3 * p * i * power(kdpi, 2) * kdpl * l
-                            + 3 * p * power(kdpi, 3) * kdpl * l
-                            + 12 * power(p, 2) * kdpi * power(kdpl, 2) * l
-                            - 9 * p * i * kdpi * power(kdpl, 2) * l
-                            - 3 * power(i, 2) * kdpi * power(kdpl, 2) * l
-                            - 3 * p * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 6 * i * power(kdpi, 2) * power(kdpl, 2) * l
-                            - 3 * power(kdpi, 3) * power(kdpl, 2) * l
-                            - 3 * power(p, 2) * power(kdpl, 3) * l
-                            + 6 * p * i * power(kdpl, 3) * l
-                            - 3 * power(i, 2) * power(kdpl, 3) * l
-                            - 3 * p * kdpi * power(kdpl, 3) * l
-                            + 9 * i * kdpi * power(kdpl, 3) * l
-                            + 12 * power(kdpi, 2) * power(kdpl, 3) * l
-                            + 3 * p * power(kdpl, 4) * l
-                            - 3 * i * power(kdpl, 4) * l
-                            - 15 * kdpi * power(kdpl, 4) * l
-                            + 6 * power(kdpl, 5) * l
-                            - 6 * p * power(kdpi, 3) * power(l, 2)
-                            + 12 * p * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * i * power(kdpi, 2) * kdpl * power(l, 2)
-                            + 3 * power(kdpi, 3) * kdpl * power(l, 2)
-                            - 3 * p * kdpi * power(kdpl, 2) * power(l, 2)
-                            - 12 * i * kdpi * power(kdpl, 2) * power(l, 2)
-                            + 3 * power(kdpi, 2) * power(kdpl, 2) * power(l, 2)
-                            - 3 * p * power(kdpl, 3) * power(l, 2)
-                            + 3 * i * power(kdpl, 3) * power(l, 2)
-                            - 12 * kdpi * power(kdpl, 3) * power(l, 2)
-                            + 6 * power(kdpl, 4) * power(l, 2)
-                            + 2 * power(kdpi, 3) * power(l, 3)
-                            - 3 * power(kdpi, 2) * kdpl * power(l, 3)
-                            - 3 * kdpi * power(kdpl, 2) * power(l, 3)
-                            + 2 * power(kdpl, 3) * power(l, 3),
-                            2,
-                        )
-                        + 4
-                        * power(
-                            -power(
-                                p * kdpi
-                                - p * kdpl
-                                + i * kdpl
-                                + kdpi * kdpl
-                                - power(kdpl, 2)
-                                + 2 * kdpi * l
-                                - kdpl * l,
-                                2,
-                            )
-                            + 3
-                            * (-kdpi + kdpl)
-                            * (
-                                -2 * p * kdpi * l
-                                + p * kdpl * l
-                                - i * kdpl * l
-                                - kdpi * kdpl * l
-                                - kdpi * power(l, 2)
-                            ),
-                            3,
-                        )
-                    ),
-                    0.3333333333333333,
-                )
-            )
-            / (6.0 * power(2, 0.3333333333333333) * (-kdpi + kdpl))
-        ).real
\ No newline at end of file
+            -(b) / (3.0 * a)
+            + (one_minus_i_sqrt_3 * (neg_delta_0)) / (3.0 * cbrt_4 * a * cube_root_term)
+            - (one_plus_i_sqrt_3 * cube_root_term) / (6.0 * cbrt_2 * a)
+        ).real
@@ -0,0 +1,145 @@
+"""
+Generate lookup tables of optimal ligand affinity
+
+A lookup table holds the optimal ligand pKD, found by
+optimal_ligand_affinity.find_optimal_kdpl, for every combination of target
+fraction ligand bound (TFLB), ligand concentration p[L0] and inhibitor
+concentration p[I0].  Cells are solved in chunks across worker processes,
+and completed cells are checkpointed so an interrupted run resumes where it
+stopped.  The table is written as a single .npz file with its axes, and can
+be exported to the one CSV per TFLB layout of the original lookup table
+script.
+"""
+
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+from pathlib import Path
+import tempfile
+from typing import NamedTuple, Optional, Sequence, Union
+import numpy as np
+from .optimal_ligand_affinity import find_optimal_kdpl
+
+DEFAULT_CELLS_PER_TASK = 64
+
+
+class LookupTable(NamedTuple):
+    """Optimal ligand pKD, indexed [TFLB, p[I0], p[L0]]"""
+
+    tflb: np.ndarray
+    pi0: np.ndarray
+    pl0: np.ndarray
+    kdpi: float
+    pkdpl: np.ndarray
+
+
+def _savez_atomic(path: Path, **arrays):
+    """Write an .npz file to a temporary file and rename it into place"""
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def _save(path: Path, table: LookupTable):
+    _savez_atomic(path, **table._asdict())
+
+
+def load_lookup_table(path: Union[str, Path]) -> LookupTable:
+    """Read a lookup table written by generate_lookup_table"""
+    with np.load(path) as data:
+        return LookupTable(data["tflb"], data["pi0"], data["pl0"], float(data["kdpi"]), data["pkdpl"])
+
+
+def _solve_cells(tflb, pl0, pi0, kdpi, pkd_begin, pkd_end, xtol):
+    """Optimal ligand pKD for each cell given by matching entries of tflb, pl0 and pi0"""
+    optimal_kdpl, _ = find_optimal_kdpl(tflb, 10**-pl0, 10**-pi0, kdpi, pkd_begin=pkd_begin, pkd_end=pkd_end, xtol=xtol)
+    return -np.log10(optimal_kdpl)
+
+
+def generate_lookup_table(
+    path: Union[str, Path],
+    tflb: Sequence[float],
+    pl0: Sequence[float],
+    pi0: Sequence[float],
+    kdpi: float = 1e-6,
+    pkd_begin: float = 3,
+    pkd_end: float = 12,
+    xtol: float = 1e-6,
+    max_workers: Optional[int] = None,
+    cells_per_task: int = DEFAULT_CELLS_PER_TASK,
+) -> LookupTable:
+    """Generate a lookup table of optimal ligand pKD, resuming from a checkpoint
+
+    Pending cells are split into tasks of cells_per_task and solved in a
+    ProcessPoolExecutor.  After each task completes, the partly filled table
+    is written atomically to path with ".checkpoint" appended.  If that
+    checkpoint exists for the same axes and kdpi, only the cells it has not
+    completed are solved.  Once every cell is complete the table is written
+    to path and the checkpoint removed.  Scripts calling this on platforms
+    which spawn workers must guard their entry point with
+    if __name__ == "__main__".
+
+    Args:
+        path (Union[str, Path]): Output .npz file
+        tflb (Sequence[float]): Target fractions ligand bound without inhibitor
+        pl0 (Sequence[float]): Ligand concentrations, as -log10 molar
+        pi0 (Sequence[float]): Inhibitor concentrations, as -log10 molar
+        kdpi (float, optional): KD of the protein-inhibitor interaction.
+            Defaults to 1e-6.
+        pkd_begin (float, optional): Lowest ligand pKD searched. Defaults to 3.
+        pkd_end (float, optional): Highest ligand pKD searched. Defaults to 12.
+        xtol (float, optional): Tolerance in ligand pKD. Defaults to 1e-6.
+        max_workers (int, optional): Number of worker processes. Defaults to
+            None, using one per CPU.
+        cells_per_task (int, optional): Cells solved per task. Defaults to
+            DEFAULT_CELLS_PER_TASK.
+
+    Returns:
+        LookupTable: The completed table
+    """
+    path = Path(path)
+    checkpoint_path = path.with_name(path.name + ".checkpoint")
+    tflb, pi0, pl0 = (np.asarray(axis, dtype=np.float64) for axis in (tflb, pi0, pl0))
+    table = LookupTable(tflb, pi0, pl0, float(kdpi), np.full((tflb.shape[0], pi0.shape[0], pl0.shape[0]), np.nan))
+    if checkpoint_path.exists():
+        checkpoint = load_lookup_table(checkpoint_path)
+        if (
+            checkpoint.kdpi == table.kdpi
+            and all(np.array_equal(a, b) for a, b in zip(checkpoint[:3], table[:3]))
+            and checkpoint.pkdpl.shape == table.pkdpl.shape
+        ):
+            table = checkpoint
+
+    cell_tflb, cell_pi0, cell_pl0 = (axis.reshape(-1) for axis in np.meshgrid(tflb, pi0, pl0, indexing="ij"))
+    pending = np.flatnonzero(np.isnan(table.pkdpl.reshape(-1)))
+    tasks = [pending[begin : begin + cells_per_task] for begin in range(0, pending.shape[0], cells_per_task)]
+    if tasks:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _solve_cells, cell_tflb[task], cell_pl0[task], cell_pi0[task], kdpi, pkd_begin, pkd_end, xtol
+                ): task
+                for task in tasks
+            }
+            for future in as_completed(futures):
+                table.pkdpl.reshape(-1)[futures[future]] = future.result()
+                _save(checkpoint_path, table)
+
+    _save(path, table)
+    if checkpoint_path.exists():
+        os.remove(checkpoint_path)
+    return table
+
+
+def export_lookup_table_csv(table: LookupTable, directory: Union[str, Path] = ".", prefix: str = "lookup_table"):
+    """Write one CSV per TFLB, rows p[I0] and columns p[L0], as lookup_table{TFLB}.csv"""
+    import pandas as pd
+
+    for tflb, pkdpl in zip(table.tflb, table.pkdpl):
+        frame = pd.DataFrame(pkdpl, index=table.pi0, columns=table.pl0)
+        frame.to_csv(Path(directory) / f"{prefix}{tflb}.csv")
@@ -0,0 +1,151 @@
+"""
+Opt-in memoization of competition evaluations
+
+A CompetitionCache sits in front of the high accuracy functions and the
+float64 and adaptive precision batch solvers.  Results are keyed on the
+exact float inputs and the precision used, held in a least recently used
+cache bounded both in entries and in the bytes of cached arrays, and counted
+as hits or misses.  Nothing is cached unless a CompetitionCache is created
+and called, or passed to CompetitionLabelAffinity.
+"""
+
+
+from collections import OrderedDict, namedtuple
+import hashlib
+from typing import Optional
+import numpy as np
+from . import fast_binding_equations, high_accuracy_binding_equations
+from .adaptive_precision import DEFAULT_DPS_TIERS, competition_pl_adaptive
+
+DEFAULT_MAXSIZE = 100_000
+DEFAULT_MAX_ARRAY_BYTES = 256 * 1024**2
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _resolve_dps(dps: Optional[int]) -> int:
+    """Decimal places a high accuracy call with this dps argument would use"""
+    return high_accuracy_binding_equations._get_context(dps).dps
+
+
+def _result_nbytes(result) -> int:
+    """Bytes held by the arrays in a result, scalar results counting as none"""
+    results = result if isinstance(result, tuple) else (result,)
+    return sum(item.nbytes for item in results if isinstance(item, np.ndarray))
+
+
+def _array_key(*args):
+    """Key identifying the exact contents and shape of broadcast float64 arrays"""
+    arrays = fast_binding_equations._as_float_arrays(*args)
+    digest = hashlib.sha256()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return arrays[0].shape, digest.hexdigest()
+
+
+class CompetitionCache:
+    """Bounded LRU cache of competition evaluations
+
+    A single competition_pl_polished entry holds whole result arrays, so
+    entries are limited both in number and in the total bytes of their
+    arrays.  A result larger than max_array_bytes on its own is returned
+    without being cached.
+
+    Args:
+        maxsize (int, optional): Maximum number of results held, the least
+            recently used being evicted first. Defaults to DEFAULT_MAXSIZE.
+        max_array_bytes (int, optional): Maximum total bytes of cached
+            arrays. Defaults to DEFAULT_MAX_ARRAY_BYTES (256 MiB).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, max_array_bytes: int = DEFAULT_MAX_ARRAY_BYTES):
+        self.maxsize = maxsize
+        self.max_array_bytes = max_array_bytes
+        self._results = OrderedDict()
+        self._result_nbytes = {}
+        self.array_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, func, *args, **kwargs):
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key]
+        self.misses += 1
+        result = func(*args, **kwargs)
+        nbytes = _result_nbytes(result)
+        if nbytes > self.max_array_bytes:
+            return result
+        self._results[key] = result
+        self._result_nbytes[key] = nbytes
+        self.array_bytes += nbytes
+        while len(self._results) > self.maxsize or self.array_bytes > self.max_array_bytes:
+            evicted_key, _ = self._results.popitem(last=False)
+            self.array_bytes -= self._result_nbytes.pop(evicted_key)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Hits, misses, maximum size and current size of the cache"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def cache_clear(self):
+        """Remove all results and reset the hit and miss counts"""
+        self._results.clear()
+        self._result_nbytes.clear()
+        self.array_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def competition_pl(self, p, l, i, kdpl, kdpi, dps: Optional[int] = None):
+        """Memoized high_accuracy_binding_equations.competition_pl"""
+        dps = _resolve_dps(dps)
+        key = ("competition_pl", float(p), float(l), float(i), float(kdpl), float(kdpi), dps)
+        return self._lookup(key, high_accuracy_binding_equations.competition_pl, p, l, i, kdpl, kdpi, dps=dps)
+
+    def calc_kdpi_for_fractionl_bound(self, p, l, i, kdpl, targetflb, dps: Optional[int] = None):
+        """Memoized high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound"""
+        dps = _resolve_dps(dps)
+        key = ("calc_kdpi_for_fractionl_bound", float(p), float(l), float(i), float(kdpl), float(targetflb), dps)
+        return self._lookup(
+            key, high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound, p, l, i, kdpl, targetflb, dps=dps
+        )
+
+    def calc_i_for_fractionl_bound(self, p, l, kdpl, kdpi, targetflb, dps: Optional[int] = None):
+        """Memoized high_accuracy_binding_equations.calc_i_for_fractionl_bound"""
+        dps = _resolve_dps(dps)
+        key = ("calc_i_for_fractionl_bound", float(p), float(l), float(kdpl), float(kdpi), float(targetflb), dps)
+        return self._lookup(
+            key, high_accuracy_binding_equations.calc_i_for_fractionl_bound, p, l, kdpl, kdpi, targetflb, dps=dps
+        )
+
+    def competition_pl_polished(self, p, l, i, kdpl, kdpi):
+        """Memoized fast_binding_equations.competition_pl_polished
+
+        The whole call is one entry, keyed on a SHA-256 digest of the exact
+        float64 contents of the broadcast arguments.  Cached arrays are
+        returned read only so they can not be modified in place by callers.
+        """
+        key = ("competition_pl_polished",) + _array_key(p, l, i, kdpl, kdpi)
+
+        def polish():
+            results = fast_binding_equations.competition_pl_polished(p, l, i, kdpl, kdpi)
+            results = tuple(np.array(result) for result in results)
+            for result in results:
+                result.flags.writeable = False
+            return results
+
+        return self._lookup(key, polish)
+
+    def competition_pl_adaptive(self, p, l, i, kdpl, kdpi, rtol: float = 1e-10, dps_tiers=DEFAULT_DPS_TIERS):
+        """Memoized adaptive_precision.competition_pl_adaptive, cached as competition_pl_polished"""
+        key = ("competition_pl_adaptive", float(rtol), tuple(dps_tiers)) + _array_key(p, l, i, kdpl, kdpi)
+
+        def adaptive():
+            results = competition_pl_adaptive(p, l, i, kdpl, kdpi, rtol, dps_tiers)
+            results = tuple(np.array(result) for result in results)
+            for result in results:
+                result.flags.writeable = False
+            return results
+
+        return self._lookup(key, adaptive)
@@ -0,0 +1,204 @@
+"""
+Monte Carlo propagation of assay condition uncertainty to the readout
+
+Pipetting error in the protein, ligand and inhibitor concentrations and
+uncertainty in the KDs are described by distributions, sampled together in
+vectorised chunks and evaluated with
+fast_binding_equations.competition_pl_polished.  Fraction ligand bound and
+percent signal remaining are accumulated into fixed-bin histograms with
+running moments, merged chunk by chunk with Chan's pairwise update, so
+memory is bounded by the chunk size however many samples are drawn, and
+quantiles are read from the histograms.  Each parameter draws
+from its own stream spawned from the seed, so results depend only on the
+seed and number of samples, not on the chunk size.
+"""
+
+
+from typing import NamedTuple
+import numpy as np
+from .fast_binding_equations import _no_inhibitor_pl, competition_pl_polished
+
+DEFAULT_NUM_SAMPLES = 1_000_000
+DEFAULT_CHUNK_SIZE = 1 << 18
+DEFAULT_BINS = 10_000
+PARAMETERS = ("p", "l", "i", "kdpl", "kdpi")
+
+
+class Fixed(NamedTuple):
+    """A parameter known exactly, plain numbers are treated as Fixed"""
+
+    value: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return np.full(size, float(self.value))
+
+
+class LogNormal(NamedTuple):
+    """Log-normal parameter such as a KD, with its log10 normally distributed
+
+    A pKD of 5 +/- 0.5 is LogNormal(1e-5, 0.5).
+    """
+
+    median: float
+    sigma_log10: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return self.median * 10 ** (self.sigma_log10 * rng.standard_normal(size))
+
+
+class Normal(NamedTuple):
+    """Normally distributed concentration, with absolute standard deviation, truncated at zero"""
+
+    mean: float
+    sd: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return np.maximum(self.mean + self.sd * rng.standard_normal(size), 0)
+
+
+class RelativeNormal(NamedTuple):
+    """Normally distributed concentration, with standard deviation relative to the nominal, truncated at zero
+
+    A 5 % pipetting error on 10 nM ligand is RelativeNormal(10e-9, 0.05).
+    """
+
+    nominal: float
+    relative_sd: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        return np.maximum(self.nominal * (1 + self.relative_sd * rng.standard_normal(size)), 0)
+
+
+class Histogram(NamedTuple):
+    """Counts of samples in evenly spaced bins between edges[0] and edges[-1]"""
+
+    counts: np.ndarray
+    edges: np.ndarray
+
+    def quantile(self, q) -> np.ndarray:
+        """Quantiles, interpolated linearly within bins, so accurate to the bin width"""
+        cumulative = np.concatenate(([0], np.cumsum(self.counts))) / np.sum(self.counts)
+        return np.interp(q, cumulative, self.edges)
+
+
+class MonteCarloResult(NamedTuple):
+    """Distributions of fraction ligand bound and percent signal remaining over num_samples samples
+
+    Percent signal remaining is 100 * [PL] with inhibitor / [PL] without
+    inhibitor, so the percent signal reduction plotted by
+    CompetitionLabelAffinity.plot_ligand_kd_vs_FLB_as_percentage is 100 minus
+    it.  Samples giving a non-finite readout, for example with no ligand, are
+    counted in num_invalid and excluded from the histograms and moments.
+    """
+
+    num_samples: int
+    num_invalid: int
+    fraction_bound: Histogram
+    fraction_bound_mean: float
+    fraction_bound_std: float
+    percent_signal_remaining: Histogram
+    percent_signal_remaining_mean: float
+    percent_signal_remaining_std: float
+
+
+class _Accumulator:
+    """Fixed-bin histogram, mean and sum of squared deviations of values between low and high
+
+    Each chunk's mean and squared deviations are found in two passes, then
+    merged with Chan's pairwise update, avoiding the cancellation of
+    E[x^2] - mean^2 for tight distributions.
+    """
+
+    def __init__(self, low: float, high: float, bins: int):
+        self.low, self.high, self.bins = low, high, bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.squared_deviations = 0.0
+
+    def add(self, values: np.ndarray):
+        if values.shape[0] == 0:
+            return
+        scaled = (values - self.low) * (self.bins / (self.high - self.low))
+        bin_indices = np.clip(scaled.astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(bin_indices, minlength=self.bins)
+        chunk_count = values.shape[0]
+        chunk_mean = float(np.mean(values))
+        chunk_squared_deviations = float(np.sum((values - chunk_mean) ** 2))
+        count = self.count + chunk_count
+        delta = chunk_mean - self.mean
+        self.mean += delta * chunk_count / count
+        self.squared_deviations += chunk_squared_deviations + delta * delta * self.count * chunk_count / count
+        self.count = count
+
+    def result(self):
+        std = np.sqrt(self.squared_deviations / self.count) if self.count else 0.0
+        return Histogram(self.counts, np.linspace(self.low, self.high, self.bins + 1)), self.mean, std
+
+
+def _as_distribution(parameter):
+    return parameter if hasattr(parameter, "sample") else Fixed(parameter)
+
+
+def simulate_readout(
+    p,
+    l,
+    i,
+    kdpl,
+    kdpi,
+    num_samples: int = DEFAULT_NUM_SAMPLES,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    bins: int = DEFAULT_BINS,
+) -> MonteCarloResult:
+    """Sample assay conditions and accumulate the distribution of the readout
+
+    Each parameter is a number, or a distribution with a sample(rng, size)
+    method such as LogNormal, Normal or RelativeNormal.  Percent signal
+    remaining is 100 * [PL] with inhibitor / [PL] without inhibitor for the
+    same sampled protein, ligand and ligand KD, the signal relative to
+    control wells.
+    To model a design by target fraction ligand bound, set the nominal
+    protein concentration with fast_binding_equations.calc_amount_p and give
+    its pipetting error, for example
+    RelativeNormal(calc_amount_p(0.7, 10e-9, 1e-9), 0.05).
+
+    Args:
+        p: Protein concentration
+        l: Ligand concentration
+        i: Inhibitor concentration
+        kdpl: KD of the protein-ligand interaction
+        kdpi: KD of the protein-inhibitor interaction
+        num_samples (int, optional): Number of samples. Defaults to
+            DEFAULT_NUM_SAMPLES.
+        seed (int, optional): Seed for the random streams. Defaults to 0.
+        chunk_size (int, optional): Samples evaluated at a time. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        bins (int, optional): Histogram bins for fraction bound over [0, 1]
+            and percent signal remaining over [0, 100]. Defaults to
+            DEFAULT_BINS.
+
+    Returns:
+        MonteCarloResult: Histograms, means and standard deviations of
+            fraction ligand bound and percent signal remaining
+    """
+    distributions = [_as_distribution(parameter) for parameter in (p, l, i, kdpl, kdpi)]
+    rngs = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(len(PARAMETERS))]
+    fraction_bound = _Accumulator(0.0, 1.0, bins)
+    percent_signal_remaining = _Accumulator(0.0, 100.0, bins)
+    num_invalid = 0
+    for begin in range(0, num_samples, chunk_size):
+        size = min(chunk_size, num_samples - begin)
+        p_sample, l_sample, i_sample, kdpl_sample, kdpi_sample = (
+            distribution.sample(rng, size) for distribution, rng in zip(distributions, rngs)
+        )
+        pl = competition_pl_polished(p_sample, l_sample, i_sample, kdpl_sample, kdpi_sample)[0]
+        control_pl = _no_inhibitor_pl(p_sample, l_sample, kdpl_sample)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            flb = pl / l_sample
+            signal = 100 * pl / control_pl
+        valid = np.isfinite(flb) & np.isfinite(signal)
+        num_invalid += int(size - np.count_nonzero(valid))
+        fraction_bound.add(flb[valid])
+        percent_signal_remaining.add(signal[valid])
+    return MonteCarloResult(num_samples, num_invalid, *fraction_bound.result(), *percent_signal_remaining.result())
@@ -0,0 +1,88 @@
+"""
+Find the ligand affinity giving the most sensitive competition experiment
+
+For a target fraction ligand bound without inhibitor, protein is set with
+calc_amount_p for each ligand KD, and the fraction ligand bound in the
+presence of inhibitor has a minimum over ligand KD.  That minimum is the
+optimum label affinity described in "Identification of optimum ligand
+affinity for competition-based primary screens" by Shave et.al.
+"""
+
+
+import numpy as np
+from .fast_binding_equations import _as_float_arrays, calc_amount_p, competition_pl_polished
+
+_INVERSE_GOLDEN_RATIO = (np.sqrt(5.0) - 1) / 2
+
+
+def fraction_bound_at_pkdpl(pkdpl, tflb, l, i, kdpi):
+    """Fraction ligand bound at ligand pKD, with protein set to reach tflb without inhibitor"""
+    kdpl = 10 ** -np.asarray(pkdpl, dtype=np.float64)
+    p = calc_amount_p(tflb, l, kdpl)
+    return competition_pl_polished(p, l, i, kdpl, kdpi)[0] / l
+
+
+def find_optimal_kdpl(
+    tflb, l, i, kdpi, pkd_begin: float = 3, pkd_end: float = 12, num_bracket_points: int = 19, xtol: float = 1e-6
+):
+    """Find the ligand KD minimising fraction ligand bound in a competition experiment
+
+    Fraction ligand bound is first evaluated at num_bracket_points evenly
+    spaced ligand pKDs, and the lowest point with its neighbours brackets the
+    minimum.  Golden-section search then narrows every bracket together until
+    it is narrower than xtol in pKD, needing about 30 further evaluations for
+    the default tolerance.  Arguments are broadcast against each other, so
+    many (tflb, [L0], [I0], kdpi) combinations are solved at once.  Minima at
+    the ends of the pKD range are returned at the end.
+
+    Args:
+        tflb (array_like): Target fraction ligand bound without inhibitor
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpi (array_like): KD of the protein-inhibitor interaction
+        pkd_begin (float, optional): Lowest ligand pKD searched. Defaults to 3.
+        pkd_end (float, optional): Highest ligand pKD searched. Defaults to 12.
+        num_bracket_points (int, optional): Points in the initial bracketing
+            scan. Defaults to 19.
+        xtol (float, optional): Tolerance in ligand pKD. Defaults to 1e-6.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Optimal ligand KD and the fraction
+            ligand bound there, with the broadcast shape of the arguments
+    """
+    tflb, l, i, kdpi = _as_float_arrays(tflb, l, i, kdpi)
+    scan_shape = (num_bracket_points,) + (1,) * tflb.ndim
+    scan_pkds = np.linspace(pkd_begin, pkd_end, num_bracket_points).reshape(scan_shape)
+    scan_flb = fraction_bound_at_pkdpl(scan_pkds, tflb, l, i, kdpi)
+    lowest = np.argmin(scan_flb, axis=0)
+    spacing = (pkd_end - pkd_begin) / (num_bracket_points - 1)
+    lower = pkd_begin + np.maximum(lowest - 1, 0) * spacing
+    upper = pkd_begin + np.minimum(lowest + 1, num_bracket_points - 1) * spacing
+
+    inner_lower = upper - _INVERSE_GOLDEN_RATIO * (upper - lower)
+    inner_upper = lower + _INVERSE_GOLDEN_RATIO * (upper - lower)
+    flb_inner_lower = fraction_bound_at_pkdpl(inner_lower, tflb, l, i, kdpi)
+    flb_inner_upper = fraction_bound_at_pkdpl(inner_upper, tflb, l, i, kdpi)
+    while np.max(upper - lower) > xtol:
+        # Keep the side of the bracket holding the lower inner point, reusing it as an inner point
+        keep_lower = flb_inner_lower < flb_inner_upper
+        upper = np.where(keep_lower, inner_upper, upper)
+        lower = np.where(keep_lower, lower, inner_lower)
+        new_inner = np.where(
+            keep_lower,
+            upper - _INVERSE_GOLDEN_RATIO * (upper - lower),
+            lower + _INVERSE_GOLDEN_RATIO * (upper - lower),
+        )
+        flb_new_inner = fraction_bound_at_pkdpl(new_inner, tflb, l, i, kdpi)
+        inner_lower, inner_upper = (
+            np.where(keep_lower, new_inner, inner_upper),
+            np.where(keep_lower, inner_lower, new_inner),
+        )
+        flb_inner_lower, flb_inner_upper = (
+            np.where(keep_lower, flb_new_inner, flb_inner_upper),
+            np.where(keep_lower, flb_inner_lower, flb_new_inner),
+        )
+
+    optimal_pkd = np.where(flb_inner_lower < flb_inner_upper, inner_lower, inner_upper)
+    optimal_flb = np.minimum(flb_inner_lower, flb_inner_upper)
+    return (10**-optimal_pkd)[()], optimal_flb[()]
@@ -0,0 +1,86 @@
+"""
+Parallel sweeps of the high accuracy competition solution
+
+Every point of a high accuracy sweep is an independent competition_pl call,
+so the broadcast parameter grid is flattened, split into chunks and each
+chunk evaluated in a separate process.  Results are assembled back into the
+shape of the grid in order.
+"""
+
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from . import high_accuracy_binding_equations
+from .fast_binding_equations import _as_float_arrays
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _competition_pl_chunk(chunk: np.ndarray, dps: int) -> np.ndarray:
+    """Evaluate competition_pl for each row of p, l, i, kdpl and kdpi in chunk"""
+    return np.array(
+        [float(high_accuracy_binding_equations.competition_pl(*point, dps=dps)) for point in chunk.tolist()]
+    )
+
+
+def competition_pl_sweep(
+    p,
+    l,
+    i,
+    kdpl,
+    kdpi,
+    dps: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+):
+    """Calculate PL concentration over a parameter grid using a process pool
+
+    Arguments are broadcast against each other and every point is evaluated
+    with high_accuracy_binding_equations.competition_pl.  Points are sent to
+    worker processes in chunks of chunk_size, which should be large enough
+    that a chunk takes much longer to evaluate than to send.  As with any
+    ProcessPoolExecutor use, scripts calling this on platforms which spawn
+    workers must guard their entry point with if __name__ == "__main__".
+    Callers sweeping repeatedly can pass their own executor, which is reused
+    rather than starting a new pool for each call.
+
+    Args:
+        p (array_like): Protein concentration
+        l (array_like): Ligand concentration
+        i (array_like): Inhibitor concentration
+        kdpl (array_like): KD of the protein-ligand interaction
+        kdpi (array_like): KD of the protein-inhibitor interaction
+        dps (int, optional): Decimal places of precision. Defaults to None,
+            using the precision set by
+            high_accuracy_binding_equations.precision in the calling process,
+            or otherwise its default.
+        max_workers (int, optional): Number of worker processes. Defaults to
+            None, using one per CPU.
+        chunk_size (int, optional): Points evaluated per task. Defaults to
+            DEFAULT_CHUNK_SIZE.
+        executor (Executor, optional): Pool to evaluate chunks in, left open
+            on return. Defaults to None, starting a ProcessPoolExecutor with
+            max_workers for this call.
+
+    Returns:
+        np.ndarray: [PL], with the broadcast shape of the arguments
+    """
+    p, l, i, kdpl, kdpi = _as_float_arrays(p, l, i, kdpl, kdpi)
+    points = np.stack([arg.reshape(-1) for arg in (p, l, i, kdpl, kdpi)], axis=1)
+    chunks = [points[begin : begin + chunk_size] for begin in range(0, points.shape[0], chunk_size)]
+    # Workers started by spawn or forkserver do not inherit a precision() block, so resolve it here
+    dps = high_accuracy_binding_equations._get_context(dps).dps
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pl = _map_chunks(executor, chunks, dps)
+    else:
+        pl = _map_chunks(executor, chunks, dps)
+    return pl.reshape(p.shape)[()]
+
+
+def _map_chunks(executor: Executor, chunks, dps: int) -> np.ndarray:
+    """Evaluate chunks in executor and concatenate the results in order"""
+    results = list(executor.map(_competition_pl_chunk, chunks, [dps] * len(chunks)))
+    return np.concatenate(results) if results else np.empty(0)
@@ -0,0 +1,186 @@
+"""
+Simulate missed inhibitors across a screening library
+
+A library is a set of inhibitor KDs, read from a file or drawn from a
+distribution such as monte_carlo.LogNormal.  Each assay design, a choice of
+ligand, its concentration and KD, protein and inhibitor screening
+concentration, calls a compound a hit when it reduces the signal by at
+least a threshold percentage of the uninhibited signal.  Compounds with KD
+at or below an activity threshold are true actives, so each design's hits
+and misses give a confusion matrix.
+
+Signal falls monotonically as the inhibitor KD falls, so a design calls a
+hit exactly when the KD is at or below the KD giving the threshold signal,
+found once per design with fast_binding_equations.calc_kdpi_for_fractionl_bound.
+The library is then classified by comparing KDs in chunks, so 10^7
+compounds take well under a second per design and memory is bounded by the
+chunk size.
+"""
+
+
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from . import high_accuracy_binding_equations
+from .fast_binding_equations import _no_inhibitor_pl, calc_amount_p, calc_kdpi_for_fractionl_bound
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+class AssayDesign(NamedTuple):
+    """A competition assay design, with protein given directly as p or set to reach tflb without inhibitor"""
+
+    name: str
+    l: float
+    kdpl: float
+    i: float
+    p: Optional[float] = None
+    tflb: Optional[float] = None
+
+    def protein_conc(self) -> float:
+        if self.p is not None:
+            return float(self.p)
+        if self.tflb is None:
+            raise ValueError(f"Assay design {self.name} needs p or tflb")
+        return float(calc_amount_p(self.tflb, self.l, self.kdpl))
+
+    def kdpi_hit_cutoff(self, signal_reduction_threshold: float) -> float:
+        """Largest inhibitor KD reducing the signal by at least signal_reduction_threshold percent
+
+        0 if the threshold can not be reached at this inhibitor
+        concentration however potent the inhibitor, and infinite if no
+        reduction is required.  Ill-conditioned cutoffs are recomputed at
+        the precision set by high_accuracy_binding_equations.precision, or
+        its DEFAULT_DPS.
+        """
+        if signal_reduction_threshold <= 0:
+            return np.inf
+        p = self.protein_conc()
+        control_flb = _no_inhibitor_pl(p, self.l, self.kdpl) / self.l
+        target_flb = control_flb * (1 - signal_reduction_threshold / 100)
+        cutoff = calc_kdpi_for_fractionl_bound(
+            p, self.l, self.i, self.kdpl, target_flb, dps=high_accuracy_binding_equations._get_context().dps
+        )
+        return 0.0 if np.isnan(cutoff) else float(cutoff)
+
+
+class DesignConfusion(NamedTuple):
+    """Confusion counts of one design over a library, actives being compounds at or below the activity KD"""
+
+    design: AssayDesign
+    kdpi_cutoff: float
+    true_positives: int
+    false_negatives: int
+    false_positives: int
+    true_negatives: int
+
+    @property
+    def hits(self) -> int:
+        return self.true_positives + self.false_positives
+
+    @property
+    def missed(self) -> int:
+        """Active compounds not called as hits, the missed inhibitors"""
+        return self.false_negatives
+
+    @property
+    def sensitivity(self) -> float:
+        return self.true_positives / max(self.true_positives + self.false_negatives, 1)
+
+    @property
+    def specificity(self) -> float:
+        return self.true_negatives / max(self.true_negatives + self.false_positives, 1)
+
+    @property
+    def precision(self) -> float:
+        return self.true_positives / max(self.hits, 1)
+
+
+def load_library_kdpis(path: Union[str, Path], column: str = "kdpi") -> np.ndarray:
+    """Inhibitor KDs of a library from a .npy file, memory-mapped, or a column of a CSV file"""
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    import pandas as pd
+
+    return pd.read_csv(path, usecols=[column])[column].to_numpy(dtype=np.float64)
+
+
+def _library_chunks(library, num_compounds: Optional[int], seed: int, chunk_size: int) -> Iterator[np.ndarray]:
+    if hasattr(library, "sample"):
+        if num_compounds is None:
+            raise ValueError("num_compounds is needed to draw a library from a distribution")
+        rng = np.random.default_rng(seed)
+        for begin in range(0, num_compounds, chunk_size):
+            yield library.sample(rng, min(chunk_size, num_compounds - begin))
+    else:
+        library = np.asarray(library).reshape(-1)
+        for begin in range(0, library.shape[0], chunk_size):
+            yield np.asarray(library[begin : begin + chunk_size], dtype=np.float64)
+
+
+def simulate_screen(
+    designs: Sequence[AssayDesign],
+    library,
+    signal_reduction_threshold: float = 50.0,
+    active_kdpi: float = 1e-6,
+    num_compounds: Optional[int] = None,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[DesignConfusion]:
+    """Count hits and missed inhibitors of each design over a library
+
+    Args:
+        designs (Sequence[AssayDesign]): Assay designs to compare
+        library: Inhibitor KDs, as an array (memory-mapped arrays are read a
+            chunk at a time), or a distribution with a sample(rng, size)
+            method, such as monte_carlo.LogNormal, drawn num_compounds times
+        signal_reduction_threshold (float, optional): Percentage reduction
+            of the uninhibited signal calling a hit. Defaults to 50.
+        active_kdpi (float, optional): Inhibitor KD at or below which a
+            compound is a true active. Defaults to 1e-6, in the units of the
+            designs.
+        num_compounds (int, optional): Library size when drawing from a
+            distribution. Defaults to None.
+        seed (int, optional): Seed when drawing from a distribution.
+            Defaults to 0.
+        chunk_size (int, optional): Compounds classified at a time.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Returns:
+        List[DesignConfusion]: Confusion counts for each design, in order
+    """
+    cutoffs = np.array([design.kdpi_hit_cutoff(signal_reduction_threshold) for design in designs])
+    counts = np.zeros((len(designs), 4), dtype=np.int64)
+    for kdpi in _library_chunks(library, num_compounds, seed, chunk_size):
+        active = kdpi <= active_kdpi
+        num_active = int(np.count_nonzero(active))
+        for design_index, cutoff in enumerate(cutoffs):
+            hit = kdpi <= cutoff
+            true_positives = int(np.count_nonzero(hit & active))
+            hits = int(np.count_nonzero(hit))
+            counts[design_index] += (
+                true_positives,
+                num_active - true_positives,
+                hits - true_positives,
+                kdpi.shape[0] - num_active - hits + true_positives,
+            )
+    return [
+        DesignConfusion(design, float(cutoff), *(int(count) for count in design_counts))
+        for design, cutoff, design_counts in zip(designs, cutoffs, counts)
+    ]
+
+
+def format_confusion_table(results: Iterable[DesignConfusion]) -> str:
+    """Text table of hits, misses and rates for each design"""
+    lines = [
+        f"{'Design':<24}{'KDPI cutoff':>12}{'Hits':>10}{'TP':>10}{'Missed':>10}{'FP':>10}{'TN':>11}"
+        f"{'Sensitivity':>12}{'Precision':>10}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.design.name:<24}{result.kdpi_cutoff:>12.3e}{result.hits:>10}{result.true_positives:>10}"
+            f"{result.missed:>10}{result.false_positives:>10}{result.true_negatives:>11}"
+            f"{result.sensitivity:>12.4f}{result.precision:>10.4f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+"""
+Sweep parameter grids in bounded memory
+
+A sweep specification is a mapping of names to 1-D axes, whose outer
+product is the grid, and optional fixed parameters.  iter_sweep walks the
+grid in C order as rectangular blocks of at most chunk_size points,
+evaluating a vectorised function on each and yielding the block's index
+into the full grid with its results.  Only one block is held at a time, so
+consumers can reduce, write to disk or plot incrementally with memory
+independent of the size of the grid.  write_sweep streams a sweep into a
+memory-mapped .npy file.
+"""
+
+
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, Optional, Tuple, Union
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def sweep_shape(axes: Mapping) -> Tuple[int, ...]:
+    """Shape of the grid spanned by axes, in mapping order"""
+    return tuple(np.asarray(axis).shape[0] for axis in axes.values())
+
+
+def iter_sweep_blocks(shape: Tuple[int, ...], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[slice, ...]]:
+    """Index slices of rectangular blocks of at most chunk_size points covering a grid in C order
+
+    Blocks span whole trailing axes where they fit, and a run of the first
+    axis that does not, with every leading axis taken one index at a time.
+    A grid with a zero-length axis has no points and so no blocks.
+    """
+    if len(shape) == 0:
+        raise ValueError("A sweep needs at least one axis")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, not {chunk_size}")
+    if 0 in shape:
+        return
+    split_axis = next(
+        axis for axis in range(len(shape)) if int(np.prod(shape[axis + 1 :], dtype=np.int64)) <= chunk_size
+    )
+    block_size = int(np.prod(shape[split_axis + 1 :], dtype=np.int64))
+    step = max(1, chunk_size // max(block_size, 1))
+    trailing = (slice(None),) * (len(shape) - split_axis - 1)
+    for leading in np.ndindex(*shape[:split_axis]):
+        leading_slices = tuple(slice(index, index + 1) for index in leading)
+        for begin in range(0, shape[split_axis], step):
+            yield leading_slices + (slice(begin, min(begin + step, shape[split_axis])),) + trailing
+
+
+def iter_sweep(
+    func: Callable,
+    axes: Mapping,
+    parameters: Optional[Mapping] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[Tuple[slice, ...], np.ndarray]]:
+    """Evaluate func over a grid one block at a time
+
+    For each block, func is called with each axis, restricted to the block,
+    as a keyword argument shaped to broadcast along its own dimension, plus
+    the fixed parameters.  For example, fraction ligand bound over target
+    fraction bound, ligand concentration, inhibitor KD and ligand pKD:
+
+        for index, block in iter_sweep(
+            optimal_ligand_affinity.fraction_bound_at_pkdpl,
+            {"tflb": tflbs, "l": ligand_concs, "kdpi": inhibitor_kds, "pkdpl": ligand_pkds},
+            {"i": 10e-6},
+        ):
+            full_result[index] = block
+
+    Args:
+        func (Callable): Vectorised function of the axes and parameters, such
+            as fast_binding_equations.competition_pl
+        axes (Mapping): 1-D arrays keyed by argument name, whose outer
+            product in mapping order is the grid
+        parameters (Mapping, optional): Fixed arguments to func. Defaults to
+            no arguments.
+        chunk_size (int, optional): Maximum points per block. Defaults to
+            DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        Tuple[Tuple[slice, ...], np.ndarray]: Slices locating the block in the
+            full grid, and the results over the block
+    """
+    if parameters is None:
+        parameters = {}
+    axes = {name: np.asarray(axis) for name, axis in axes.items()}
+    shape = sweep_shape(axes)
+    for index in iter_sweep_blocks(shape, chunk_size):
+        block_axes = {
+            name: axis[index[dim]].reshape((-1,) + (1,) * (len(shape) - dim - 1))
+            for dim, (name, axis) in enumerate(axes.items())
+        }
+        block_shape = tuple(len(range(*block_slice.indices(size))) for block_slice, size in zip(index, shape))
+        yield index, np.broadcast_to(func(**block_axes, **parameters), block_shape)
+
+
+def write_sweep(
+    path: Union[str, Path],
+    func: Callable,
+    axes: Mapping,
+    parameters: Optional[Mapping] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype=np.float64,
+) -> np.ndarray:
+    """Stream a sweep into a .npy file, returning it memory-mapped read only
+
+    The file is written block by block through a memory map, so sweeps
+    larger than memory can be written and later opened with
+    np.load(path, mmap_mode="r").
+    """
+    output = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=sweep_shape(axes))
+    for index, block in iter_sweep(func, axes, parameters, chunk_size):
+        output[index] = block
+    output.flush()
+    del output
+    return np.load(path, mmap_mode="r")
@@ -0,0 +1,274 @@
+"""
+Interpolating surrogate for fraction ligand bound
+
+Fraction ligand bound depends on concentrations and KDs only through their
+ratios, so rather than gridding ligand pKD, inhibitor pKD, p[L0], p[I0] and
+target fraction ligand bound without inhibitor (TFLB) directly, the
+surrogate precomputes it on a four dimensional grid of dimensionless
+coordinates:
+
+    log10([L0]/KDPL), the ligand excess over its KD
+    arcsinh(log10([I0]/[P0]) / INHIBITOR_RATIO_SCALE), where [P0] is set by
+        calc_amount_p to reach the TFLB.  A tight inhibitor titrates the
+        protein, and fraction bound changes most sharply where [I0] passes
+        [P0], so the arcsinh spaces grid points most finely there
+    log10([I0]/KDPI) - log10(1 + [P0]/KDPL), the inhibitor excess over its
+        KD, shifted by the ligand's hold on the protein so that the
+        competition transition sits at about the same coordinate for every
+        ligand excess
+    TFLB
+
+Queries are answered by multilinear interpolation on the grid, which is
+stored in float32 as its rounding is far below the interpolation error and
+halving the memory read per query doubles the throughput.  The maximum
+interpolation error is measured when the surrogate is built, by comparing
+against fast_binding_equations.competition_pl_polished at random points in
+the query ranges, which agrees with the high accuracy competition_pl far
+more closely than any practical grid interpolates.
+Surrogates are saved to a directory and the grid memory-mapped on load, so
+large grids open instantly and are shared between processes.
+"""
+
+
+import json
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+from .fast_binding_equations import _as_float_arrays, calc_amount_p, competition_pl_polished
+
+AXIS_NAMES = ("pkdpl", "pkdpi", "pl0", "pi0", "tflb")
+GRID_AXIS_NAMES = ("log_ligand_excess", "inhibitor_protein_ratio", "log_inhibitor_excess", "tflb")
+DEFAULT_RANGES = ((3, 12), (3, 12), (5, 10), (4, 8), (0.1, 0.9))
+DEFAULT_SHAPE = (57, 129, 161, 33)
+DEFAULT_MAX_ERROR = 0.01
+# log10([I0]/[P0]) at which the grid spacing along inhibitor_protein_ratio starts to widen
+INHIBITOR_RATIO_SCALE = 0.1
+_QUERY_CHUNK_SIZE = 1 << 15
+
+
+def _fraction_bound(pkdpl, pkdpi, pl0, pi0, tflb):
+    """Fraction ligand bound from the float64 polished solver, on broadcast arrays"""
+    kdpl, kdpi, l, i = 10**-pkdpl, 10**-pkdpi, 10**-pl0, 10**-pi0
+    return competition_pl_polished(calc_amount_p(tflb, l, kdpl), l, i, kdpl, kdpi)[0] / l
+
+
+def _grid_coordinates(pkdpl, pkdpi, pl0, pi0, tflb):
+    """Dimensionless grid coordinates, in GRID_AXIS_NAMES order, of points given on AXIS_NAMES"""
+    log_ligand_excess = pkdpl - pl0
+    # [P0]/KDPL from calc_amount_p, which is KDPL*TFLB/(1 - TFLB) + [L0]*TFLB
+    protein_excess = tflb / (1 - tflb) + 10**log_ligand_excess * tflb
+    log_inhibitor_protein_ratio = pkdpl - pi0 - np.log10(protein_excess)
+    return (
+        log_ligand_excess,
+        np.arcsinh(log_inhibitor_protein_ratio / INHIBITOR_RATIO_SCALE),
+        pkdpi - pi0 - np.log10(1 + protein_excess),
+        tflb,
+    )
+
+
+def _grid_fraction_bound(log_ligand_excess, inhibitor_protein_ratio, log_inhibitor_excess, tflb):
+    """Fraction ligand bound at grid coordinates, solved with KDPL of 1"""
+    l = 10**log_ligand_excess
+    p = calc_amount_p(tflb, l, 1.0)
+    i = p * 10 ** (INHIBITOR_RATIO_SCALE * np.sinh(inhibitor_protein_ratio))
+    kdpi = i / (10**log_inhibitor_excess * (1 + p))
+    return competition_pl_polished(p, l, i, 1.0, kdpi)[0] / l
+
+
+def _grid_ranges(ranges):
+    """First and last value of each grid axis covering every point within ranges"""
+    # Each grid coordinate is monotonic in every argument, so its extremes lie at corners of the ranges
+    corners = np.meshgrid(*(np.array(axis_range, dtype=np.float64) for axis_range in ranges), indexing="ij")
+    grid_ranges = [(float(np.min(coordinate)), float(np.max(coordinate))) for coordinate in _grid_coordinates(*corners)]
+    # Symmetric about [I0] = [P0], so an odd number of points puts one on the sharpest part of the transition
+    ratio_limit = max(abs(limit) for limit in grid_ranges[1])
+    grid_ranges[1] = (-ratio_limit, ratio_limit)
+    return tuple(grid_ranges)
+
+
+class FractionBoundSurrogate:
+    """Multilinear interpolation of fraction ligand bound on a dimensionless grid
+
+    Build with FractionBoundSurrogate.build, or open a saved surrogate with
+    FractionBoundSurrogate.load, rather than constructing directly.
+
+    Args:
+        ranges (Sequence[Tuple[float, float]]): First and last value of each
+            query axis, in AXIS_NAMES order.  Points outside are NaN.
+        grid_ranges (Sequence[Tuple[float, float]]): First and last grid
+            value of each axis, in GRID_AXIS_NAMES order.
+        values (np.ndarray): Fraction ligand bound at every grid point, as
+            float32.
+        max_error (float): Largest absolute error in fraction ligand bound
+            found when validating.
+    """
+
+    def __init__(
+        self,
+        ranges: Sequence[Tuple[float, float]],
+        grid_ranges: Sequence[Tuple[float, float]],
+        values: np.ndarray,
+        max_error: float,
+    ):
+        self.ranges = tuple((float(begin), float(end)) for begin, end in ranges)
+        self.grid_ranges = tuple((float(begin), float(end)) for begin, end in grid_ranges)
+        self.values = values
+        self.max_error = max_error
+        self._flat_values = values.reshape(-1)
+        num_axes = len(GRID_AXIS_NAMES)
+        self._strides = np.array([int(np.prod(values.shape[dim + 1 :])) for dim in range(num_axes)], dtype=np.int64)
+        # Flat offset of each cell corner, with the first axis varying slowest
+        self._corner_offsets = np.array(
+            [
+                sum(self._strides[dim] for dim in range(num_axes) if corner >> (num_axes - 1 - dim) & 1)
+                for corner in range(1 << num_axes)
+            ],
+            dtype=np.int64,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.values.shape
+
+    @classmethod
+    def build(
+        cls,
+        ranges: Sequence[Tuple[float, float]] = DEFAULT_RANGES,
+        shape: Sequence[int] = DEFAULT_SHAPE,
+        num_validation_points: int = 1_000_000,
+        seed: int = 0,
+        max_error: Optional[float] = DEFAULT_MAX_ERROR,
+    ) -> "FractionBoundSurrogate":
+        """Precompute the grid and measure the interpolation error
+
+        With the defaults the grid holds 39M points (156 MB), builds in about
+        20 s and answers about 3M random queries per second on one core,
+        twice the rate of competition_pl_polished.  Validated on 1M random
+        points, the largest error in fraction bound is about 0.006, and 0.07%
+        of points are off by more than 0.001.  The largest errors are for
+        inhibitors binding much more tightly than the ligand, near
+        [I0] = [P0], where fraction bound falls most steeply.  More points
+        along inhibitor_protein_ratio reduce the largest error, and more along
+        log_inhibitor_excess reduce the share of points off by over 0.001.
+
+        Args:
+            ranges (Sequence[Tuple[float, float]], optional): First and last
+                value of the ligand pKD, inhibitor pKD, p[L0], p[I0] and TFLB
+                the surrogate answers for. Defaults to DEFAULT_RANGES.
+            shape (Sequence[int], optional): Number of grid points along each
+                axis, in GRID_AXIS_NAMES order. Defaults to DEFAULT_SHAPE.
+            num_validation_points (int, optional): Random points at which the
+                interpolated and solved fraction bound are compared. Defaults
+                to 1000000.
+            seed (int, optional): Seed for the validation points. Defaults to 0.
+            max_error (float, optional): Largest accepted error in fraction
+                bound at the validation points, or None to accept any.
+                Defaults to DEFAULT_MAX_ERROR.
+
+        Raises:
+            ValueError: The validation error exceeds max_error
+
+        Returns:
+            FractionBoundSurrogate: The surrogate, with max_error set to the
+                validation error
+        """
+        grid_ranges = _grid_ranges(ranges)
+        axes = np.meshgrid(
+            *(np.linspace(begin, end, num) for (begin, end), num in zip(grid_ranges, shape)),
+            indexing="ij",
+            sparse=True,
+        )
+        values = np.empty(tuple(shape), dtype=np.float32)
+        # One ligand excess at a time, bounding the memory used by the solver's temporaries
+        for index in range(shape[0]):
+            values[index] = _grid_fraction_bound(axes[0][index], *axes[1:])[0]
+        surrogate = cls(ranges, grid_ranges, values, np.nan)
+
+        rng = np.random.default_rng(seed)
+        points = [rng.uniform(begin, end, num_validation_points) for begin, end in surrogate.ranges]
+        surrogate.max_error = float(np.max(np.abs(surrogate.interpolate(*points) - _fraction_bound(*points))))
+        if max_error is not None and surrogate.max_error > max_error:
+            raise ValueError(
+                f"Surrogate error {surrogate.max_error:.3g} exceeds max_error {max_error:.3g}, "
+                "increase the shape of the grid"
+            )
+        return surrogate
+
+    def interpolate(self, pkdpl, pkdpi, pl0, pi0, tflb) -> np.ndarray:
+        """Fraction ligand bound at points given on the query axes, NaN outside the ranges"""
+        coordinates = [coordinate.reshape(-1) for coordinate in _as_float_arrays(pkdpl, pkdpi, pl0, pi0, tflb)]
+        result = np.empty(coordinates[0].shape[0])
+        for begin in range(0, result.shape[0], _QUERY_CHUNK_SIZE):
+            chunk = slice(begin, begin + _QUERY_CHUNK_SIZE)
+            result[chunk] = self._interpolate_chunk([coordinate[chunk] for coordinate in coordinates])
+        return result.reshape(np.broadcast(pkdpl, pkdpi, pl0, pi0, tflb).shape)[()]
+
+    def _interpolate_chunk(self, coordinates):
+        inside = np.ones(coordinates[0].shape[0], dtype=bool)
+        for coordinate, (begin, end) in zip(coordinates, self.ranges):
+            inside &= (coordinate >= begin) & (coordinate <= end)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            grid_coordinates = _grid_coordinates(*coordinates)
+        base_index = np.zeros(coordinates[0].shape[0], dtype=np.int64)
+        weights = []
+        for dim, coordinate in enumerate(grid_coordinates):
+            begin, end = self.grid_ranges[dim]
+            num = self.values.shape[dim]
+            position = np.clip((np.where(inside, coordinate, begin) - begin) * ((num - 1) / (end - begin)), 0, num - 1)
+            cell = np.minimum(position.astype(np.int64), num - 2)
+            base_index += cell * self._strides[dim]
+            weights.append(position - cell)
+        # Values at the 2^4 corners of each cell, then linear interpolation along one axis at a time
+        corners = self._flat_values[self._corner_offsets[:, np.newaxis] + base_index[np.newaxis, :]]
+        for weight in weights:
+            corners = corners.reshape(2, -1, corners.shape[-1])
+            corners = corners[0] + weight * (corners[1] - corners[0])
+        result = corners.reshape(-1)
+        result[~inside] = np.nan
+        return result
+
+    def __call__(self, kdpl, kdpi, l, i, tflb) -> np.ndarray:
+        """Fraction ligand bound for ligand and inhibitor KDs, [L0], [I0] and TFLB
+
+        Arguments are broadcast against each other.  Points outside the
+        ranges are NaN.
+        """
+        kdpl, kdpi, l, i, tflb = _as_float_arrays(kdpl, kdpi, l, i, tflb)
+        return self.interpolate(-np.log10(kdpl), -np.log10(kdpi), -np.log10(l), -np.log10(i), tflb)
+
+    def save(self, directory: Union[str, Path]):
+        """Write the grid as values.npy, with its ranges and max_error in surrogate.json"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "values.npy", self.values)
+        with open(directory / "surrogate.json", "w") as file:
+            json.dump(
+                {
+                    "axes": AXIS_NAMES,
+                    "ranges": self.ranges,
+                    "grid_axes": GRID_AXIS_NAMES,
+                    "grid_ranges": self.grid_ranges,
+                    "inhibitor_ratio_scale": INHIBITOR_RATIO_SCALE,
+                    "max_error": self.max_error,
+                },
+                file,
+                indent=1,
+            )
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "FractionBoundSurrogate":
+        """Open a saved surrogate with its grid memory-mapped read only"""
+        directory = Path(directory)
+        with open(directory / "surrogate.json") as file:
+            metadata = json.load(file)
+        if (
+            tuple(metadata.get("grid_axes", ())) != GRID_AXIS_NAMES
+            or metadata.get("inhibitor_ratio_scale") != INHIBITOR_RATIO_SCALE
+        ):
+            raise ValueError(f"{directory} was saved with a different grid, rebuild it with FractionBoundSurrogate.build")
+        return cls(
+            metadata["ranges"],
+            metadata["grid_ranges"],
+            np.load(directory / "values.npy", mmap_mode="r"),
+            metadata["max_error"],
+        )
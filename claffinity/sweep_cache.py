@@ -0,0 +1,206 @@
+"""
+Content-addressed on-disk cache of parameter sweeps
+
+A sweep is any function evaluated over broadcast parameter arrays returning
+one array, such as fast_binding_equations.competition_pl_trig or
+parallel_sweep.competition_pl_sweep.  Results are stored under a SHA-256 key
+of the function, or an explicit name for functions such as lambdas whose
+qualified name is not unique, its sweep axes and fixed parameters, the
+precision and the equation versions, so changing any of them computes a new
+result rather than loading a stale one.  Files are written atomically, and
+the least recently used are removed once the cache directory exceeds its
+size limit, so a directory can be shared between scripts and between
+machines on a shared filesystem.
+"""
+
+
+import hashlib
+import inspect
+import os
+from pathlib import Path
+import tempfile
+from typing import Callable, Mapping, Optional, Union
+import numpy as np
+from . import fast_binding_equations, high_accuracy_binding_equations
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("CLAFFINITY_CACHE_DIR", Path.home() / ".cache" / "claffinity"))
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def _remove(path: Union[str, Path]):
+    """Remove a file if it still exists, another process may have removed it first"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _new_file_mode() -> int:
+    """Permissions open() gives a new file under the current umask"""
+    # The umask can only be read by setting it, so set it back straight away
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _function_identity(func: Callable, name: Optional[str]) -> str:
+    """Name identifying func in cache keys, the module and qualified name of a module level function"""
+    if name is not None:
+        return f"name {name}"
+    qualname = getattr(func, "__qualname__", "")
+    if not inspect.isfunction(func) or "<" in qualname:
+        raise ValueError(
+            f"{func!r} has no name identifying what it computes, pass name to give it one, "
+            "changing the name whenever the function changes"
+        )
+    return f"function {func.__module__}.{qualname}"
+
+
+class SweepCache:
+    """Directory of cached sweep results
+
+    Args:
+        directory (Union[str, Path], optional): Cache directory, created if
+            needed. Defaults to DEFAULT_CACHE_DIR, which is the
+            CLAFFINITY_CACHE_DIR environment variable if set, otherwise
+            ~/.cache/claffinity.
+        max_bytes (int, optional): Size the cache is trimmed to after each
+            new result, removing least recently used results first.
+            Defaults to DEFAULT_MAX_BYTES (2 GiB).
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(
+        self, func: Callable, axes: Mapping, parameters: Mapping, dps: Optional[int] = None, name: Optional[str] = None
+    ) -> str:
+        """Hex digest identifying a sweep
+
+        The function is identified by name if given, otherwise by its module
+        and qualified name.  Lambdas, functions defined inside other
+        functions, functools.partial objects, bound methods and other
+        callables share or lack such a name whatever they compute, so they
+        need an explicit name.  Array axes are hashed by shape and exact
+        float64 contents, fixed parameters by their exact float values.
+        """
+        digest = hashlib.sha256()
+        digest.update(_function_identity(func, name).encode())
+        digest.update(
+            f"{high_accuracy_binding_equations.EQUATION_VERSION},{fast_binding_equations.EQUATION_VERSION}".encode()
+        )
+        digest.update(f"dps={dps}".encode())
+        for axis_name in sorted(axes):
+            axis = np.ascontiguousarray(axes[axis_name], dtype=np.float64)
+            digest.update(f"axis {axis_name} {axis.shape}".encode())
+            digest.update(axis.tobytes())
+        for parameter_name in sorted(parameters):
+            digest.update(f"parameter {parameter_name} {float(parameters[parameter_name])!r}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        """Cached result for key, or None if absent or unreadable"""
+        path = self._path(key)
+        try:
+            result = np.load(path)
+        except (OSError, ValueError):
+            return None
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def store(self, key: str, result: np.ndarray):
+        """Atomically write a result, then trim the cache to max_bytes"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.save(file, np.asarray(result))
+            # mkstemp creates files readable by their owner only, which would hide them from other users
+            os.chmod(temporary_path, _new_file_mode())
+            os.replace(temporary_path, self._path(key))
+        except BaseException:
+            _remove(temporary_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used results until the cache fits in max_bytes"""
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            _remove(path)
+            total_bytes -= size
+
+    def clear(self):
+        """Remove every cached result"""
+        for path in self.directory.glob("*.npy"):
+            _remove(path)
+
+    def sweep(
+        self,
+        func: Callable,
+        axes: Mapping,
+        parameters: Optional[Mapping] = None,
+        dps: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> np.ndarray:
+        """Result of func(**axes, **parameters), loaded from the cache where possible
+
+        If func takes a dps argument, the precision it would use is resolved
+        and passed explicitly, so a change of default precision is a new
+        sweep.
+
+        Args:
+            func (Callable): Function evaluated over broadcast arrays, for
+                example fast_binding_equations.competition_pl_trig.
+            axes (Mapping): Array arguments to func, keyed by name.
+            parameters (Mapping, optional): Scalar arguments to func, keyed
+                by name. Defaults to no arguments.
+            dps (int, optional): Decimal places for functions taking dps.
+                Defaults to None, using the high_accuracy_binding_equations
+                default.
+            name (str, optional): Name identifying func in the cache, needed
+                for lambdas, nested functions, functools.partial objects and
+                methods. Defaults to None, using the module and qualified
+                name of func.
+
+        Returns:
+            np.ndarray: Result of func
+
+        Raises:
+            ValueError: If func needs a name and none is given
+            TypeError: If func returns a tuple rather than one array, such as
+                fast_binding_equations.competition_pl_polished.  Sweep a
+                function selecting the array to cache instead.
+        """
+        if parameters is None:
+            parameters = {}
+        kwargs = {**axes, **parameters}
+        if "dps" in inspect.signature(func).parameters:
+            dps = high_accuracy_binding_equations._get_context(dps).dps
+            kwargs["dps"] = dps
+        key = self.key(func, axes, parameters, dps, name)
+        result = self.load(key)
+        if result is None:
+            result = func(**kwargs)
+            if isinstance(result, tuple):
+                raise TypeError(f"{func!r} returned a tuple, sweep a function returning one array to cache")
+            result = np.asarray(result)
+            self.store(key, result)
+        return result
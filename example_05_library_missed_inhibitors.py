@@ -0,0 +1,36 @@
+"""
+Simulate missed inhibitors across a whole screening library
+
+Extends example_04_missed_inhibitors.py from two hand-built systems to a
+library of 10 million compounds, with inhibitor KDs drawn from a log-normal
+distribution, screened with high, low and optimal affinity ligands.  For
+each assay design, reports the hits and missed inhibitors at a 50 % signal
+reduction threshold, counting compounds with KD of 10 µM or below as true
+actives.
+"""
+
+from claffinity.monte_carlo import LogNormal
+from claffinity.screening_simulation import AssayDesign, format_confusion_table, simulate_screen
+
+# We can choose to work in a common unit, typically nM, or uM, as long as all
+# numbers are in the same unit, the result is valid.  We assume uM for all
+# concentrations bellow.
+
+TARGET_FRACTION_BOUND = 0.7
+LIGAND_CONC = 0.01
+INHIBITOR_CONC = 10
+NUM_COMPOUNDS = 10_000_000
+SIGNAL_REDUCTION_THRESHOLD = 50  # Percent of the uninhibited signal
+ACTIVE_KDPI = 10  # Compounds with KD at or below this are true actives
+LIBRARY_KDPIS = LogNormal(100, 1.5)  # Median KD of 100 µM, with pKD standard deviation of 1.5
+
+designs = [
+    AssayDesign("High affinity (1 nM)", l=LIGAND_CONC, kdpl=0.001, i=INHIBITOR_CONC, tflb=TARGET_FRACTION_BOUND),
+    AssayDesign("Low affinity (100 nM)", l=LIGAND_CONC, kdpl=0.100, i=INHIBITOR_CONC, tflb=TARGET_FRACTION_BOUND),
+    AssayDesign("Optimal (pKD 6.975)", l=LIGAND_CONC, kdpl=10 ** -(6.975 - 6), i=INHIBITOR_CONC, tflb=TARGET_FRACTION_BOUND),
+]
+
+results = simulate_screen(
+    designs, LIBRARY_KDPIS, SIGNAL_REDUCTION_THRESHOLD, active_kdpi=ACTIVE_KDPI, num_compounds=NUM_COMPOUNDS
+)
+print(format_confusion_table(results))
@@ -47,6 +47,10 @@ def competition_pl(p, l, i, kdpl, kdpi):
     i = mpf(i)
     kdpl = mpf(kdpl)
     kdpi = mpf(kdpi)
+    # Exact thirds at the working precision, the float 0.3333333333333333 is
+    # not a third and limited the accuracy of the cube roots to ~1e-15
+    one_third = mpf(1) / 3
+    two_thirds = mpf(2) / 3
     if almosteq(kdpl, kdpi, 1e-15):
         kdpi += 1e-15
     if kdpl < kdpi:
@@ -62,7 +66,7 @@ def competition_pl(p, l, i, kdpl, kdpi):
             )
             / (3.0 * (-kdpi + kdpl))
             - (
-                power(2, 0.3333333333333333)
+                power(2, one_third)
                 * (
                     -power(
                         p * kdpi
@@ -247,7 +251,7 @@ def competition_pl(p, l, i, kdpl, kdpi):
                             3,
                         )
                     ),
-                    0.3333333333333333,
+                    one_third,
                 )
             )
             + power(
@@ -409,9 +413,9 @@ def competition_pl(p, l, i, kdpl, kdpi):
                         3,
                     )
                 ),
-                0.3333333333333333,
+                one_third,
             )
-            / (3.0 * power(2, 0.3333333333333333) * (-kdpi + kdpl))
+            / (3.0 * power(2, one_third) * (-kdpi + kdpl))
         ).real
     else:
         return (
@@ -451,7 +455,7 @@ def competition_pl(p, l, i, kdpl, kdpi):
             )
             / (
                 3.0
-                * power(2, 0.6666666666666666)
+                * power(2, two_thirds)
                 * (-kdpi + kdpl)
                 * power(
                     -2 * power(p, 3) * power(kdpi, 3)
@@ -612,7 +616,7 @@ def competition_pl(p, l, i, kdpl, kdpi):
                             3,
                         )
                     ),
-                    0.3333333333333333,
+                    one_third,
                 )
             )
             - (
@@ -776,8 +780,8 @@ def competition_pl(p, l, i, kdpl, kdpi):
                             3,
                         )
                     ),
-                    0.3333333333333333,
+                    one_third,
                 )
             )
-            / (6.0 * power(2, 0.3333333333333333) * (-kdpi + kdpl))
+            / (6.0 * power(2, one_third) * (-kdpi + kdpl))
         ).real
\ No newline at end of file
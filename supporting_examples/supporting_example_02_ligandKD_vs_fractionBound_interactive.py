@@ -13,7 +13,8 @@ from matplotlib import animation
 from matplotlib.widgets import Slider
 import sys
 import numpy as np
-from claffinity.high_accuracy_binding_equations import *
+from claffinity.optimal_ligand_affinity import fraction_bound_at_pkdpl
+from claffinity.sweep_cache import SweepCache
 
 
 
@@ -28,32 +29,20 @@ x_axis=np.linspace(XAXIS_BEGINNING, XAXIS_END,NUM_LIGAND_KDS)
 inhibitor_kds = 10**(-np.linspace(XAXIS_BEGINNING, XAXIS_END, NUM_INHIBITOR_KDS))  
 ligand_kds =  10**(-np.linspace(XAXIS_BEGINNING,XAXIS_END, num=NUM_LIGAND_KDS))
 
-protein_concs = np.array(calc_amount_p(
-    TARGET_FRACTION_L_BOUND, 10e-9, ligand_kds))
-DATAFILENAME="02-data.npz"
-y = np.full((ligand_kds.shape[0], inhibitor_kds.shape[0]), np.nan)
-if not Path(DATAFILENAME).exists():
-    print("Regenerating data file")
-    for it_ligand_kds, ligand_kd in enumerate(ligand_kds):
-        print(f"{it_ligand_kds}/{ligand_kds.shape[0]}")
-        
-        for it_inhibitor_kds, inhibitor_kd in enumerate(inhibitor_kds):
-            lig_conc = 10e-9
-            i_conc = 10e-6
-            p = protein_concs[it_ligand_kds]
-            y[it_ligand_kds][it_inhibitor_kds] = competition_pl(
-                **{'p': p, 'l': lig_conc, 'i': i_conc, 'kdpl': ligand_kd, 'kdpi': inhibitor_kd})/lig_conc
-    np.savez_compressed(DATAFILENAME, xaxis_beginning=XAXIS_BEGINNING, xaxis_end=XAXIS_END, ligand_kds=ligand_kds,protein_concs=protein_concs,y=y, inhibitor_kds=inhibitor_kds)
-
-print("Loading datafile")
-loaded_data=np.load(DATAFILENAME)
-XAXIS_BEGINNING=loaded_data['xaxis_beginning']
-XAXIS_END=loaded_data['xaxis_end']
-ligand_kds=loaded_data['ligand_kds']
-inhibitor_kds=loaded_data['inhibitor_kds']
-protein_concs=loaded_data['protein_concs']
-x_axis=np.linspace(XAXIS_BEGINNING, XAXIS_END, num=ligand_kds.shape[0])
-y=loaded_data['y']
+LIGAND_CONC = 10e-9
+INHIBITOR_CONC = 10e-6
+
+# SweepCache keys the result on the function, axes and parameters, so examples sharing this sweep calculate it
+# once, and changing any parameter above calculates a new sweep rather than loading another example's data
+print("Loading or calculating fraction ligand bound")
+y = SweepCache().sweep(
+    fraction_bound_at_pkdpl,
+    {
+        "pkdpl": np.linspace(XAXIS_BEGINNING, XAXIS_END, NUM_LIGAND_KDS)[:, np.newaxis],
+        "kdpi": inhibitor_kds[np.newaxis, :],
+    },
+    {"tflb": TARGET_FRACTION_L_BOUND, "l": LIGAND_CONC, "i": INHIBITOR_CONC},
+)
 
 
 fig, ax = plt.subplots(2,1, figsize=(7.204724, 5.09424929292), gridspec_kw={'height_ratios':[10,1]})
@@ -9,7 +9,7 @@ concerns.
 import sys
 from matplotlib import pyplot as plt
 import numpy as np
-from claffinity.high_accuracy_binding_equations import *
+from claffinity.fast_binding_equations import calc_amount_p, calc_i_for_fractionl_bound
 
 # We can choose to work in a common unit, typically nM, or uM, as long as all
 # numbers are in the same unit, the result is valid.  We assume nM for all
@@ -26,15 +26,12 @@ LIGAND_CONC=10
 x_axis = np.linspace(XAXIS_BEGINNING, XAXIS_END, NUM_POINTS_ON_XAXIS)
 inhibitor_kds = 10**(x_axis)  # We are working in µM, which is 1e-6.
 
-protein_conc_for_ligand_kd = np.full((len(LIGAND_KDs)),np.nan)
-for i,ligand_kd in enumerate(LIGAND_KDs):
-    protein_conc_for_ligand_kd[i]=calc_amount_p(TARGET_FRACTION_L_BOUND, LIGAND_CONC, ligand_kd)
+ligand_kds = np.array(LIGAND_KDs, dtype=float)
+protein_conc_for_ligand_kd = calc_amount_p(TARGET_FRACTION_L_BOUND, LIGAND_CONC, ligand_kds)
 print(protein_conc_for_ligand_kd)
-y = np.full((protein_conc_for_ligand_kd.shape[0], inhibitor_kds.shape[0]), np.nan)
-
-for it_protein_conc, protein_conc in enumerate(protein_conc_for_ligand_kd):
-    for it_inhibitor_kds, inhibitor_kd in enumerate(inhibitor_kds):
-        y[it_protein_conc][it_inhibitor_kds]=calc_i_for_fractionl_bound(protein_conc,LIGAND_CONC,LIGAND_KDs[it_protein_conc],inhibitor_kd,0.7/2)
+# Rows are ligand KDs, columns inhibitor KDs
+y = calc_i_for_fractionl_bound(protein_conc_for_ligand_kd[:, np.newaxis], LIGAND_CONC, ligand_kds[:, np.newaxis],
+                               inhibitor_kds[np.newaxis, :], 0.7/2, dps=50)
 
 plot_line_labels = [
     r'K$_\mathrm{D}$PL=10 nM',
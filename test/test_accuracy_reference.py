@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from claffinity import fast_binding_equations, high_accuracy_binding_equations
+from claffinity.accuracy_reference import REGIMES, load_reference_dataset, validate_engine
+from claffinity.adaptive_precision import competition_pl_adaptive
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return load_reference_dataset()
+
+
+def test_reference_dataset_covers_every_regime(reference):
+    assert set(np.unique(reference.regime)) == set(range(len(REGIMES)))
+    assert np.all((reference.pl > 0) & (reference.pl <= np.minimum(reference.p, reference.l)))
+
+
+@pytest.mark.parametrize(
+    "engine, rtol",
+    [
+        (fast_binding_equations.competition_pl, 1e-9),
+        (fast_binding_equations.competition_pl_trig, 1e-9),
+        (fast_binding_equations.competition_pl_polished, 1e-9),
+        (competition_pl_adaptive, 1e-9),
+    ],
+    ids=lambda value: getattr(value, "__name__", None),
+)
+def test_vectorised_engine_agrees_with_reference(reference, engine, rtol):
+    report = validate_engine(engine, reference)
+    assert report.accepts(rtol), report.summary(reference)
+
+
+def test_high_accuracy_engine_agrees_with_reference(reference):
+    report = validate_engine(
+        lambda *system: high_accuracy_binding_equations.competition_pl(*system, dps=50), reference, vectorised=False
+    )
+    assert report.accepts(1e-10), report.summary(reference)
+
+
+def test_validate_engine_reports_non_finite_results(reference):
+    report = validate_engine(lambda p, l, i, kdpl, kdpi: np.where(kdpl == kdpi, np.nan, l), reference)
+    assert report.max_relative_error == np.inf
+    assert not report.accepts(1)
+    assert REGIMES[reference.regime[report.worst_indices[0]]] == "equal_kd"
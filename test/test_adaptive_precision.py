@@ -0,0 +1,21 @@
+import numpy as np
+from claffinity.accuracy_reference import load_reference_dataset
+from claffinity.adaptive_precision import FLOAT64_TIER, competition_pl_adaptive
+from claffinity.fast_binding_equations import calc_amount_p, competition_pl_polished
+
+
+def test_well_conditioned_grid_stays_in_float64():
+    kdpl, kdpi = 10 ** -np.linspace(3, 12, 100)[:, None], 10 ** -np.linspace(3, 12, 100)[None, :]
+    p = calc_amount_p(0.7, 10e-9, kdpl)
+    pl, tier = competition_pl_adaptive(p, 10e-9, 10e-6, kdpl, kdpi)
+    assert pl.shape == tier.shape == (100, 100)
+    assert np.all(tier == FLOAT64_TIER)
+    np.testing.assert_array_equal(pl, competition_pl_polished(p, 10e-9, 10e-6, kdpl, kdpi)[0])
+
+
+def test_hard_points_escalate_to_mpmath():
+    reference = load_reference_dataset()
+    pl, tier = competition_pl_adaptive(*reference[:5], rtol=1e-12)
+    escalated = tier != FLOAT64_TIER
+    assert 0 < np.count_nonzero(escalated) < 0.1 * tier.shape[0]
+    assert np.max(np.abs(pl - reference.pl) / reference.pl) <= 1e-12
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from claffinity.adaptive_sampling import adaptive_sample
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-20 * (x - 7)))
+
+
+@pytest.mark.parametrize("max_points", [2, 5, 16, 17, 40])
+def test_point_budget_is_never_exceeded(max_points):
+    calls = []
+
+    def func(x):
+        calls.append(x.shape[0])
+        return sigmoid(x)
+
+    x, y = adaptive_sample(func, 3, 12, tol=1e-6, max_points=max_points)
+    assert x.shape[0] == sum(calls) <= max_points
+    assert x[0] == 3 and x[-1] == 12
+    np.testing.assert_array_equal(y, sigmoid(x))
+
+
+def test_refinement_concentrates_points_in_the_transition():
+    x, y = adaptive_sample(sigmoid, 3, 12, tol=1e-4, max_points=200)
+    assert np.all(np.diff(x) > 0)
+    assert np.count_nonzero(np.abs(x - 7) < 0.5) > x.shape[0] / 2
+    dense_x = np.linspace(3, 12, 10_001)
+    assert np.max(np.abs(np.interp(dense_x, x, y) - sigmoid(dense_x))) < 1e-3
+
+
+def test_curves_are_refined_together():
+    x, y = adaptive_sample(lambda x: np.stack([sigmoid(x), sigmoid(x + 2)]), 3, 12, tol=1e-4, max_points=300)
+    assert y.shape == (2, x.shape[0])
+    assert np.count_nonzero(np.abs(x - 5) < 0.5) > 10
@@ -0,0 +1,23 @@
+import pytest
+from claffinity.batch_rendering import FigureJob, render_figures
+
+
+def test_jobs_have_independent_default_kwargs():
+    assert FigureJob("plot_ligand_KD_vs_FLB", "a.png").kwargs is None
+
+
+def test_render_figures_with_documented_class_kwargs(tmp_path):
+    jobs = [
+        FigureJob("plot_protein_needed_vs_ligand_kd", tmp_path / "protein.png"),
+        FigureJob("plot_ligand_KD_vs_FLB", tmp_path / "ligand.png", {"pKD_begin": 4, "pKD_end": 10}),
+    ]
+    results = render_figures(jobs, max_workers=2, x_axis_resolution=60, adaptive_tolerance=1e-3)
+    assert len(results) == 2
+    assert (tmp_path / "protein.png").stat().st_size > 0
+    assert (tmp_path / "ligand.png").stat().st_size > 0
+    assert results[1].x_axis[0] == 4 and results[1].x_axis[-1] == 10
+
+
+def test_render_figures_rejects_non_plot_methods(tmp_path):
+    with pytest.raises(ValueError):
+        render_figures([FigureJob("single_point_competition_readout", tmp_path / "x.png")], max_workers=1)
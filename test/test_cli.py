@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from claffinity import cli, high_accuracy_binding_equations, parallel_sweep
+from claffinity.fast_binding_equations import calc_amount_p
+
+
+@pytest.fixture
+def conditions():
+    return pd.DataFrame(
+        {
+            "tflb": [0.7, 0.5, 0.9, 0.3],
+            "l": [10e-9, 1e-9, 50e-9, 5e-9],
+            "i": [10e-6, 1e-6, 100e-6, 2e-6],
+            "kdpl": [1e-9, 50e-9, 1e-10, 5e-9],
+            "kdpi": [1e-6, 50e-9, 1e-8, 5.0000001e-9],
+        }
+    )
+
+
+def expected_pl(conditions):
+    p = calc_amount_p(conditions["tflb"].to_numpy(), conditions["l"].to_numpy(), conditions["kdpl"].to_numpy())
+    return np.array(
+        [
+            float(high_accuracy_binding_equations.competition_pl(*system, dps=100))
+            for system in zip(p, *(conditions[column] for column in cli.CONDITION_COLUMNS))
+        ]
+    )
+
+
+@pytest.mark.parametrize("engine", list(cli.ENGINES))
+def test_every_engine_evaluates_conditions(conditions, engine):
+    results = cli.evaluate_conditions(conditions, engine=engine, max_workers=1)
+    assert results["pl"].to_numpy().shape == (len(conditions),)
+    np.testing.assert_allclose(results["pl"], expected_pl(conditions), rtol=1e-9)
+    np.testing.assert_allclose(results["flb"], results["pl"] / conditions["l"])
+
+
+def test_target_flb_round_trip(conditions):
+    results = cli.evaluate_conditions(conditions, target_flb=0.2)
+    round_trip = cli.evaluate_conditions(
+        conditions.assign(p=results["p"], kdpi=results["kdpi_for_target_flb"]).drop(columns="tflb")
+    )
+    np.testing.assert_allclose(round_trip["flb"], 0.2, rtol=1e-8)
+
+
+def test_missing_columns_raise(conditions):
+    with pytest.raises(ValueError, match="p or tflb"):
+        cli.evaluate_conditions(conditions.drop(columns="tflb"))
+
+
+@pytest.mark.parametrize("engine", list(cli.ENGINES))
+def test_main_writes_csv(conditions, engine, tmp_path):
+    conditions.to_csv(tmp_path / "conditions.csv", index=False)
+    status = cli.main(
+        [str(tmp_path / "conditions.csv"), "-o", str(tmp_path / "results.csv"), "--engine", engine, "--chunk-size", "3"]
+    )
+    assert status == 0
+    results = pd.read_csv(tmp_path / "results.csv")
+    np.testing.assert_allclose(results["pl"], expected_pl(conditions), rtol=1e-9)
+
+
+def test_high_accuracy_run_uses_one_pool(conditions, tmp_path, monkeypatch):
+    pools = []
+
+    class CountingExecutor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(cli, "ProcessPoolExecutor", CountingExecutor)
+    monkeypatch.setattr(parallel_sweep, "ProcessPoolExecutor", CountingExecutor)
+    conditions.to_csv(tmp_path / "conditions.csv", index=False)
+    status = cli.main(
+        [str(tmp_path / "conditions.csv"), "-o", str(tmp_path / "results.csv"), "--engine", "high_accuracy"]
+        + ["--chunk-size", "1", "--dps", "15", "--workers", "1"]
+    )
+    assert status == 0
+    assert len(pools) == 1
+    results = pd.read_csv(tmp_path / "results.csv")
+    expected = [
+        float(high_accuracy_binding_equations.competition_pl(*system, dps=15))
+        for system in zip(results["p"], *(conditions[column] for column in cli.CONDITION_COLUMNS))
+    ]
+    np.testing.assert_allclose(results["pl"], expected, rtol=1e-14)
@@ -0,0 +1,60 @@
+import numpy as np
+from claffinity import high_accuracy_binding_equations
+from claffinity.accuracy_reference import load_reference_dataset, validate_engine
+from claffinity.competition_label_affinity import CompetitionLabelAffinity
+from claffinity.fast_binding_equations import competition_pl_polished
+from claffinity.memoization import CompetitionCache
+
+
+def hardest_reference_points(num_points=20):
+    reference = load_reference_dataset()
+    worst = validate_engine(competition_pl_polished, reference).worst_indices[:num_points]
+    return tuple(field[worst] for field in reference[:6])
+
+
+def test_batch_readout_defaults_to_float64():
+    *systems, pl = hardest_reference_points()
+    batch_pl, flb = CompetitionLabelAffinity().batch_competition_readout(*systems)
+    np.testing.assert_array_equal(batch_pl, competition_pl_polished(*systems)[0])
+    np.testing.assert_allclose(flb, batch_pl / systems[1])
+
+
+def test_dps_applies_to_batch_readout():
+    *systems, pl = hardest_reference_points()
+    float64_error = np.max(np.abs(competition_pl_polished(*systems)[0] - pl) / pl)
+    for cla in (CompetitionLabelAffinity(dps=60), CompetitionLabelAffinity(dps=60, cache=CompetitionCache())):
+        batch_pl, _ = cla.batch_competition_readout(*systems)
+        error = np.max(np.abs(batch_pl - pl) / pl)
+        assert error <= 1e-10 < float64_error
+
+
+def test_dps_applies_to_plot_data():
+    data = CompetitionLabelAffinity().inhibitor_KD_vs_FLB_data(kdpl=[1e-9, 1e-6])
+    high_accuracy_data = CompetitionLabelAffinity(dps=50).inhibitor_KD_vs_FLB_data(kdpl=[1e-9, 1e-6])
+    np.testing.assert_allclose(high_accuracy_data.y, data.y, rtol=1e-9)
+
+
+def test_single_point_readout_matches_batch():
+    cla = CompetitionLabelAffinity(dps=50)
+    p, l, i, kdpl, kdpi = 2e-8, 1e-8, 1e-5, 1e-9, 1e-6
+    np.testing.assert_allclose(
+        cla.single_point_competition_readout(p, l, i, kdpl, kdpi), cla.batch_competition_readout(p, l, i, kdpl, kdpi)[0]
+    )
+
+
+def test_dps_escalates_only_unresolved_points(monkeypatch):
+    calls = []
+    high_accuracy_competition_pl = high_accuracy_binding_equations.competition_pl
+
+    def counting_competition_pl(*args, **kwargs):
+        calls.append(args)
+        return high_accuracy_competition_pl(*args, **kwargs)
+
+    monkeypatch.setattr(high_accuracy_binding_equations, "competition_pl", counting_competition_pl)
+    cla = CompetitionLabelAffinity(dps=50)
+    cla.inhibitor_KD_vs_FLB_data()
+    cla.ligand_KD_vs_FLB_data()
+    assert calls == []
+    *systems, pl = hardest_reference_points()
+    cla.batch_competition_readout(*systems)
+    assert 0 < len(calls) < len(pl)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from claffinity import high_accuracy_binding_equations
+from claffinity.accuracy_reference import load_reference_dataset, reference_competition_pl
+from claffinity.fast_binding_equations import (
+    SENSITIVITY_PARAMETERS,
+    calc_amount_p,
+    competition_pl,
+    competition_pl_polished,
+    competition_pl_sensitivities,
+    fraction_bound_sensitivities,
+)
+
+
+def test_polished_error_estimate_bounds_error_on_reference():
+    reference = load_reference_dataset()
+    pl, relative_error = competition_pl_polished(*reference[:5])
+    error = np.abs(pl - reference.pl) / reference.pl
+    assert np.all(error <= np.maximum(relative_error, 1e-14))
+
+
+def test_polished_error_estimate_near_double_root():
+    rng = np.random.default_rng(0)
+    p, i, kdpi = 10 ** rng.uniform(-9, -8, 50), 10 ** rng.uniform(-12, -9, 50), 10 ** rng.uniform(-8, -6, 50)
+    l, kdpl = 6e-11, 1.5e-15
+    pl, relative_error = competition_pl_polished(p, l, i, kdpl, kdpi)
+    reference = np.array([reference_competition_pl(*system, dps=100) for system in np.broadcast(p, l, i, kdpl, kdpi)])
+    error = np.abs(pl - reference) / reference
+    assert np.max(error) > 1e-10
+    assert np.all(error <= relative_error)
+
+
+def test_competition_pl_is_physical_for_tight_binders():
+    # Conditions where the float64 closed form returned tens of thousands of negative [PL]
+    kdpl, kdpi = 10 ** -np.linspace(3, 12, 1000)[:, None], 10 ** -np.linspace(3, 12, 1000)[None, :]
+    l, i = 1e-9, 1e-4
+    p = calc_amount_p(0.1, l, kdpl)
+    pl = competition_pl(p, l, i, kdpl, kdpi)
+    assert pl.shape == (1000, 1000)
+    assert np.all((pl > 0) & (pl <= np.minimum(p, l)))
+
+
+def test_competition_pl_matches_reference():
+    reference = load_reference_dataset()
+    pl = competition_pl(*reference[:5])
+    np.testing.assert_allclose(pl, reference.pl, rtol=1e-9)
+
+
+def central_difference(func, system, index, dps=60):
+    """Derivative of func with respect to system[index], by central difference at dps digits"""
+    ctx = high_accuracy_binding_equations._get_context(dps)
+    system = [ctx.mpf(value) for value in system]
+    step = system[index] * ctx.mpf("1e-15")
+    plus, minus = list(system), list(system)
+    plus[index] += step
+    minus[index] -= step
+    return float((func(*plus, dps=dps) - func(*minus, dps=dps)) / (2 * step))
+
+
+def high_accuracy_fraction_bound(p, l, i, kdpl, kdpi, dps):
+    return high_accuracy_binding_equations.competition_pl(p, l, i, kdpl, kdpi, dps=dps) / l
+
+
+SENSITIVITY_SYSTEMS = [
+    (2e-8, 1e-8, 1e-5, 1e-9, 1e-6),
+    (5e-7, 1e-8, 1e-6, 1e-7, 1e-9),
+    (3e-9, 5e-9, 1e-4, 1e-10, 1e-4),
+    # Near equal and exactly equal KDs, where the cubic term almost or entirely vanishes
+    (2e-8, 1e-8, 1e-6, 1e-8, 1e-8 * (1 + 1e-9)),
+    (2e-8, 1e-8, 1e-6, 1e-8, 1e-8 * (1 + 1e-3)),
+    (2e-8, 1e-8, 1e-6, 1e-8, 1e-8),
+]
+
+
+@pytest.mark.parametrize("system", SENSITIVITY_SYSTEMS)
+def test_sensitivities_match_central_differences(system):
+    pl, pl_sensitivities = competition_pl_sensitivities(*system)
+    flb, flb_sensitivities = fraction_bound_sensitivities(*system)
+    assert pl_sensitivities.shape == flb_sensitivities.shape == (len(SENSITIVITY_PARAMETERS),)
+    assert flb == pytest.approx(pl / system[1], rel=1e-15)
+    for index, parameter in enumerate(SENSITIVITY_PARAMETERS):
+        expected_pl = central_difference(high_accuracy_binding_equations.competition_pl, system, index)
+        expected_flb = central_difference(high_accuracy_fraction_bound, system, index)
+        # Scaled by the parameter, so derivatives near zero are compared on the scale of the others
+        scale = np.max(np.abs(pl_sensitivities * system)) / system[index]
+        assert pl_sensitivities[index] == pytest.approx(expected_pl, rel=1e-8, abs=1e-8 * scale), parameter
+        assert flb_sensitivities[index] == pytest.approx(expected_flb, rel=1e-8, abs=1e-8 * scale / system[1]), parameter
+
+
+def test_sensitivities_broadcast_over_reference():
+    reference = load_reference_dataset()
+    pl, sensitivities = competition_pl_sensitivities(*reference[:5])
+    assert sensitivities.shape == (len(SENSITIVITY_PARAMETERS), reference.pl.shape[0])
+    np.testing.assert_array_equal(pl, competition_pl_polished(*reference[:5])[0])
+    # Conservation: [PL] can not rise faster than the scarcer of protein and ligand is added
+    assert np.all(sensitivities[:2] >= 0) and np.all(sensitivities[:2] <= 1 + 1e-12)
+    assert np.all(sensitivities[SENSITIVITY_PARAMETERS.index("i")] <= 0)
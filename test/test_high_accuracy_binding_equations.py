@@ -0,0 +1,59 @@
+import mpmath
+import pytest
+from claffinity import high_accuracy_binding_equations
+from claffinity.high_accuracy_binding_equations import DEFAULT_DPS, _get_context, competition_pl, precision
+
+SYSTEM = (2.9571816644220806e-05, 3.53694445800916e-10, 4.612523859440789e-05, 9.027794365750247e-06, 2.4621567474947e-09)
+
+
+def test_precision_is_restored():
+    assert _get_context().dps == DEFAULT_DPS
+    with precision(30):
+        assert _get_context().dps == 30
+    assert _get_context().dps == DEFAULT_DPS
+
+
+def test_precision_is_restored_after_an_exception():
+    with pytest.raises(ZeroDivisionError):
+        with precision(30):
+            1 / 0
+    assert _get_context().dps == DEFAULT_DPS
+
+
+def test_precision_nests():
+    with precision(30):
+        with precision(60):
+            assert _get_context().dps == 60
+        assert _get_context().dps == 30
+        # An explicit dps wins over the enclosing block
+        assert _get_context(45).dps == 45
+    assert _get_context().dps == DEFAULT_DPS
+
+
+def test_precision_applies_to_calls():
+    with precision(15):
+        scoped = competition_pl(*SYSTEM)
+    assert scoped == competition_pl(*SYSTEM, dps=15)
+    # This system is ill conditioned enough for 15 digits to differ from the default
+    assert scoped != competition_pl(*SYSTEM)
+
+
+def test_global_mpmath_precision_is_untouched():
+    global_dps = mpmath.mp.dps
+    competition_pl(*SYSTEM)
+    with precision(30):
+        competition_pl(*SYSTEM)
+        high_accuracy_binding_equations.calc_amount_p(0.7, SYSTEM[1], SYSTEM[3])
+        assert mpmath.mp.dps == global_dps
+    competition_pl(*SYSTEM, dps=200)
+    assert mpmath.mp.dps == global_dps
+
+
+def test_global_mpmath_precision_is_ignored():
+    expected = competition_pl(*SYSTEM)
+    global_dps = mpmath.mp.dps
+    try:
+        mpmath.mp.dps = 10
+        assert competition_pl(*SYSTEM) == expected
+    finally:
+        mpmath.mp.dps = global_dps
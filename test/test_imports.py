@@ -0,0 +1,31 @@
+from pathlib import Path
+import subprocess
+import sys
+import pytest
+
+HEAVY_MODULES = ["matplotlib", "pandas", "pyarrow"]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import claffinity",
+        "from claffinity import CompetitionLabelAffinity; CompetitionLabelAffinity()",
+    ],
+)
+def test_import_does_not_load_heavy_modules(statement):
+    # A fresh interpreter, as this one may already have imported them
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; {statement}; print(*sorted({{name.split('.')[0] for name in sys.modules}}))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    loaded = set(completed.stdout.split())
+    assert "claffinity" in loaded
+    assert loaded.isdisjoint(HEAVY_MODULES)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from claffinity import fast_binding_equations, high_accuracy_binding_equations
+from claffinity.fast_binding_equations import calc_amount_p, competition_pl
+
+
+def sample_conditions(n, seed=0):
+    """Systems over typical assay conditions, with a target below the fraction bound without inhibitor"""
+    rng = np.random.default_rng(seed)
+    l = 10 ** -rng.uniform(5, 10, n)
+    kdpl = 10 ** -rng.uniform(3, 12, n)
+    tflb = rng.uniform(0.1, 0.9, n)
+    p = calc_amount_p(tflb, l, kdpl)
+    return p, l, kdpl, tflb * rng.uniform(0.1, 0.95, n), rng
+
+
+def test_kdpi_round_trip():
+    p, l, kdpl, targetflb, rng = sample_conditions(10_000)
+    i = 10 ** -rng.uniform(4, 8, p.shape[0])
+    kdpi = fast_binding_equations.calc_kdpi_for_fractionl_bound(p, l, i, kdpl, targetflb, dps=50)
+    reachable = np.isfinite(kdpi)
+    assert np.mean(reachable) > 0.5
+    assert np.all(kdpi[reachable] > 0)
+    np.testing.assert_allclose(
+        competition_pl(p, l, i, kdpl, kdpi)[reachable] / l[reachable], targetflb[reachable], rtol=1e-8
+    )
+
+
+def test_i_round_trip():
+    p, l, kdpl, targetflb, rng = sample_conditions(10_000, seed=1)
+    kdpi = 10 ** -rng.uniform(3, 12, p.shape[0])
+    i = fast_binding_equations.calc_i_for_fractionl_bound(p, l, kdpl, kdpi, targetflb, dps=50)
+    assert np.all(np.isfinite(i) & (i > 0))
+    np.testing.assert_allclose(competition_pl(p, l, i, kdpl, kdpi) / l, targetflb, rtol=1e-8)
+
+
+def test_unreachable_targets_are_nan():
+    p, l, kdpl = calc_amount_p(0.5, 1e-9, 1e-9), 1e-9, 1e-9
+    # Above the fraction bound without inhibitor no inhibitor concentration reaches the target
+    assert np.isnan(fast_binding_equations.calc_i_for_fractionl_bound(p, l, kdpl, 1e-9, 0.6))
+    # Too little inhibitor to displace the ligand this far, however tightly it binds
+    assert np.isnan(fast_binding_equations.calc_kdpi_for_fractionl_bound(p, l, 1e-12, kdpl, 0.01))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fast_inverse_matches_high_accuracy(seed):
+    p, l, kdpl, targetflb, rng = sample_conditions(20, seed=seed)
+    i, kdpi = 10 ** -rng.uniform(4, 8, 20), 10 ** -rng.uniform(3, 12, 20)
+    fast_kdpi = fast_binding_equations.calc_kdpi_for_fractionl_bound(p, l, i, kdpl, targetflb, dps=50)
+    fast_i = fast_binding_equations.calc_i_for_fractionl_bound(p, l, kdpl, kdpi, targetflb, dps=50)
+    for index in range(20):
+        system = p[index], l[index], kdpl[index], targetflb[index]
+        high_accuracy_kdpi = float(
+            high_accuracy_binding_equations.calc_kdpi_for_fractionl_bound(
+                system[0], system[1], i[index], system[2], system[3]
+            )
+        )
+        if high_accuracy_kdpi > 0:
+            assert fast_kdpi[index] == pytest.approx(high_accuracy_kdpi, rel=1e-9)
+        else:
+            assert np.isnan(fast_kdpi[index])
+        high_accuracy_i = float(
+            high_accuracy_binding_equations.calc_i_for_fractionl_bound(
+                system[0], system[1], system[2], kdpi[index], system[3]
+            )
+        )
+        assert fast_i[index] == pytest.approx(high_accuracy_i, rel=1e-9)
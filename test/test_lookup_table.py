@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from claffinity.fast_binding_equations import calc_amount_p, competition_pl
+from claffinity.lookup_table import (
+    LookupTable,
+    _save,
+    export_lookup_table_csv,
+    generate_lookup_table,
+    load_lookup_table,
+)
+
+TFLB = [0.7, 0.4]
+PL0 = [9, 8, 7]
+PI0 = [6, 5]
+KDPI = 1e-6
+
+
+def scan_optimal_pkdpl(tflb, pl0, pi0, pkd_begin, pkd_end):
+    """Ligand pKD giving the lowest fraction ligand bound over a dense scan of competition_pl"""
+    pkds = np.linspace(pkd_begin, pkd_end, 9_001)
+    l, kdpl = 10.0**-pl0, 10**-pkds
+    flb = competition_pl(calc_amount_p(tflb, l, kdpl), l, 10.0**-pi0, kdpl, KDPI) / l
+    return pkds[np.argmin(flb)], pkds[1] - pkds[0]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return generate_lookup_table(
+        tmp_path_factory.mktemp("table") / "table.npz", TFLB, PL0, PI0, kdpi=KDPI, max_workers=1, cells_per_task=5
+    )
+
+
+def test_cells_match_dense_scan(table):
+    assert table.pkdpl.shape == (len(TFLB), len(PI0), len(PL0))
+    for (tflb_index, pi0_index, pl0_index), pkdpl in np.ndenumerate(table.pkdpl):
+        expected, spacing = scan_optimal_pkdpl(TFLB[tflb_index], PL0[pl0_index], PI0[pi0_index], 3, 12)
+        assert pkdpl == pytest.approx(expected, abs=spacing)
+
+
+def test_optimum_outside_the_range_is_pinned_to_its_end(tmp_path):
+    # Every optimum is tighter than pKD 5, so each cell is at the end of the range
+    table = generate_lookup_table(tmp_path / "table.npz", TFLB, PL0, PI0, kdpi=KDPI, pkd_end=5, max_workers=1)
+    for (tflb_index, pi0_index, pl0_index), pkdpl in np.ndenumerate(table.pkdpl):
+        assert scan_optimal_pkdpl(TFLB[tflb_index], PL0[pl0_index], PI0[pi0_index], 3, 5)[0] == 5
+        assert pkdpl == pytest.approx(5, abs=1e-5)
+
+
+def test_load_matches_generated(table, tmp_path):
+    _save(tmp_path / "table.npz", table)
+    loaded = load_lookup_table(tmp_path / "table.npz")
+    for loaded_field, field in zip(loaded, table):
+        np.testing.assert_array_equal(loaded_field, field)
+
+
+def test_resumes_from_checkpoint(table, tmp_path):
+    path = tmp_path / "table.npz"
+    checkpoint_pkdpl = table.pkdpl.copy()
+    checkpoint_pkdpl[0] = np.nan
+    # Completed cells are taken from the checkpoint, so a marker value survives
+    checkpoint_pkdpl[1, 0, 0] = 42.0
+    _save(tmp_path / "table.npz.checkpoint", table._replace(pkdpl=checkpoint_pkdpl))
+    resumed = generate_lookup_table(path, TFLB, PL0, PI0, kdpi=KDPI, max_workers=1)
+    assert not (tmp_path / "table.npz.checkpoint").exists()
+    assert resumed.pkdpl[1, 0, 0] == 42.0
+    np.testing.assert_allclose(resumed.pkdpl[0], table.pkdpl[0], atol=1e-5)
+
+
+def test_checkpoint_for_other_axes_is_ignored(table, tmp_path):
+    _save(tmp_path / "table.npz.checkpoint", table._replace(kdpi=1e-7, pkdpl=np.full_like(table.pkdpl, 42.0)))
+    regenerated = generate_lookup_table(tmp_path / "table.npz", TFLB, PL0, PI0, kdpi=KDPI, max_workers=1)
+    np.testing.assert_allclose(regenerated.pkdpl, table.pkdpl, atol=1e-5)
+
+
+def test_export_csv(table, tmp_path):
+    export_lookup_table_csv(table, tmp_path)
+    for tflb, pkdpl in zip(TFLB, table.pkdpl):
+        frame = pd.read_csv(tmp_path / f"lookup_table{tflb}.csv", index_col=0)
+        np.testing.assert_array_equal(frame.index, PI0)
+        np.testing.assert_array_equal(frame.columns.astype(float), PL0)
+        np.testing.assert_array_equal(frame.to_numpy(), pkdpl)
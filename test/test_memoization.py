@@ -0,0 +1,36 @@
+import numpy as np
+from claffinity.fast_binding_equations import competition_pl_polished
+from claffinity.memoization import CompetitionCache
+
+
+def grid(size, offset=0.0):
+    return np.logspace(-9, -5, size) * (1 + offset), 1e-8, 1e-6, 1e-9, 1e-7
+
+
+def test_array_entries_are_bounded_by_bytes():
+    cache = CompetitionCache(max_array_bytes=5 * 2 * 1000 * 8)
+    for offset in range(8):
+        cache.competition_pl_polished(*grid(1000, offset))
+    assert cache.array_bytes <= cache.max_array_bytes
+    assert cache.cache_info().currsize == 5
+    cache.competition_pl_polished(*grid(1000, 7))
+    assert cache.hits == 1
+
+
+def test_results_larger_than_the_limit_are_not_cached():
+    cache = CompetitionCache(max_array_bytes=1000)
+    pl, _ = cache.competition_pl_polished(*grid(1000))
+    np.testing.assert_array_equal(pl, competition_pl_polished(*grid(1000))[0])
+    assert cache.cache_info().currsize == 0
+    assert cache.array_bytes == 0
+
+
+def test_scalar_entries_are_bounded_by_count():
+    cache = CompetitionCache(maxsize=3)
+    for kdpi in (1e-7, 2e-7, 3e-7, 4e-7):
+        cache.competition_pl(1e-8, 1e-8, 1e-6, 1e-9, kdpi, dps=30)
+    assert cache.cache_info().currsize == 3
+    cache.competition_pl(1e-8, 1e-8, 1e-6, 1e-9, 4e-7, dps=30)
+    assert cache.hits == 1
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 3, 0)
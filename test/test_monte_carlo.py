@@ -0,0 +1,36 @@
+import numpy as np
+from claffinity.fast_binding_equations import _no_inhibitor_pl, calc_amount_p, competition_pl_polished
+from claffinity.monte_carlo import LogNormal, RelativeNormal, _Accumulator, simulate_readout
+
+P = calc_amount_p(0.7, 10e-9, 1e-9)
+
+
+def test_moments_match_direct_calculation_for_tight_distributions():
+    rng = np.random.default_rng(0)
+    values = 0.5 + 1e-9 * rng.standard_normal(100_000)
+    accumulator = _Accumulator(0.0, 1.0, 100)
+    for chunk in np.array_split(values, 7):
+        accumulator.add(chunk)
+    _, mean, std = accumulator.result()
+    np.testing.assert_allclose(mean, np.mean(values), rtol=1e-15)
+    np.testing.assert_allclose(std, np.std(values), rtol=1e-9)
+
+
+def test_results_do_not_depend_on_chunk_size():
+    kwargs = dict(p=RelativeNormal(P, 0.05), l=10e-9, i=10e-6, kdpl=1e-9, kdpi=LogNormal(1e-6, 0.3), num_samples=20_000)
+    result = simulate_readout(**kwargs, chunk_size=20_000)
+    chunked = simulate_readout(**kwargs, chunk_size=3_000)
+    np.testing.assert_array_equal(result.fraction_bound.counts, chunked.fraction_bound.counts)
+    np.testing.assert_allclose(result.percent_signal_remaining_mean, chunked.percent_signal_remaining_mean, rtol=1e-12)
+    np.testing.assert_allclose(result.percent_signal_remaining_std, chunked.percent_signal_remaining_std, rtol=1e-9)
+
+
+def test_fixed_parameters_give_the_exact_readout():
+    result = simulate_readout(P, 10e-9, 10e-6, 1e-9, 1e-6, num_samples=1000, chunk_size=300)
+    pl = competition_pl_polished(P, 10e-9, 10e-6, 1e-9, 1e-6)[0]
+    np.testing.assert_allclose(result.fraction_bound_mean, pl / 10e-9, rtol=1e-14)
+    np.testing.assert_allclose(
+        result.percent_signal_remaining_mean, 100 * pl / _no_inhibitor_pl(P, 10e-9, 1e-9), rtol=1e-14
+    )
+    assert result.fraction_bound_std == 0 and result.percent_signal_remaining_std == 0
+    assert result.num_invalid == 0
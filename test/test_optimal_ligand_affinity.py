@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from claffinity.optimal_ligand_affinity import find_optimal_kdpl, fraction_bound_at_pkdpl
+
+CONDITIONS = [
+    # tflb, l, i, kdpi
+    (0.7, 10e-9, 10e-6, 1e-6),
+    (0.5, 1e-9, 1e-6, 50e-9),
+    (0.9, 50e-9, 100e-6, 1e-8),
+    (0.3, 5e-9, 2e-6, 1e-10),
+    (0.8, 1e-6, 10e-6, 1e-4),
+]
+
+
+@pytest.mark.parametrize("tflb, l, i, kdpi", CONDITIONS)
+def test_optimum_matches_dense_scan(tflb, l, i, kdpi):
+    pkds = np.linspace(3, 12, 90_001)
+    scan_flb = fraction_bound_at_pkdpl(pkds, tflb, l, i, kdpi)
+    kdpl, flb = find_optimal_kdpl(tflb, l, i, kdpi)
+    assert flb == pytest.approx(fraction_bound_at_pkdpl(-np.log10(kdpl), tflb, l, i, kdpi), rel=1e-12)
+    # Never worse than the scan, and at the scan's minimum to within its spacing
+    assert flb <= np.min(scan_flb) * (1 + 1e-12)
+    assert -np.log10(kdpl) == pytest.approx(pkds[np.argmin(scan_flb)], abs=1e-3)
+
+
+def test_conditions_are_solved_together():
+    tflb, l, i, kdpi = (np.array(column) for column in zip(*CONDITIONS))
+    kdpl, flb = find_optimal_kdpl(tflb[:, None], l[:, None], i[:, None], kdpi[:, None] * np.array([1, 10]))
+    assert kdpl.shape == flb.shape == (len(CONDITIONS), 2)
+    for row, condition in enumerate(CONDITIONS):
+        single_kdpl, single_flb = find_optimal_kdpl(*condition)
+        assert kdpl[row, 0] == pytest.approx(single_kdpl, rel=1e-5)
+        assert flb[row, 0] == pytest.approx(single_flb, rel=1e-12)
+
+
+def test_minimum_at_the_end_of_the_range():
+    # With the search limited to weak ligands the optimum is pinned at the tightest allowed KD
+    kdpl, flb = find_optimal_kdpl(0.7, 10e-9, 10e-6, 1e-6, pkd_begin=3, pkd_end=5)
+    pkds = np.linspace(3, 5, 2_001)
+    scan_flb = fraction_bound_at_pkdpl(pkds, 0.7, 10e-9, 10e-6, 1e-6)
+    assert np.argmin(scan_flb) == pkds.shape[0] - 1
+    assert -np.log10(kdpl) == pytest.approx(5, abs=1e-5)
@@ -0,0 +1,50 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from claffinity import high_accuracy_binding_equations
+from claffinity.high_accuracy_binding_equations import precision
+from claffinity.parallel_sweep import competition_pl_sweep
+
+# A system whose [PL] at 15 digits differs from the default precision in the third digit
+ILL_CONDITIONED = (
+    2.9571816644220806e-05,
+    3.53694445800916e-10,
+    4.612523859440789e-05,
+    9.027794365750247e-06,
+    2.4621567474947e-09,
+)
+
+
+def serial_sweep(p, l, i, kdpl, kdpi, dps=None):
+    return np.array(
+        [
+            float(high_accuracy_binding_equations.competition_pl(*point, dps=dps))
+            for point in np.broadcast(p, l, i, kdpl, kdpi)
+        ]
+    )
+
+
+def test_sweep_matches_serial_evaluation_in_order():
+    kdpl, kdpi = 10 ** -np.linspace(3, 12, 4)[:, None], 10 ** -np.linspace(3, 12, 5)[None, :]
+    pl = competition_pl_sweep(2e-8, 1e-8, 1e-5, kdpl, kdpi, dps=30, max_workers=2, chunk_size=3)
+    assert pl.shape == (4, 5)
+    np.testing.assert_array_equal(pl.reshape(-1), serial_sweep(2e-8, 1e-8, 1e-5, kdpl, kdpi, dps=30))
+
+
+def test_empty_grid():
+    assert competition_pl_sweep(np.empty(0), 1e-8, 1e-5, 1e-9, 1e-6, max_workers=1).shape == (0,)
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+def test_precision_block_reaches_workers(start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} is not available")
+    low_precision_pl = float(high_accuracy_binding_equations.competition_pl(*ILL_CONDITIONED, dps=15))
+    default_pl = float(high_accuracy_binding_equations.competition_pl(*ILL_CONDITIONED))
+    assert abs(low_precision_pl - default_pl) > 1e-3 * default_pl
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context(start_method)) as executor:
+        with precision(15):
+            scoped_pl = competition_pl_sweep(*ILL_CONDITIONED, executor=executor)
+        explicit_pl = competition_pl_sweep(*ILL_CONDITIONED, dps=15, executor=executor)
+    assert scoped_pl == explicit_pl == low_precision_pl
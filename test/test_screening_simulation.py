@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from claffinity import fast_binding_equations
+from claffinity.monte_carlo import LogNormal
+from claffinity.screening_simulation import AssayDesign, simulate_screen
+
+SIGNAL_REDUCTION_THRESHOLD = 50
+ACTIVE_KDPI = 10
+LIBRARY_KDPIS = LogNormal(100, 1.5)
+DESIGNS = [
+    AssayDesign("High affinity", l=0.01, kdpl=0.001, i=10, tflb=0.7),
+    AssayDesign("Low affinity", l=0.01, kdpl=0.1, i=10, tflb=0.7),
+    AssayDesign("Fixed protein", l=0.05, kdpl=0.02, i=1, p=0.1),
+]
+
+
+def brute_force_counts(design, kdpi):
+    """Confusion counts from the signal of every compound"""
+    p = design.protein_conc()
+    control = fast_binding_equations.competition_pl(p, design.l, 0, design.kdpl, 1)
+    signal = fast_binding_equations.competition_pl(p, design.l, design.i, design.kdpl, kdpi)
+    hit = signal <= control * (1 - SIGNAL_REDUCTION_THRESHOLD / 100)
+    active = kdpi <= ACTIVE_KDPI
+    return tuple(int(np.count_nonzero(mask)) for mask in (hit & active, ~hit & active, hit & ~active, ~hit & ~active))
+
+
+@pytest.mark.parametrize("chunk_size", [1_000, 100_000])
+def test_counts_match_brute_force(chunk_size):
+    kdpi = LIBRARY_KDPIS.sample(np.random.default_rng(3), 20_000)
+    results = simulate_screen(
+        DESIGNS, kdpi, SIGNAL_REDUCTION_THRESHOLD, active_kdpi=ACTIVE_KDPI, chunk_size=chunk_size
+    )
+    for design, result in zip(DESIGNS, results):
+        assert result.design == design
+        counts = (result.true_positives, result.false_negatives, result.false_positives, result.true_negatives)
+        assert counts == brute_force_counts(design, kdpi)
+    # The designs disagree, so the test covers both hits and misses
+    assert len({result.missed for result in results}) > 1
+    assert all(result.hits > 0 and result.missed > 0 for result in results[:2])
+
+
+def test_distribution_matches_its_samples():
+    from_distribution = simulate_screen(
+        DESIGNS, LIBRARY_KDPIS, SIGNAL_REDUCTION_THRESHOLD, ACTIVE_KDPI, num_compounds=20_000, seed=3
+    )
+    from_samples = simulate_screen(
+        DESIGNS, LIBRARY_KDPIS.sample(np.random.default_rng(3), 20_000), SIGNAL_REDUCTION_THRESHOLD, ACTIVE_KDPI
+    )
+    assert from_distribution == from_samples
+
+
+def test_distribution_needs_num_compounds():
+    with pytest.raises(ValueError, match="num_compounds"):
+        simulate_screen(DESIGNS, LIBRARY_KDPIS)
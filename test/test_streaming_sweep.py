@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from claffinity import fast_binding_equations
+from claffinity.streaming_sweep import iter_sweep, iter_sweep_blocks, sweep_shape, write_sweep
+
+AXES = {
+    "l": np.geomspace(1e-9, 1e-6, 5),
+    "kdpi": np.geomspace(1e-9, 1e-5, 7),
+    "kdpl": np.geomspace(1e-10, 1e-6, 11),
+}
+PARAMETERS = {"p": 1e-7, "i": 1e-6}
+
+
+def in_memory_sweep(axes):
+    return fast_binding_equations.competition_pl(
+        l=axes["l"][:, None, None], kdpi=axes["kdpi"][:, None], kdpl=axes["kdpl"], **PARAMETERS
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 11, 12, 77, 78, 385, 10_000])
+def test_blocks_cover_the_grid_once(chunk_size):
+    shape = sweep_shape(AXES)
+    visits = np.zeros(shape, dtype=int)
+    for index in iter_sweep_blocks(shape, chunk_size):
+        assert visits[index].size <= chunk_size
+        visits[index] += 1
+    assert np.all(visits == 1)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 10, 77, 200, 10_000])
+def test_blocks_reassemble_to_the_in_memory_sweep(chunk_size):
+    result = np.full(sweep_shape(AXES), np.nan)
+    for index, block in iter_sweep(fast_binding_equations.competition_pl, AXES, PARAMETERS, chunk_size):
+        result[index] = block
+    np.testing.assert_array_equal(result, in_memory_sweep(AXES))
+
+
+def test_write_sweep(tmp_path):
+    result = write_sweep(tmp_path / "sweep.npy", fast_binding_equations.competition_pl, AXES, PARAMETERS, chunk_size=30)
+    assert isinstance(result, np.memmap)
+    np.testing.assert_array_equal(result, in_memory_sweep(AXES))
+
+
+@pytest.mark.parametrize("empty_axis", ["l", "kdpi", "kdpl"])
+def test_empty_axis_has_no_blocks(empty_axis, tmp_path):
+    axes = dict(AXES, **{empty_axis: np.array([])})
+    assert list(iter_sweep_blocks(sweep_shape(axes), 10)) == []
+    assert list(iter_sweep(fast_binding_equations.competition_pl, axes, PARAMETERS, 10)) == []
+    result = write_sweep(tmp_path / "sweep.npy", fast_binding_equations.competition_pl, axes, PARAMETERS)
+    assert result.shape == sweep_shape(axes)
+
+
+def test_no_axes_or_empty_chunks_raise():
+    with pytest.raises(ValueError, match="axis"):
+        list(iter_sweep_blocks(()))
+    with pytest.raises(ValueError, match="chunk_size"):
+        list(iter_sweep_blocks((3, 4), 0))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from claffinity import surrogate
+from claffinity.surrogate import FractionBoundSurrogate
+
+SMALL_SHAPE = (17, 33, 33, 9)
+
+
+@pytest.fixture(scope="module")
+def small_surrogate():
+    return FractionBoundSurrogate.build(shape=SMALL_SHAPE, num_validation_points=100_000, max_error=None)
+
+
+def random_points(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(begin, end, n) for begin, end in surrogate.DEFAULT_RANGES]
+
+
+def test_grid_coordinates_give_the_same_fraction_bound():
+    points = random_points(10_000)
+    np.testing.assert_allclose(
+        surrogate._grid_fraction_bound(*surrogate._grid_coordinates(*points)),
+        surrogate._fraction_bound(*points),
+        rtol=1e-9,
+        atol=1e-12,
+    )
+
+
+def test_grid_covers_the_ranges(small_surrogate):
+    coordinates = surrogate._grid_coordinates(*random_points(100_000))
+    for coordinate, (begin, end) in zip(coordinates, small_surrogate.grid_ranges):
+        assert np.all((coordinate >= begin) & (coordinate <= end))
+
+
+def test_error_within_validation_error(small_surrogate):
+    points = random_points(100_000)
+    error = np.abs(small_surrogate.interpolate(*points) - surrogate._fraction_bound(*points))
+    assert small_surrogate.max_error < 0.1
+    # Independent points can land a little closer to the worst case than the validation points did
+    assert np.max(error) <= 1.5 * small_surrogate.max_error
+
+
+def test_call_takes_concentrations(small_surrogate):
+    pkdpl, pkdpi, pl0, pi0, tflb = random_points(1_000)
+    np.testing.assert_allclose(
+        small_surrogate(10**-pkdpl, 10**-pkdpi, 10**-pl0, 10**-pi0, tflb),
+        small_surrogate.interpolate(pkdpl, pkdpi, pl0, pi0, tflb),
+        rtol=1e-12,
+    )
+
+
+def test_outside_ranges_is_nan(small_surrogate):
+    # Each point is outside the ranges along one axis
+    points = np.full((6, 5), [6, 6, 7, 6, 0.5])
+    points[np.arange(5), np.arange(5)] = [2.9, 12.1, 4.9, 8.1, 0.95]
+    points[5, 4] = np.nan
+    result = small_surrogate.interpolate(*points.T)
+    assert result.shape == (6,)
+    assert np.all(np.isnan(result))
+    assert np.isfinite(small_surrogate.interpolate(12, 3, 5, 8, 0.9))
+
+
+def test_max_error_fails_the_build():
+    with pytest.raises(ValueError, match="max_error"):
+        FractionBoundSurrogate.build(shape=(5, 5, 5, 3), num_validation_points=1_000, max_error=1e-3)
+
+
+def test_save_and_load(small_surrogate, tmp_path):
+    small_surrogate.save(tmp_path / "surrogate")
+    loaded = FractionBoundSurrogate.load(tmp_path / "surrogate")
+    assert isinstance(loaded.values, np.memmap)
+    assert loaded.shape == SMALL_SHAPE
+    assert loaded.max_error == small_surrogate.max_error
+    points = random_points(1_000)
+    np.testing.assert_array_equal(loaded.interpolate(*points), small_surrogate.interpolate(*points))
@@ -0,0 +1,101 @@
+import functools
+import os
+import stat
+import numpy as np
+import pytest
+from claffinity.fast_binding_equations import competition_pl_polished, competition_pl_trig
+from claffinity.sweep_cache import SweepCache
+
+
+def double(x):
+    return x * 2
+
+
+def triple(x):
+    return x * 3
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SweepCache(tmp_path)
+
+
+def test_distinct_functions_have_distinct_keys(cache):
+    axes = {"x": np.arange(3.0)}
+    assert cache.key(double, axes, {}) != cache.key(triple, axes, {})
+    np.testing.assert_array_equal(cache.sweep(double, axes), [0, 2, 4])
+    np.testing.assert_array_equal(cache.sweep(triple, axes), [0, 3, 6])
+
+
+def test_key_depends_on_axes_parameters_and_precision(cache):
+    axes = {"x": np.arange(3.0)}
+    keys = {
+        cache.key(double, axes, {}),
+        cache.key(double, {"x": np.arange(4.0)}, {}),
+        cache.key(double, {"y": np.arange(3.0)}, {}),
+        cache.key(double, axes, {"y": 1.0}),
+        cache.key(double, axes, {"y": 1.0 + 1e-16 * 4}),
+        cache.key(double, axes, {}, dps=50),
+        cache.key(double, axes, {}, name="double"),
+    }
+    assert len(keys) == 7
+    assert cache.key(double, axes, {"y": 1}) == cache.key(double, {"x": [0, 1, 2]}, {"y": 1.0})
+
+
+@pytest.mark.parametrize(
+    "func",
+    [lambda x: x * 2, functools.partial(np.multiply, 2), np.negative, SweepCache().evict],
+    ids=["lambda", "partial", "ufunc", "method"],
+)
+def test_unnamed_callables_are_rejected(cache, func):
+    with pytest.raises(ValueError, match="pass name"):
+        cache.sweep(func, {"x": np.arange(3.0)})
+
+
+def test_nested_functions_are_rejected(cache):
+    def nested(x):
+        return x
+
+    with pytest.raises(ValueError):
+        cache.key(nested, {"x": np.arange(3.0)}, {})
+
+
+def test_named_lambdas_are_cached_separately(cache):
+    axes = {"x": np.arange(3.0)}
+    np.testing.assert_array_equal(cache.sweep(lambda x: x * 2, axes, name="double"), [0, 2, 4])
+    np.testing.assert_array_equal(cache.sweep(lambda x: x * 3, axes, name="triple"), [0, 3, 6])
+    np.testing.assert_array_equal(cache.sweep(lambda x: x * 5, axes, name="double"), [0, 2, 4])
+
+
+def test_tuple_results_are_rejected(cache):
+    axes = {"p": [1e-8], "l": [1e-8], "i": [1e-6], "kdpl": [1e-9], "kdpi": [1e-7]}
+    with pytest.raises(TypeError):
+        cache.sweep(competition_pl_polished, axes)
+    assert not list(cache.directory.glob("*.npy"))
+
+
+def test_results_are_loaded_from_disk(cache):
+    axes = {"p": np.linspace(1e-9, 1e-7, 5), "kdpi": np.logspace(-9, -5, 5)}
+    parameters = {"l": 1e-8, "i": 1e-6, "kdpl": 1e-9}
+    result = cache.sweep(competition_pl_trig, axes, parameters)
+    assert len(list(cache.directory.glob("*.npy"))) == 1
+    np.testing.assert_array_equal(SweepCache(cache.directory).sweep(competition_pl_trig, axes, parameters), result)
+
+
+def test_eviction_keeps_cache_within_max_bytes(tmp_path):
+    cache = SweepCache(tmp_path, max_bytes=3000)
+    for size in range(10):
+        cache.sweep(double, {"x": np.arange(100.0 + size)})
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.npy")) <= 3000
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+@pytest.mark.parametrize("umask, mode", [(0o022, 0o644), (0o002, 0o664), (0o077, 0o600)])
+def test_stored_files_follow_the_umask(cache, umask, mode):
+    previous_umask = os.umask(umask)
+    try:
+        cache.sweep(double, {"x": np.arange(10.0)})
+    finally:
+        os.umask(previous_umask)
+    (path,) = cache.directory.glob("*.npy")
+    assert stat.S_IMODE(path.stat().st_mode) == mode